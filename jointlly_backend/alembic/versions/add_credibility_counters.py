@@ -0,0 +1,41 @@
+"""add license_count and portfolio_count to professional_profiles
+
+Revision ID: add_credibility_counters
+Revises: add_latest_report_indexes
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_credibility_counters'
+down_revision = 'add_latest_report_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        'professional_profiles',
+        sa.Column('license_count', sa.Integer(), nullable=False, server_default='0')
+    )
+    op.add_column(
+        'professional_profiles',
+        sa.Column('portfolio_count', sa.Integer(), nullable=False, server_default='0')
+    )
+    # Backfill from the child tables; scores follow on the next batch recompute
+    op.execute(
+        "UPDATE professional_profiles SET license_count = ("
+        "SELECT COUNT(*) FROM licenses WHERE licenses.professional_id = professional_profiles.id)"
+    )
+    op.execute(
+        "UPDATE professional_profiles SET portfolio_count = ("
+        "SELECT COUNT(*) FROM portfolios WHERE portfolios.professional_id = professional_profiles.id)"
+    )
+
+
+def downgrade():
+    op.drop_column('professional_profiles', 'portfolio_count')
+    op.drop_column('professional_profiles', 'license_count')
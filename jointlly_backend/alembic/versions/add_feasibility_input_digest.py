@@ -0,0 +1,25 @@
+"""add input_digest to feasibility_reports
+
+Revision ID: add_feasibility_input_digest
+Revises: add_webhook_events
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_feasibility_input_digest'
+down_revision = 'add_webhook_events'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing reports have no digest, so their next request recomputes once
+    op.add_column('feasibility_reports', sa.Column('input_digest', sa.String(64), nullable=True))
+
+
+def downgrade():
+    op.drop_column('feasibility_reports', 'input_digest')
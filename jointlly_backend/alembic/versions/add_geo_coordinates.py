@@ -0,0 +1,44 @@
+"""add coordinates to properties and location_preferences
+
+Revision ID: add_geo_coordinates
+Revises: add_matching_jobs
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from app.utils.geo import parse_coordinates
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_geo_coordinates'
+down_revision = 'add_matching_jobs'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('properties', sa.Column('latitude', sa.Float(), nullable=True))
+    op.add_column('properties', sa.Column('longitude', sa.Float(), nullable=True))
+    op.add_column('location_preferences', sa.Column('latitude', sa.Float(), nullable=True))
+    op.add_column('location_preferences', sa.Column('longitude', sa.Float(), nullable=True))
+    
+    # Backfill property coordinates from existing map pins
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.text("SELECT id, google_maps_pin FROM properties WHERE google_maps_pin IS NOT NULL")
+    ).fetchall()
+    for property_id, pin in rows:
+        coordinates = parse_coordinates(pin)
+        if coordinates:
+            bind.execute(
+                sa.text("UPDATE properties SET latitude = :lat, longitude = :lng WHERE id = :id"),
+                {"lat": coordinates[0], "lng": coordinates[1], "id": property_id}
+            )
+
+
+def downgrade():
+    op.drop_column('location_preferences', 'longitude')
+    op.drop_column('location_preferences', 'latitude')
+    op.drop_column('properties', 'longitude')
+    op.drop_column('properties', 'latitude')
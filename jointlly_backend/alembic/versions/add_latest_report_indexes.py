@@ -0,0 +1,34 @@
+"""add latest-row indexes on far_calculations and feasibility_reports
+
+Revision ID: add_latest_report_indexes
+Revises: add_feasibility_input_digest
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_latest_report_indexes'
+down_revision = 'add_feasibility_input_digest'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'ix_far_calculations_property_latest',
+        'far_calculations',
+        ['property_id', sa.text('created_at DESC'), sa.text('id DESC')]
+    )
+    op.create_index(
+        'ix_feasibility_reports_property_latest',
+        'feasibility_reports',
+        ['property_id', sa.text('created_at DESC'), sa.text('id DESC')]
+    )
+
+
+def downgrade():
+    op.drop_index('ix_feasibility_reports_property_latest', table_name='feasibility_reports')
+    op.drop_index('ix_far_calculations_property_latest', table_name='far_calculations')
@@ -0,0 +1,46 @@
+"""add unique (project_id, professional_id) to matches
+
+Revision ID: add_match_pair_unique
+Revises: add_name_to_users
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_match_pair_unique'
+down_revision = 'add_name_to_users'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The old append-only matcher could store a pair more than once; keep
+    # one row per pair (an accepted one if any, otherwise the newest)
+    op.execute(
+        """
+        DELETE FROM matches WHERE id IN (
+            SELECT id FROM (
+                SELECT id, ROW_NUMBER() OVER (
+                    PARTITION BY project_id, professional_id
+                    ORDER BY CASE WHEN status = 'ACCEPTED' THEN 0 ELSE 1 END,
+                             created_at DESC, id DESC
+                ) AS position
+                FROM matches
+            ) ranked
+            WHERE position > 1
+        )
+        """
+    )
+    
+    # Bulk matching inserts skip existing pairs, which needs a unique key to conflict on
+    op.create_unique_constraint(
+        'uq_matches_project_professional',
+        'matches',
+        ['project_id', 'professional_id']
+    )
+
+
+def downgrade():
+    op.drop_constraint('uq_matches_project_professional', 'matches', type_='unique')
@@ -0,0 +1,28 @@
+"""add version to match_rescores
+
+Revision ID: add_match_rescore_versions
+Revises: add_webhook_event_retries
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_match_rescore_versions'
+down_revision = 'add_webhook_event_retries'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Re-marking bumps the version so a running batch cannot clear a newer mark
+    op.add_column(
+        'match_rescores',
+        sa.Column('version', sa.Integer(), nullable=False, server_default='0')
+    )
+
+
+def downgrade():
+    op.drop_column('match_rescores', 'version')
@@ -0,0 +1,43 @@
+"""add match_rescores dirty-pair table
+
+Revision ID: add_match_rescores
+Revises: add_match_score_indexes
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_match_rescores'
+down_revision = 'add_match_score_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'match_rescores',
+        sa.Column('id', UUID(as_uuid=True), primary_key=True),
+        sa.Column('match_id', UUID(as_uuid=True), sa.ForeignKey('matches.id', ondelete='CASCADE'), nullable=False),
+        sa.Column(
+            'component',
+            sa.Enum('LOCATION', 'PRICING', 'CAPABILITY', 'VERIFICATION', name='rescore_component'),
+            nullable=False
+        ),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.UniqueConstraint('match_id', 'component', name='uq_match_rescores_match_component'),
+    )
+    op.create_index('ix_match_rescores_id', 'match_rescores', ['id'])
+    op.create_index('ix_match_rescores_match_id', 'match_rescores', ['match_id'])
+    op.create_index('ix_match_rescores_created_at', 'match_rescores', ['created_at'])
+
+
+def downgrade():
+    op.drop_index('ix_match_rescores_created_at', table_name='match_rescores')
+    op.drop_index('ix_match_rescores_match_id', table_name='match_rescores')
+    op.drop_index('ix_match_rescores_id', table_name='match_rescores')
+    op.drop_table('match_rescores')
+    sa.Enum(name='rescore_component').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,34 @@
+"""add composite ranking indexes on matches
+
+Revision ID: add_match_score_indexes
+Revises: add_geo_coordinates
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_match_score_indexes'
+down_revision = 'add_geo_coordinates'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'ix_matches_project_score',
+        'matches',
+        ['project_id', sa.text('match_score DESC'), sa.text('id DESC')]
+    )
+    op.create_index(
+        'ix_matches_professional_score',
+        'matches',
+        ['professional_id', sa.text('match_score DESC'), sa.text('id DESC')]
+    )
+
+
+def downgrade():
+    op.drop_index('ix_matches_professional_score', table_name='matches')
+    op.drop_index('ix_matches_project_score', table_name='matches')
@@ -0,0 +1,52 @@
+"""add matching_jobs queue table
+
+Revision ID: add_matching_jobs
+Revises: add_match_pair_unique
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_matching_jobs'
+down_revision = 'add_match_pair_unique'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'matching_jobs',
+        sa.Column('id', UUID(as_uuid=True), primary_key=True),
+        sa.Column('project_id', UUID(as_uuid=True), sa.ForeignKey('projects.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('idempotency_key', sa.String(length=100), nullable=False, unique=True),
+        sa.Column(
+            'status',
+            sa.Enum('QUEUED', 'RUNNING', 'SUCCEEDED', 'FAILED', name='job_status'),
+            nullable=False
+        ),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('max_attempts', sa.Integer(), nullable=False, server_default='5'),
+        sa.Column('run_after', sa.DateTime(), nullable=False),
+        sa.Column('locked_by', sa.String(length=100), nullable=True),
+        sa.Column('locked_at', sa.DateTime(), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('matches_created', sa.Integer(), nullable=True),
+        sa.Column('completed_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+    )
+    op.create_index('ix_matching_jobs_id', 'matching_jobs', ['id'])
+    op.create_index('ix_matching_jobs_project_id', 'matching_jobs', ['project_id'])
+    op.create_index('ix_matching_jobs_status_run_after', 'matching_jobs', ['status', 'run_after'])
+
+
+def downgrade():
+    op.drop_index('ix_matching_jobs_status_run_after', table_name='matching_jobs')
+    op.drop_index('ix_matching_jobs_project_id', table_name='matching_jobs')
+    op.drop_index('ix_matching_jobs_id', table_name='matching_jobs')
+    op.drop_table('matching_jobs')
+    sa.Enum(name='job_status').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,28 @@
+"""index professional_profiles.updated_at
+
+Revision ID: add_profile_updated_at_index
+Revises: add_credibility_counters
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_profile_updated_at_index'
+down_revision = 'add_credibility_counters'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Candidate indexes poll for recently changed professionals before each lookup
+    op.create_index(
+        'ix_professional_profiles_updated_at',
+        'professional_profiles',
+        ['updated_at']
+    )
+
+
+def downgrade():
+    op.drop_index('ix_professional_profiles_updated_at', table_name='professional_profiles')
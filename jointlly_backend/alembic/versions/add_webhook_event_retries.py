@@ -0,0 +1,32 @@
+"""add attempts and next_attempt_at to webhook_events
+
+Revision ID: add_webhook_event_retries
+Revises: add_profile_updated_at_index
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_webhook_event_retries'
+down_revision = 'add_profile_updated_at_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Events that arrive before their order's transaction are retried, not dropped
+    op.add_column(
+        'webhook_events',
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0')
+    )
+    op.add_column('webhook_events', sa.Column('next_attempt_at', sa.DateTime(), nullable=True))
+    op.create_index('ix_webhook_events_next_attempt_at', 'webhook_events', ['next_attempt_at'])
+
+
+def downgrade():
+    op.drop_index('ix_webhook_events_next_attempt_at', table_name='webhook_events')
+    op.drop_column('webhook_events', 'next_attempt_at')
+    op.drop_column('webhook_events', 'attempts')
@@ -0,0 +1,43 @@
+"""add webhook_events inbox table
+
+Revision ID: add_webhook_events
+Revises: add_match_rescores
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID, JSON
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_webhook_events'
+down_revision = 'add_match_rescores'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'webhook_events',
+        sa.Column('id', UUID(as_uuid=True), primary_key=True),
+        sa.Column('event_id', sa.String(100), nullable=False),
+        sa.Column('event', sa.String(100), nullable=True),
+        sa.Column('razorpay_order_id', sa.String(255), nullable=True),
+        sa.Column('payload', JSON(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('processed_at', sa.DateTime(), nullable=True),
+        sa.UniqueConstraint('event_id', name='uq_webhook_events_event_id'),
+    )
+    op.create_index('ix_webhook_events_id', 'webhook_events', ['id'])
+    op.create_index('ix_webhook_events_razorpay_order_id', 'webhook_events', ['razorpay_order_id'])
+    op.create_index('ix_webhook_events_created_at', 'webhook_events', ['created_at'])
+    op.create_index('ix_webhook_events_processed_at', 'webhook_events', ['processed_at'])
+
+
+def downgrade():
+    op.drop_index('ix_webhook_events_processed_at', table_name='webhook_events')
+    op.drop_index('ix_webhook_events_created_at', table_name='webhook_events')
+    op.drop_index('ix_webhook_events_razorpay_order_id', table_name='webhook_events')
+    op.drop_index('ix_webhook_events_id', table_name='webhook_events')
+    op.drop_table('webhook_events')
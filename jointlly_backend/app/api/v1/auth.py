@@ -13,7 +13,7 @@ from app.schemas.auth import (
 )
 from app.services.auth_service import AuthService
 from app.dependencies import get_current_user
-from app.models.user import User
+from app.services.principal_cache import Principal
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
@@ -75,7 +75,16 @@ async def refresh_token(
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """Get current user information"""
-    return current_user
+    user = await AuthService.get_user_by_id(db, current_user.id)
+    return UserResponse(
+        id=user.id,
+        email=user.email,
+        name=user.name,
+        role=user.role,
+        is_active=user.is_active == "true",
+        created_at=user.created_at
+    )
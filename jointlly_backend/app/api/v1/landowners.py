@@ -6,8 +6,8 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
-from app.dependencies import require_landowner
-from app.models.user import User
+from app.dependencies import require_landowner, get_landowner_profile_id
+from app.services.principal_cache import Principal
 from app.schemas.landowner import (
     LandownerProfileCreate,
     LandownerProfileUpdate,
@@ -16,10 +16,13 @@ from app.schemas.landowner import (
     PropertyResponse,
     ProjectCreate,
     ProjectResponse,
+    ProjectPublishResponse,
     JVPreferencesCreate,
-    JVPreferencesResponse
+    JVPreferencesResponse,
+    LandownerDashboardResponse
 )
 from app.services.landowner_service import LandownerService
+from app.services.matching_job_service import MatchingJobService
 
 router = APIRouter(prefix="/landowners", tags=["Landowners"])
 
@@ -27,7 +30,7 @@ router = APIRouter(prefix="/landowners", tags=["Landowners"])
 @router.post("/profile", response_model=LandownerProfileResponse, status_code=status.HTTP_201_CREATED)
 async def create_profile(
     profile_data: LandownerProfileCreate,
-    current_user: User = Depends(require_landowner),
+    current_user: Principal = Depends(require_landowner),
     db: AsyncSession = Depends(get_db)
 ):
     """Create landowner profile"""
@@ -43,7 +46,7 @@ async def create_profile(
 
 @router.get("/profile", response_model=LandownerProfileResponse)
 async def get_profile(
-    current_user: User = Depends(require_landowner),
+    current_user: Principal = Depends(require_landowner),
     db: AsyncSession = Depends(get_db)
 ):
     """Get landowner profile"""
@@ -54,7 +57,7 @@ async def get_profile(
 @router.put("/profile", response_model=LandownerProfileResponse)
 async def update_profile(
     profile_data: LandownerProfileUpdate,
-    current_user: User = Depends(require_landowner),
+    current_user: Principal = Depends(require_landowner),
     db: AsyncSession = Depends(get_db)
 ):
     """Update landowner profile"""
@@ -68,19 +71,26 @@ async def update_profile(
     return profile
 
 
+@router.get("/dashboard", response_model=LandownerDashboardResponse)
+async def get_dashboard(
+    current_user: Principal = Depends(require_landowner),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get properties with their projects, latest FAR/feasibility summaries and match counts"""
+    dashboard = await LandownerService.get_dashboard(db, current_user.id)
+    return LandownerDashboardResponse.model_validate(dashboard, from_attributes=True)
+
+
 @router.post("/properties", response_model=PropertyResponse, status_code=status.HTTP_201_CREATED)
 async def create_property(
     property_data: PropertyCreate,
-    current_user: User = Depends(require_landowner),
+    landowner_id: UUID = Depends(get_landowner_profile_id),
     db: AsyncSession = Depends(get_db)
 ):
     """Create property"""
-    # Get landowner profile
-    profile = await LandownerService.get_profile(db, current_user.id)
-    
     property_obj = await LandownerService.create_property(
         db,
-        profile.id,
+        landowner_id,
         **property_data.model_dump()
     )
     return property_obj
@@ -88,37 +98,34 @@ async def create_property(
 
 @router.get("/properties", response_model=List[PropertyResponse])
 async def list_properties(
-    current_user: User = Depends(require_landowner),
+    landowner_id: UUID = Depends(get_landowner_profile_id),
     db: AsyncSession = Depends(get_db)
 ):
     """List all properties"""
-    profile = await LandownerService.get_profile(db, current_user.id)
-    properties = await LandownerService.list_properties(db, profile.id)
+    properties = await LandownerService.list_properties(db, landowner_id)
     return properties
 
 
 @router.get("/properties/{property_id}", response_model=PropertyResponse)
 async def get_property(
     property_id: UUID,
-    current_user: User = Depends(require_landowner),
+    landowner_id: UUID = Depends(get_landowner_profile_id),
     db: AsyncSession = Depends(get_db)
 ):
     """Get property"""
-    profile = await LandownerService.get_profile(db, current_user.id)
-    property_obj = await LandownerService.get_property(db, property_id, profile.id)
+    property_obj = await LandownerService.get_property(db, property_id, landowner_id)
     return property_obj
 
 
 @router.post("/projects", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
 async def create_project(
     project_data: ProjectCreate,
-    current_user: User = Depends(require_landowner),
+    landowner_id: UUID = Depends(get_landowner_profile_id),
     db: AsyncSession = Depends(get_db)
 ):
     """Create project"""
     # Verify property ownership
-    profile = await LandownerService.get_profile(db, current_user.id)
-    await LandownerService.get_property(db, project_data.property_id, profile.id)
+    await LandownerService.get_property(db, project_data.property_id, landowner_id)
     
     project = await LandownerService.create_project(
         db,
@@ -134,43 +141,42 @@ async def create_project(
 @router.get("/projects/{project_id}", response_model=ProjectResponse)
 async def get_project(
     project_id: UUID,
-    current_user: User = Depends(require_landowner),
+    landowner_id: UUID = Depends(get_landowner_profile_id),
     db: AsyncSession = Depends(get_db)
 ):
     """Get project"""
-    profile = await LandownerService.get_profile(db, current_user.id)
-    project = await LandownerService.get_project(db, project_id, profile.id)
+    project = await LandownerService.get_project(db, project_id, landowner_id)
     return project
 
 
-@router.post("/projects/{project_id}/publish", response_model=ProjectResponse)
+@router.post("/projects/{project_id}/publish", response_model=ProjectPublishResponse)
 async def publish_project(
     project_id: UUID,
-    current_user: User = Depends(require_landowner),
+    landowner_id: UUID = Depends(get_landowner_profile_id),
     db: AsyncSession = Depends(get_db)
 ):
-    """Publish project (triggers matching)"""
-    profile = await LandownerService.get_profile(db, current_user.id)
-    project = await LandownerService.publish_project(db, project_id, profile.id)
+    """Publish project (queues matching; poll /matching/projects/{id}/jobs/{job_id})"""
+    project = await LandownerService.publish_project(db, project_id, landowner_id)
     
-    # Trigger matching
-    from app.services.matching_service import MatchingService
-    await MatchingService.match_project_to_professionals(db, project_id)
+    # Queue matching instead of running it inline
+    job = await MatchingJobService.enqueue(db, project_id)
     
-    return project
+    return {
+        **ProjectResponse.model_validate(project).model_dump(),
+        "matching_job_id": job.id
+    }
 
 
 @router.post("/projects/{project_id}/jv-preferences", response_model=JVPreferencesResponse, status_code=status.HTTP_201_CREATED)
 async def create_jv_preferences(
     project_id: UUID,
     preferences_data: JVPreferencesCreate,
-    current_user: User = Depends(require_landowner),
+    landowner_id: UUID = Depends(get_landowner_profile_id),
     db: AsyncSession = Depends(get_db)
 ):
     """Create or update JV preferences"""
-    profile = await LandownerService.get_profile(db, current_user.id)
     # Verify project ownership
-    await LandownerService.get_project(db, project_id, profile.id)
+    await LandownerService.get_project(db, project_id, landowner_id)
     
     preferences = await LandownerService.create_jv_preferences(
         db,
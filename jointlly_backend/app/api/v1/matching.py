@@ -1,47 +1,80 @@
 """
 Matching router
 """
-from typing import List
+from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.dependencies import require_authenticated
-from app.models.user import User
-from app.schemas.matching import MatchResponse
+from app.services.principal_cache import Principal
+from app.schemas.matching import (
+    MatchResponse,
+    MatchPageResponse,
+    MatchPreviewResponse,
+    MatchingJobResponse
+)
 from app.services.matching_service import MatchingService
+from app.services.matching_job_service import MatchingJobService
 
 router = APIRouter(prefix="/matching", tags=["Matching"])
 
 
-@router.get("/projects/{project_id}/matches", response_model=List[MatchResponse])
+@router.get("/projects/{project_id}/matches", response_model=MatchPageResponse)
 async def get_project_matches(
     project_id: UUID,
-    limit: int = 10,
-    current_user: User = Depends(require_authenticated),
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None,
+    current_user: Principal = Depends(require_authenticated),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get matched professionals for a project"""
-    matches = await MatchingService.get_project_matches(db, project_id, limit)
-    return matches
+    """Get matched professionals for a project, one page at a time"""
+    matches, next_cursor = await MatchingService.get_project_matches(db, project_id, limit, cursor)
+    return {"items": matches, "next_cursor": next_cursor}
 
 
-@router.get("/professionals/{professional_id}/projects", response_model=List[MatchResponse])
+@router.get("/projects/{project_id}/matches/preview", response_model=List[MatchPreviewResponse])
+async def preview_project_matches(
+    project_id: UUID,
+    k: int = Query(10, ge=1, le=100),
+    current_user: Principal = Depends(require_authenticated),
+    db: AsyncSession = Depends(get_db)
+):
+    """Score candidates on the fly and return the best k without saving matches"""
+    return await MatchingService.preview_top_matches(db, project_id, k)
+
+
+@router.get("/projects/{project_id}/jobs/{job_id}", response_model=MatchingJobResponse)
+async def get_matching_job(
+    project_id: UUID,
+    job_id: UUID,
+    current_user: Principal = Depends(require_authenticated),
+    db: AsyncSession = Depends(get_db)
+):
+    """Poll the status of a queued matching run"""
+    job = await MatchingJobService.get_job(db, project_id, job_id)
+    return job
+
+
+@router.get("/professionals/{professional_id}/projects", response_model=MatchPageResponse)
 async def get_professional_matches(
     professional_id: UUID,
-    limit: int = 10,
-    current_user: User = Depends(require_authenticated),
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None,
+    current_user: Principal = Depends(require_authenticated),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get matched projects for a professional"""
-    matches = await MatchingService.get_professional_matches(db, professional_id, limit)
-    return matches
+    """Get matched projects for a professional, one page at a time"""
+    matches, next_cursor = await MatchingService.get_professional_matches(
+        db, professional_id, limit, cursor
+    )
+    return {"items": matches, "next_cursor": next_cursor}
 
 
 @router.post("/matches/{match_id}/accept", response_model=MatchResponse)
 async def accept_match(
     match_id: UUID,
-    current_user: User = Depends(require_authenticated),
+    current_user: Principal = Depends(require_authenticated),
     db: AsyncSession = Depends(get_db)
 ):
     """Accept a match"""
@@ -52,7 +85,7 @@ async def accept_match(
 @router.post("/matches/{match_id}/reject", response_model=MatchResponse)
 async def reject_match(
     match_id: UUID,
-    current_user: User = Depends(require_authenticated),
+    current_user: Principal = Depends(require_authenticated),
     db: AsyncSession = Depends(get_db)
 ):
     """Reject a match"""
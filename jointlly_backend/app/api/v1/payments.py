@@ -1,13 +1,15 @@
 """
 Payment router
 """
+import json
 from typing import List
 from uuid import UUID
-from fastapi import APIRouter, Depends, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
 from app.database import get_db
 from app.dependencies import require_authenticated
-from app.models.user import User
+from app.services.principal_cache import Principal
 from app.schemas.payment import (
     CreateOrderRequest,
     CreateOrderResponse,
@@ -15,6 +17,7 @@ from app.schemas.payment import (
     TransactionResponse
 )
 from app.services.payment_service import PaymentService
+from app.services.webhook_inbox_service import WebhookInboxService
 
 router = APIRouter(prefix="/payments", tags=["Payments"])
 
@@ -25,7 +28,7 @@ payment_service = PaymentService()
 @router.post("/create-order", response_model=CreateOrderResponse, status_code=status.HTTP_201_CREATED)
 async def create_order(
     order_data: CreateOrderRequest,
-    current_user: User = Depends(require_authenticated),
+    current_user: Principal = Depends(require_authenticated),
     db: AsyncSession = Depends(get_db)
 ):
     """Create Razorpay order"""
@@ -43,7 +46,7 @@ async def create_order(
 @router.post("/verify", response_model=TransactionResponse)
 async def verify_payment(
     verify_data: VerifyPaymentRequest,
-    current_user: User = Depends(require_authenticated),
+    current_user: Principal = Depends(require_authenticated),
     db: AsyncSession = Depends(get_db)
 ):
     """Verify Razorpay payment"""
@@ -65,28 +68,36 @@ async def razorpay_webhook(
     request: Request,
     db: AsyncSession = Depends(get_db)
 ):
-    """Handle Razorpay webhook"""
-    webhook_data = await request.json()
+    """Record a Razorpay webhook in the inbox; the inbox worker applies it"""
+    body = await request.body()
     webhook_signature = request.headers.get("X-Razorpay-Signature")
     
     if not webhook_signature:
-        from fastapi import HTTPException
         raise HTTPException(status_code=400, detail="Missing webhook signature")
     
-    webhook_data["razorpay_signature"] = webhook_signature
+    if settings.razorpay_webhook_secret and not payment_service.gateway.verify_webhook_signature(
+        body, webhook_signature, settings.razorpay_webhook_secret
+    ):
+        raise HTTPException(status_code=400, detail="Invalid webhook signature")
     
-    transaction = await payment_service.handle_webhook(db, webhook_data)
+    try:
+        webhook_data = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid webhook payload")
     
-    if transaction:
-        # Unlock features if applicable
-        await payment_service.unlock_feasibility(db, transaction)
+    await WebhookInboxService.record(
+        db,
+        body,
+        webhook_data,
+        request.headers.get("X-Razorpay-Event-Id")
+    )
     
     return {"status": "success"}
 
 
 @router.get("/transactions", response_model=List[TransactionResponse])
 async def get_transactions(
-    current_user: User = Depends(require_authenticated),
+    current_user: Principal = Depends(require_authenticated),
     db: AsyncSession = Depends(get_db)
 ):
     """Get user transaction history"""
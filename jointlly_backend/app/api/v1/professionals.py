@@ -6,8 +6,8 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
-from app.dependencies import require_professional
-from app.models.user import User
+from app.dependencies import require_professional, get_professional_profile_id
+from app.services.principal_cache import Principal
 from app.schemas.professional import (
     ProfessionalProfileCreate,
     ProfessionalProfileResponse,
@@ -18,15 +18,19 @@ from app.schemas.professional import (
     PortfolioCreate,
     PortfolioResponse,
     PricingTierCreate,
-    PricingTierResponse
+    PricingTierResponse,
+    ProfessionalProfileFullResponse
 )
 from app.schemas.onboarding import (
     OnboardingStatusResponse,
     OnboardingStepResponse
 )
 from app.services.professional_service import ProfessionalService
+from app.services.candidate_index import candidate_index
+from app.services.profile_cache import profile_cache
+from app.services.match_rescore_service import MatchRescoreService
 from app.services.verification_service import VerificationService
-from app.utils.constants import CapabilityType
+from app.utils.constants import CapabilityType, RescoreComponent
 
 router = APIRouter(prefix="/professionals", tags=["Professionals"])
 
@@ -34,7 +38,7 @@ router = APIRouter(prefix="/professionals", tags=["Professionals"])
 @router.post("/profile", response_model=ProfessionalProfileResponse, status_code=status.HTTP_201_CREATED)
 async def create_profile(
     profile_data: ProfessionalProfileCreate,
-    current_user: User = Depends(require_professional),
+    current_user: Principal = Depends(require_professional),
     db: AsyncSession = Depends(get_db)
 ):
     """Create professional profile"""
@@ -48,7 +52,7 @@ async def create_profile(
 
 @router.get("/profile", response_model=ProfessionalProfileResponse)
 async def get_profile(
-    current_user: User = Depends(require_professional),
+    current_user: Principal = Depends(require_professional),
     db: AsyncSession = Depends(get_db)
 ):
     """Get professional profile"""
@@ -56,10 +60,34 @@ async def get_profile(
     return profile
 
 
+@router.get("/profile/full", response_model=ProfessionalProfileFullResponse)
+async def get_full_profile(
+    current_user: Principal = Depends(require_professional),
+    professional_id: UUID = Depends(get_professional_profile_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get professional profile with capabilities, licenses, portfolio, pricing and onboarding details"""
+    cached = profile_cache.get(current_user.id)
+    if cached is not None:
+        return cached
+    
+    # An invalidation committed during the load would otherwise be overwritten by stale rows
+    generation = profile_cache.generation(professional_id)
+    try:
+        profile = await ProfessionalService.get_full_profile(db, current_user.id)
+        response = ProfessionalProfileFullResponse.model_validate(profile)
+    except BaseException:
+        # Cancelled requests too: an unfinished load must not pin its generation
+        profile_cache.release(professional_id)
+        raise
+    profile_cache.put(current_user.id, profile.id, response, generation)
+    return response
+
+
 @router.put("/profile", response_model=ProfessionalProfileResponse)
 async def update_profile(
     profile_data: ProfessionalProfileCreate,
-    current_user: User = Depends(require_professional),
+    current_user: Principal = Depends(require_professional),
     db: AsyncSession = Depends(get_db)
 ):
     """Update professional profile"""
@@ -74,14 +102,13 @@ async def update_profile(
 @router.post("/capabilities", response_model=CapabilityResponse, status_code=status.HTTP_201_CREATED)
 async def add_capability(
     capability_data: CapabilityCreate,
-    current_user: User = Depends(require_professional),
+    professional_id: UUID = Depends(get_professional_profile_id),
     db: AsyncSession = Depends(get_db)
 ):
     """Add capability"""
-    profile = await ProfessionalService.get_profile(db, current_user.id)
     capability = await ProfessionalService.add_capability(
         db,
-        profile.id,
+        professional_id,
         capability_data.capability_type,
         capability_data.description
     )
@@ -90,26 +117,24 @@ async def add_capability(
 
 @router.get("/capabilities", response_model=List[CapabilityResponse])
 async def list_capabilities(
-    current_user: User = Depends(require_professional),
+    professional_id: UUID = Depends(get_professional_profile_id),
     db: AsyncSession = Depends(get_db)
 ):
     """List all capabilities"""
-    profile = await ProfessionalService.get_profile(db, current_user.id)
-    capabilities = await ProfessionalService.list_capabilities(db, profile.id)
+    capabilities = await ProfessionalService.list_capabilities(db, professional_id)
     return capabilities
 
 
 @router.post("/licenses", response_model=LicenseResponse, status_code=status.HTTP_201_CREATED)
 async def add_license(
     license_data: LicenseCreate,
-    current_user: User = Depends(require_professional),
+    professional_id: UUID = Depends(get_professional_profile_id),
     db: AsyncSession = Depends(get_db)
 ):
     """Add license"""
-    profile = await ProfessionalService.get_profile(db, current_user.id)
     license_obj = await ProfessionalService.add_license(
         db,
-        profile.id,
+        professional_id,
         **license_data.model_dump()
     )
     return license_obj
@@ -117,26 +142,24 @@ async def add_license(
 
 @router.get("/licenses", response_model=List[LicenseResponse])
 async def list_licenses(
-    current_user: User = Depends(require_professional),
+    professional_id: UUID = Depends(get_professional_profile_id),
     db: AsyncSession = Depends(get_db)
 ):
     """List all licenses"""
-    profile = await ProfessionalService.get_profile(db, current_user.id)
-    licenses = await ProfessionalService.list_licenses(db, profile.id)
+    licenses = await ProfessionalService.list_licenses(db, professional_id)
     return licenses
 
 
 @router.post("/portfolio", response_model=PortfolioResponse, status_code=status.HTTP_201_CREATED)
 async def add_portfolio_item(
     portfolio_data: PortfolioCreate,
-    current_user: User = Depends(require_professional),
+    professional_id: UUID = Depends(get_professional_profile_id),
     db: AsyncSession = Depends(get_db)
 ):
     """Add portfolio item"""
-    profile = await ProfessionalService.get_profile(db, current_user.id)
     portfolio = await ProfessionalService.add_portfolio_item(
         db,
-        profile.id,
+        professional_id,
         **portfolio_data.model_dump()
     )
     return portfolio
@@ -144,26 +167,24 @@ async def add_portfolio_item(
 
 @router.get("/portfolio", response_model=List[PortfolioResponse])
 async def list_portfolio(
-    current_user: User = Depends(require_professional),
+    professional_id: UUID = Depends(get_professional_profile_id),
     db: AsyncSession = Depends(get_db)
 ):
     """List all portfolio items"""
-    profile = await ProfessionalService.get_profile(db, current_user.id)
-    portfolio = await ProfessionalService.list_portfolio(db, profile.id)
+    portfolio = await ProfessionalService.list_portfolio(db, professional_id)
     return portfolio
 
 
 @router.post("/pricing", response_model=PricingTierResponse, status_code=status.HTTP_201_CREATED)
 async def add_pricing_tier(
     pricing_data: PricingTierCreate,
-    current_user: User = Depends(require_professional),
+    professional_id: UUID = Depends(get_professional_profile_id),
     db: AsyncSession = Depends(get_db)
 ):
     """Add pricing tier"""
-    profile = await ProfessionalService.get_profile(db, current_user.id)
     pricing_tier = await ProfessionalService.add_pricing_tier(
         db,
-        profile.id,
+        professional_id,
         **pricing_data.model_dump()
     )
     return pricing_tier
@@ -171,12 +192,11 @@ async def add_pricing_tier(
 
 @router.get("/pricing", response_model=List[PricingTierResponse])
 async def list_pricing_tiers(
-    current_user: User = Depends(require_professional),
+    professional_id: UUID = Depends(get_professional_profile_id),
     db: AsyncSession = Depends(get_db)
 ):
     """List all pricing tiers"""
-    profile = await ProfessionalService.get_profile(db, current_user.id)
-    pricing_tiers = await ProfessionalService.list_pricing_tiers(db, profile.id)
+    pricing_tiers = await ProfessionalService.list_pricing_tiers(db, professional_id)
     return pricing_tiers
 
 
@@ -185,7 +205,7 @@ async def list_pricing_tiers(
 @router.post("/onboarding/start", response_model=ProfessionalProfileResponse, status_code=status.HTTP_201_CREATED)
 async def start_onboarding(
     capability_type: CapabilityType,
-    current_user: User = Depends(require_professional),
+    current_user: Principal = Depends(require_professional),
     db: AsyncSession = Depends(get_db)
 ):
     """Start onboarding for a capability type"""
@@ -202,14 +222,14 @@ async def complete_onboarding_step(
     capability_type: CapabilityType,
     step_number: int,
     step_data: dict,
-    current_user: User = Depends(require_professional),
+    current_user: Principal = Depends(require_professional),
     db: AsyncSession = Depends(get_db)
 ):
     """Complete a specific onboarding step"""
     profile = await ProfessionalService.get_profile(db, current_user.id)
     result = await ProfessionalService.complete_onboarding_step(
         db,
-        current_user.id,
+        profile,
         capability_type,
         step_number,
         step_data
@@ -220,7 +240,7 @@ async def complete_onboarding_step(
 @router.get("/onboarding/status", response_model=OnboardingStatusResponse)
 async def get_onboarding_status(
     capability_type: CapabilityType,
-    current_user: User = Depends(require_professional),
+    current_user: Principal = Depends(require_professional),
     db: AsyncSession = Depends(get_db)
 ):
     """Get onboarding status for a capability type"""
@@ -235,7 +255,7 @@ async def get_onboarding_status(
 @router.post("/onboarding/{capability_type}/submit", response_model=ProfessionalProfileResponse)
 async def submit_onboarding(
     capability_type: CapabilityType,
-    current_user: User = Depends(require_professional),
+    current_user: Principal = Depends(require_professional),
     db: AsyncSession = Depends(get_db)
 ):
     """Submit and finalize onboarding"""
@@ -252,7 +272,7 @@ async def submit_onboarding(
 @router.post("/verify/company")
 async def verify_company(
     company_name: str,
-    current_user: User = Depends(require_professional),
+    current_user: Principal = Depends(require_professional),
     db: AsyncSession = Depends(get_db)
 ):
     """Verify company name (placeholder)"""
@@ -265,7 +285,7 @@ async def verify_company(
 async def verify_address(
     address: str,
     city: str = "Bangalore",
-    current_user: User = Depends(require_professional),
+    current_user: Principal = Depends(require_professional),
     db: AsyncSession = Depends(get_db)
 ):
     """Verify address (placeholder)"""
@@ -278,7 +298,7 @@ async def verify_address(
 async def verify_license(
     license_number: str,
     issuing_authority: Optional[str] = None,
-    current_user: User = Depends(require_professional),
+    current_user: Principal = Depends(require_professional),
     db: AsyncSession = Depends(get_db)
 ):
     """Verify license (placeholder)"""
@@ -293,28 +313,28 @@ async def verify_license(
 async def add_location_preferences(
     location_preferences: List[dict],
     capability_type: Optional[CapabilityType] = None,
-    current_user: User = Depends(require_professional),
+    professional_id: UUID = Depends(get_professional_profile_id),
     db: AsyncSession = Depends(get_db)
 ):
     """Add location preferences with radius"""
     from app.models.professional import LocationPreference
     
-    profile = await ProfessionalService.get_profile(db, current_user.id)
-    
     created_locations = []
     for loc_data in location_preferences:
         location = LocationPreference(
-            professional_id=profile.id,
+            professional_id=professional_id,
             location_name=loc_data.get("location_name"),
             radius_km=loc_data.get("radius_km"),
+            latitude=loc_data.get("latitude"),
+            longitude=loc_data.get("longitude"),
             capability_type=capability_type or CapabilityType.CONSTRUCTION
         )
         db.add(location)
         created_locations.append(location)
     
-    await db.commit()
-    for loc in created_locations:
-        await db.refresh(loc)
+    await MatchRescoreService.mark_professional(db, professional_id, [RescoreComponent.LOCATION])
+    await db.flush()
+    candidate_index.mark_dirty_on_commit(db, professional_id)
     
     return {"message": "Location preferences added", "count": len(created_locations)}
 
@@ -323,19 +343,17 @@ async def add_location_preferences(
 async def add_subcontractor_scopes(
     scopes: List[dict],
     capability_type: Optional[CapabilityType] = None,
-    current_user: User = Depends(require_professional),
+    professional_id: UUID = Depends(get_professional_profile_id),
     db: AsyncSession = Depends(get_db)
 ):
     """Add subcontractor scope details"""
     from app.models.professional import SubcontractorScope
     from app.utils.constants import SubcontractorScopeType
     
-    profile = await ProfessionalService.get_profile(db, current_user.id)
-    
     created_scopes = []
     for scope_data in scopes:
         scope = SubcontractorScope(
-            professional_id=profile.id,
+            professional_id=professional_id,
             scope_type=SubcontractorScopeType(scope_data.get("scope_type")),
             description=scope_data.get("description"),
             capability_type=capability_type or CapabilityType.CONSTRUCTION
@@ -343,9 +361,7 @@ async def add_subcontractor_scopes(
         db.add(scope)
         created_scopes.append(scope)
     
-    await db.commit()
-    for scope in created_scopes:
-        await db.refresh(scope)
+    await db.flush()
     
     return {"message": "Subcontractor scopes added", "count": len(created_scopes)}
 
@@ -356,17 +372,15 @@ async def add_project_size_category(
     custom_range: Optional[str] = None,
     wallet_size_range: Optional[str] = None,
     capability_type: CapabilityType = CapabilityType.CONSTRUCTION,
-    current_user: User = Depends(require_professional),
+    professional_id: UUID = Depends(get_professional_profile_id),
     db: AsyncSession = Depends(get_db)
 ):
     """Add project size category"""
     from app.models.professional import ProjectSizeCategory
     from app.utils.constants import ProjectSizeCategoryEnum, WalletSizeRange
     
-    profile = await ProfessionalService.get_profile(db, current_user.id)
-    
     size_cat = ProjectSizeCategory(
-        professional_id=profile.id,
+        professional_id=professional_id,
         capability_type=capability_type,
         size_category=ProjectSizeCategoryEnum(size_category),
         custom_range=custom_range,
@@ -374,8 +388,7 @@ async def add_project_size_category(
     )
     
     db.add(size_cat)
-    await db.commit()
-    await db.refresh(size_cat)
+    await db.flush()
     
     return {"message": "Project size category added", "id": str(size_cat.id)}
 
@@ -383,15 +396,13 @@ async def add_project_size_category(
 @router.post("/pricing/detailed", status_code=status.HTTP_201_CREATED)
 async def add_detailed_pricing(
     pricing_data: dict,
-    current_user: User = Depends(require_professional),
+    professional_id: UUID = Depends(get_professional_profile_id),
     db: AsyncSession = Depends(get_db)
 ):
     """Add detailed pricing structure"""
     from app.models.professional import ProfessionalPricing
     from app.utils.constants import PricingTierType, ProjectIntent
     
-    profile = await ProfessionalService.get_profile(db, current_user.id)
-    
     capability_type = CapabilityType(pricing_data.get("capability_type", "CONSTRUCTION"))
     project_type = ProjectIntent(pricing_data.get("project_type")) if pricing_data.get("project_type") else None
     pricing_tier = PricingTierType(pricing_data.get("pricing_tier")) if pricing_data.get("pricing_tier") else None
@@ -399,7 +410,7 @@ async def add_detailed_pricing(
     custom_pricing = pricing_data.get("custom_pricing")
     
     pricing = ProfessionalPricing(
-        professional_id=profile.id,
+        professional_id=professional_id,
         capability_type=capability_type,
         project_type=project_type,
         pricing_tier=pricing_tier,
@@ -408,8 +419,7 @@ async def add_detailed_pricing(
     )
     
     db.add(pricing)
-    await db.commit()
-    await db.refresh(pricing)
+    await db.flush()
     
     return {"message": "Detailed pricing added", "id": str(pricing.id)}
 
@@ -418,7 +428,7 @@ async def add_detailed_pricing(
 async def add_jv_preferences(
     preferred_jv_models: List[str],
     rera_registered_projects_count: Optional[int] = None,
-    current_user: User = Depends(require_professional),
+    current_user: Principal = Depends(require_professional),
     db: AsyncSession = Depends(get_db)
 ):
     """Add JV/JD preferences"""
@@ -438,8 +448,7 @@ async def add_jv_preferences(
         if rera_registered_projects_count is not None:
             existing.rera_registered_projects_count = rera_registered_projects_count
             profile.rera_project_count = rera_registered_projects_count
-        await db.commit()
-        await db.refresh(existing)
+        await db.flush()
         return {"message": "JV preferences updated", "id": str(existing.id)}
     
     jv_prefs = JVJDPreferences(
@@ -449,8 +458,7 @@ async def add_jv_preferences(
     )
     
     db.add(jv_prefs)
-    await db.commit()
-    await db.refresh(jv_prefs)
+    await db.flush()
     
     return {"message": "JV preferences added", "id": str(jv_prefs.id)}
 
@@ -458,27 +466,23 @@ async def add_jv_preferences(
 @router.post("/reconstruction-work-types", status_code=status.HTTP_201_CREATED)
 async def add_reconstruction_work_types(
     work_types: List[dict],
-    current_user: User = Depends(require_professional),
+    professional_id: UUID = Depends(get_professional_profile_id),
     db: AsyncSession = Depends(get_db)
 ):
     """Add reconstruction work type preferences"""
     from app.models.professional import ReconstructionWorkType
     from app.utils.constants import ReconstructionWorkType as ReconstructionWorkTypeEnum
     
-    profile = await ProfessionalService.get_profile(db, current_user.id)
-    
     created_work_types = []
     for work_type_data in work_types:
         work_type = ReconstructionWorkType(
-            professional_id=profile.id,
+            professional_id=professional_id,
             work_type=ReconstructionWorkTypeEnum(work_type_data.get("work_type")),
             custom_description=work_type_data.get("custom_description")
         )
         db.add(work_type)
         created_work_types.append(work_type)
     
-    await db.commit()
-    for wt in created_work_types:
-        await db.refresh(wt)
+    await db.flush()
     
     return {"message": "Reconstruction work types added", "count": len(created_work_types)}
@@ -5,38 +5,57 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
-from app.dependencies import require_landowner, require_authenticated
-from app.models.user import User
+from app.dependencies import get_landowner_profile_id, require_authenticated, require_admin
+from app.services.principal_cache import Principal
 from app.schemas.verification import (
     FARCalculationRequest,
     FARCalculationResponse,
     FeasibilityReportResponse,
+    FeasibilityBatchRequest,
+    FeasibilityBatchResponse,
     PIDVerificationRequest,
+    PIDVerificationStatusUpdate,
     PIDVerificationResponse
 )
 from app.services.far_service import FARService
 from app.services.feasibility_service import FeasibilityService
+from app.services.feasibility_batch_service import FeasibilityBatchService
 from app.services.landowner_service import LandownerService
 
 router = APIRouter(prefix="/projects", tags=["Projects"])
 
 
+@router.post("/feasibility/batch", response_model=FeasibilityBatchResponse)
+async def batch_feasibility(
+    batch: FeasibilityBatchRequest,
+    landowner_id: UUID = Depends(get_landowner_profile_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """Evaluate FAR and feasibility for many plots (e.g. a land bank) in one request"""
+    results, persisted = await FeasibilityBatchService.evaluate(
+        db,
+        [plot.model_dump() for plot in batch.plots],
+        landowner_id=landowner_id,
+        persist=batch.persist
+    )
+    return {"results": results, "persisted": persisted}
+
+
 @router.post("/{project_id}/calculate-far", response_model=FARCalculationResponse, status_code=status.HTTP_201_CREATED)
 async def calculate_far(
     project_id: UUID,
     far_data: FARCalculationRequest,
-    current_user: User = Depends(require_landowner),
+    landowner_id: UUID = Depends(get_landowner_profile_id),
     db: AsyncSession = Depends(get_db)
 ):
     """Calculate FAR for a project (free)"""
     # Verify project ownership
-    profile = await LandownerService.get_profile(db, current_user.id)
-    project = await LandownerService.get_project(db, project_id, profile.id)
+    project = await LandownerService.get_project(db, project_id, landowner_id)
     
     # Create FAR calculation
     far_calculation = await FARService.create_far_calculation(
         db,
-        str(project.property_id),
+        project.property_id,
         far_data.road_width_ft,
         far_data.zone_type
     )
@@ -46,12 +65,12 @@ async def calculate_far(
 @router.get("/{project_id}/far", response_model=FARCalculationResponse)
 async def get_far_calculation(
     project_id: UUID,
-    current_user: User = Depends(require_authenticated),
+    current_user: Principal = Depends(require_authenticated),
     db: AsyncSession = Depends(get_db)
 ):
     """Get FAR calculation for a project"""
     project = await LandownerService.get_project(db, project_id)
-    far_calculation = await FARService.get_far_calculation(db, str(project.property_id))
+    far_calculation = await FARService.get_far_calculation(db, project.property_id)
     
     if not far_calculation:
         from fastapi import HTTPException
@@ -63,16 +82,15 @@ async def get_far_calculation(
 @router.post("/{project_id}/feasibility", response_model=FeasibilityReportResponse, status_code=status.HTTP_201_CREATED)
 async def generate_feasibility_report(
     project_id: UUID,
-    current_user: User = Depends(require_landowner),
+    landowner_id: UUID = Depends(get_landowner_profile_id),
     db: AsyncSession = Depends(get_db)
 ):
-    """Generate feasibility report (basic metrics free, detailed requires payment)"""
+    """Generate feasibility report (basic metrics free, detailed requires payment; unchanged inputs return the stored report)"""
     # Verify project ownership
-    profile = await LandownerService.get_profile(db, current_user.id)
-    project = await LandownerService.get_project(db, project_id, profile.id)
+    project = await LandownerService.get_project(db, project_id, landowner_id)
     
     # Get FAR calculation for total buildable area
-    far_calc = await FARService.get_far_calculation(db, str(project.property_id))
+    far_calc = await FARService.get_far_calculation(db, project.property_id)
     if not far_calc:
         from fastapi import HTTPException
         raise HTTPException(status_code=400, detail="FAR calculation required first")
@@ -80,9 +98,11 @@ async def generate_feasibility_report(
     # Create feasibility report (unlocked=False by default)
     feasibility_report = await FeasibilityService.create_feasibility_report(
         db,
-        str(project.property_id),
+        project.property_id,
         far_calc.total_buildable_area,
-        is_unlocked=False
+        is_unlocked=False,
+        road_width_ft=far_calc.road_width_ft,
+        zone_type=far_calc.zone_type
     )
     return feasibility_report
 
@@ -90,14 +110,14 @@ async def generate_feasibility_report(
 @router.get("/{project_id}/feasibility", response_model=FeasibilityReportResponse)
 async def get_feasibility_report(
     project_id: UUID,
-    current_user: User = Depends(require_authenticated),
+    current_user: Principal = Depends(require_authenticated),
     db: AsyncSession = Depends(get_db)
 ):
     """Get feasibility report (unlock if paid)"""
     project = await LandownerService.get_project(db, project_id)
     feasibility_report = await FeasibilityService.get_feasibility_report(
         db,
-        str(project.property_id)
+        project.property_id
     )
     
     if not feasibility_report:
@@ -124,7 +144,7 @@ async def get_feasibility_report(
             # Unlock the report
             feasibility_report = await FeasibilityService.unlock_feasibility_report(
                 db,
-                str(project.property_id)
+                project.property_id
             )
     
     return feasibility_report
@@ -134,13 +154,12 @@ async def get_feasibility_report(
 async def verify_pid(
     project_id: UUID,
     pid_data: PIDVerificationRequest,
-    current_user: User = Depends(require_landowner),
+    landowner_id: UUID = Depends(get_landowner_profile_id),
     db: AsyncSession = Depends(get_db)
 ):
     """Request PID verification"""
     # Verify project ownership
-    profile = await LandownerService.get_profile(db, current_user.id)
-    project = await LandownerService.get_project(db, project_id, profile.id)
+    project = await LandownerService.get_project(db, project_id, landowner_id)
     
     # Create PID verification request
     from app.models.verification import PIDVerification
@@ -155,10 +174,25 @@ async def verify_pid(
     )
     
     db.add(pid_verification)
-    await db.commit()
-    await db.refresh(pid_verification)
+    await db.flush()
     
     # TODO: Integrate with actual PID verification API (BBMPTAX.KARNATAKA.GOV.IN)
-    # For now, this is a placeholder
+    # Until then outcomes are recorded with POST /pid-verifications/{id}/status
     
     return pid_verification
+
+
+@router.post("/pid-verifications/{verification_id}/status", response_model=PIDVerificationResponse)
+async def record_pid_verification_outcome(
+    verification_id: UUID,
+    outcome: PIDVerificationStatusUpdate,
+    current_user: Principal = Depends(require_admin),
+    db: AsyncSession = Depends(get_db)
+):
+    """Record a PID verification outcome (admin, until the BBMP integration reports it); re-scores the property's matches"""
+    pid_verification = await LandownerService.update_pid_verification_status(
+        db,
+        verification_id,
+        outcome.verification_status
+    )
+    return pid_verification
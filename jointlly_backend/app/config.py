@@ -38,10 +38,48 @@ class Settings(BaseSettings):
         default=7,
         description="Refresh token expiration in days"
     )
+    jwt_decode_cache_max_entries: int = Field(
+        default=4096,
+        description="Verified token payloads cached until their exp; 0 disables"
+    )
+    principal_cache_ttl_seconds: float = Field(
+        default=60.0,
+        description="How long an authenticated user's id/role/active snapshot is cached"
+    )
+    principal_cache_max_entries: int = Field(
+        default=10000,
+        description="Cached user snapshots kept before least recently used are evicted"
+    )
+    trust_token_role_claim: bool = Field(
+        default=False,
+        description="Authorize from the access token's role claim without a user lookup; "
+                    "deactivation then takes effect only when the token expires"
+    )
     
     # Razorpay
     razorpay_key_id: str = Field(..., description="Razorpay Key ID")
     razorpay_key_secret: str = Field(..., description="Razorpay Key Secret")
+    razorpay_base_url: str = Field(
+        default="https://api.razorpay.com",
+        description="Razorpay API base URL (point at benchmarks.razorpay_stub locally)"
+    )
+    razorpay_timeout_seconds: float = Field(default=10.0, description="Razorpay request timeout")
+    razorpay_max_retries: int = Field(
+        default=2,
+        description="Retries for Razorpay transport errors, 429 and 5xx responses"
+    )
+    razorpay_backoff_seconds: float = Field(
+        default=0.2,
+        description="Base delay for jittered exponential retry backoff"
+    )
+    razorpay_max_connections: int = Field(
+        default=20,
+        description="Pooled keep-alive connections to Razorpay"
+    )
+    razorpay_webhook_secret: Optional[str] = Field(
+        default=None,
+        description="Webhook secret; when set, X-Razorpay-Signature is verified against the raw body"
+    )
     
     # Application
     app_name: str = Field(default="Jointly Real Estate Platform")
@@ -61,6 +99,140 @@ class Settings(BaseSettings):
     # Server
     host: str = Field(default="0.0.0.0", description="Server host")
     port: int = Field(default=8000, description="Server port")
+
+    # Password hashing
+    password_hash_workers: int = Field(
+        default=4,
+        description="Threads dedicated to PBKDF2 hashing and verification"
+    )
+    password_hash_queue_limit: int = Field(
+        default=64,
+        description="Hash requests allowed to wait before new ones get 503"
+    )
+    
+    # Matching jobs
+    matching_worker_in_process: bool = Field(
+        default=True,
+        description="Run a matching job worker inside the API process"
+    )
+    matching_worker_poll_seconds: float = Field(
+        default=2.0,
+        description="Idle delay between queue polls"
+    )
+    matching_job_max_attempts: int = Field(
+        default=5,
+        description="Attempts before a matching job is marked FAILED"
+    )
+    matching_job_backoff_seconds: float = Field(
+        default=5.0,
+        description="Base delay for exponential retry backoff"
+    )
+    matching_job_lock_timeout_seconds: int = Field(
+        default=300,
+        description="RUNNING jobs locked longer than this are reclaimed"
+    )
+    matching_job_requeue_cooldown_seconds: float = Field(
+        default=3600.0,
+        description="Re-publishing a project re-runs its finished matching job at most this often"
+    )
+    
+    # Candidate index
+    candidate_index_enabled: bool = Field(
+        default=True,
+        description="Look up matching candidates in the in-memory index"
+    )
+    candidate_index_ttl_seconds: float = Field(
+        default=300.0,
+        description="Full index rebuild interval"
+    )
+    candidate_index_change_window_seconds: float = Field(
+        default=120.0,
+        description="Professionals whose updated_at falls in this window are re-checked before "
+                    "a lookup; covers writes from other processes and their commit latency"
+    )
+    candidate_index_poll_seconds: float = Field(
+        default=5.0,
+        description="Minimum interval between change-window checks; bounds how long another "
+                    "process's professional writes stay invisible to this index"
+    )
+    default_service_radius_km: float = Field(
+        default=25.0,
+        description="Service radius for geolocated location preferences without radius_km"
+    )
+    
+    # Match re-scoring
+    rescore_batch_size: int = Field(
+        default=500,
+        description="Stale match marks processed per re-scoring batch"
+    )
+    rescore_poll_seconds: float = Field(
+        default=5.0,
+        description="Idle delay between re-scoring batches"
+    )
+    
+    # Payment webhooks
+    webhook_worker_in_process: bool = Field(
+        default=True,
+        description="Run the webhook inbox consumer inside the API process"
+    )
+    webhook_batch_size: int = Field(
+        default=200,
+        description="Webhook events applied per batch"
+    )
+    webhook_poll_seconds: float = Field(
+        default=1.0,
+        description="Idle delay between webhook inbox polls"
+    )
+    webhook_retry_base_seconds: float = Field(
+        default=5.0,
+        description="First retry delay for an event whose order has no transaction yet; doubles per attempt"
+    )
+    webhook_retry_max_seconds: float = Field(
+        default=900.0,
+        description="Longest retry delay for an event whose order has no transaction yet"
+    )
+    payment_reconcile_interval_seconds: float = Field(
+        default=300.0,
+        description="How often the webhook worker looks up orders of PENDING transactions without one; 0 disables"
+    )
+    payment_reconcile_after_seconds: float = Field(
+        default=600.0,
+        description="Age after which a PENDING transaction without an order id is reconciled"
+    )
+    
+    # Credibility scores
+    credibility_batch_size: int = Field(
+        default=1000,
+        description="Professionals recomputed per page by the batch credibility job"
+    )
+    credibility_recompute_interval_seconds: float = Field(
+        default=86400.0,
+        description="Full credibility recompute interval in the standalone worker; 0 disables"
+    )
+    
+    # Aggregated professional profile cache
+    profile_cache_ttl_seconds: float = Field(
+        default=300.0,
+        description="How long GET /professionals/profile/full responses are cached; 0 disables"
+    )
+    profile_cache_max_entries: int = Field(
+        default=10000,
+        description="Cached aggregated profiles kept before least recently used are evicted"
+    )
+    
+    # Query statistics
+    query_stats_enabled: bool = Field(
+        default=True,
+        description="Count SQL statements per request and report them in response headers"
+    )
+    query_warn_threshold: int = Field(
+        default=30,
+        description="Log a warning when a request issues more statements than this"
+    )
+    query_repeat_threshold: int = Field(
+        default=5,
+        description="Log a possible N+1 when one statement shape repeats this many times in a request"
+    )
     
     @property
     def database_url_sync(self) -> str:
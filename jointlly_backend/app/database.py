@@ -1,24 +1,28 @@
 """
 Database configuration and session management
 """
-from typing import AsyncGenerator
+from typing import AsyncGenerator, List
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     create_async_engine,
     async_sessionmaker,
     AsyncEngine
 )
+from sqlalchemy import ARRAY, JSON, String, insert, Table
+from sqlalchemy.sql.dml import Insert
 from sqlalchemy.orm import declarative_base
 from app.config import settings
 
+# SQLite (local scratch databases) does not take queue pool sizing
+_pool_options = {} if settings.database_url.startswith("sqlite") else {"pool_size": 10, "max_overflow": 20}
+
 # Create async engine
 engine: AsyncEngine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
     future=True,
     pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
+    **_pool_options,
 )
 
 # Create async session factory
@@ -33,10 +37,17 @@ AsyncSessionLocal = async_sessionmaker(
 # Base class for models
 Base = declarative_base()
 
+# List of strings: a native ARRAY on PostgreSQL, JSON on MySQL (as in
+# database_schema.sql) and SQLite, which have no array type
+StringArray = ARRAY(String).with_variant(JSON(), "mysql", "sqlite")
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency for getting database session
+    
+    One unit of work per request: services flush, and the request's writes
+    are committed here once the endpoint returns (or rolled back if it raises).
     """
     async with AsyncSessionLocal() as session:
         try:
@@ -49,6 +60,38 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+def insert_ignore_conflicts(table: Table, dialect_name: str) -> Insert:
+    """
+    Build a multi-row INSERT that skips rows violating a unique constraint
+    """
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+        return pg_insert(table).on_conflict_do_nothing()
+    if dialect_name == "mysql":
+        return insert(table).prefix_with("IGNORE")
+    if dialect_name == "sqlite":
+        return insert(table).prefix_with("OR IGNORE")
+    return insert(table)
+
+
+def insert_or_increment(table: Table, dialect_name: str, key_columns: List[str], counter: str) -> Insert:
+    """
+    Build a multi-row INSERT that, for rows conflicting on key_columns,
+    increments counter on the stored row instead
+    """
+    bumped = {counter: table.c[counter] + 1}
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+        return pg_insert(table).on_conflict_do_update(index_elements=key_columns, set_=bumped)
+    if dialect_name == "mysql":
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+        return mysql_insert(table).on_duplicate_key_update(bumped)
+    if dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+        return sqlite_insert(table).on_conflict_do_update(index_elements=key_columns, set_=bumped)
+    return insert(table)
+
+
 async def init_db() -> None:
     """
     Initialize database (create tables)
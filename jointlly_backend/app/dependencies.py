@@ -7,8 +7,14 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from app.config import settings
 from app.database import get_db
 from app.models.user import User
+from app.models.landowner import LandownerProfile
+from app.models.professional import ProfessionalProfile
+from app.services.principal_cache import Principal, principal_cache
+from app.services.landowner_service import LandownerService
+from app.services.professional_service import ProfessionalService
 from app.utils.constants import Role
 from app.utils.jwt import decode_token
 from app.exceptions import UnauthorizedError, ForbiddenError
@@ -19,35 +25,64 @@ security = HTTPBearer()
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: AsyncSession = Depends(get_db)
-) -> User:
+) -> Principal:
     """
     Get current authenticated user from JWT token
+    Returns a cached (id, role, is_active, profile ids) snapshot; load the
+    User row explicitly where other columns are needed.
     """
     token = credentials.credentials
     
     try:
         payload = decode_token(token)
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise UnauthorizedError("Invalid token")
+        user_id = UUID(payload.get("sub"))
     except Exception:
         raise UnauthorizedError("Invalid or expired token")
     
-    # Get user from database
-    result = await db.execute(select(User).where(User.id == UUID(user_id)))
-    user = result.scalar_one_or_none()
+    # Authorization straight from the signed claim, no lookup at all
+    if settings.trust_token_role_claim and payload.get("role"):
+        try:
+            return Principal(id=user_id, role=Role(payload["role"]), is_active=True)
+        except ValueError:
+            raise UnauthorizedError("Invalid token")
+    
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        result = await db.execute(
+            select(
+                User.id,
+                User.role,
+                User.is_active,
+                LandownerProfile.id.label("landowner_profile_id"),
+                ProfessionalProfile.id.label("professional_profile_id")
+            )
+            .outerjoin(LandownerProfile, LandownerProfile.user_id == User.id)
+            .outerjoin(ProfessionalProfile, ProfessionalProfile.user_id == User.id)
+            .where(User.id == user_id)
+        )
+        row = result.first()
+        if row is None:
+            raise UnauthorizedError("User not found")
+        principal = Principal(
+            id=row.id,
+            role=row.role,
+            is_active=row.is_active == "true",
+            landowner_profile_id=row.landowner_profile_id,
+            professional_profile_id=row.professional_profile_id
+        )
+        principal_cache.put(principal)
     
-    if user is None:
-        raise UnauthorizedError("User not found")
+    if not principal.is_active:
+        raise UnauthorizedError("User account is inactive")
     
-    return user
+    return principal
 
 
 def require_role(*allowed_roles: Role):
     """
     Dependency factory for role-based access control
     """
-    async def role_checker(current_user: User = Depends(get_current_user)) -> User:
+    async def role_checker(current_user: Principal = Depends(get_current_user)) -> Principal:
         if current_user.role not in allowed_roles:
             raise ForbiddenError(
                 f"Access denied. Required roles: {', '.join(r.value for r in allowed_roles)}"
@@ -62,3 +97,32 @@ require_landowner = require_role(Role.LANDOWNER)
 require_professional = require_role(Role.PROFESSIONAL)
 require_admin = require_role(Role.ADMIN)
 require_authenticated = get_current_user
+
+
+async def get_landowner_profile_id(
+    current_user: Principal = Depends(require_landowner),
+    db: AsyncSession = Depends(get_db)
+) -> UUID:
+    """
+    Landowner profile id of the current user
+    Comes with the principal; only a missing profile or a principal built
+    from token claims falls back to a lookup, which raises NotFoundError.
+    """
+    if current_user.landowner_profile_id is not None:
+        return current_user.landowner_profile_id
+    profile = await LandownerService.get_profile(db, current_user.id)
+    return profile.id
+
+
+async def get_professional_profile_id(
+    current_user: Principal = Depends(require_professional),
+    db: AsyncSession = Depends(get_db)
+) -> UUID:
+    """
+    Professional profile id of the current user
+    Same resolution as get_landowner_profile_id.
+    """
+    if current_user.professional_profile_id is not None:
+        return current_user.professional_profile_id
+    profile = await ProfessionalService.get_profile(db, current_user.id)
+    return profile.id
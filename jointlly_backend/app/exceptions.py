@@ -49,6 +49,12 @@ class ConflictError(AppException):
         super().__init__(message, status_code=status.HTTP_409_CONFLICT)
 
 
+class ServiceUnavailableError(AppException):
+    """Temporarily overloaded exception"""
+    def __init__(self, message: str = "Service temporarily unavailable"):
+        super().__init__(message, status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+
 async def app_exception_handler(request: Request, exc: AppException) -> JSONResponse:
     """Handle application exceptions"""
     return JSONResponse(
@@ -1,11 +1,21 @@
 """
 FastAPI application entry point
 """
-from fastapi import FastAPI
+import asyncio
+import os
+import socket
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from app.config import settings
-from app.database import init_db, close_db
+from app.database import init_db, close_db, engine
+from app.dependencies import require_admin
+from app.utils.password import password_pool
+from app.services.principal_cache import principal_cache
+from app.services.profile_cache import profile_cache
+from app.utils.jwt import token_cache
+from app.services.razorpay_gateway import razorpay_gateway
+from app.utils.query_stats import QueryStatsMiddleware, install_query_stats
 from app.exceptions import (
     AppException,
     app_exception_handler,
@@ -25,8 +35,32 @@ async def lifespan(app: FastAPI):
     """Application lifespan events"""
     # Startup
     # await init_db()  # Use Alembic migrations instead
+    worker_stop = asyncio.Event()
+    worker_tasks = []
+    if settings.matching_worker_in_process:
+        from app.services.matching_job_service import MatchingJobService
+        from app.services.match_rescore_service import MatchRescoreService
+        worker_tasks.append(asyncio.create_task(
+            MatchingJobService.run_worker(
+                f"{socket.gethostname()}:{os.getpid()}:api",
+                worker_stop
+            )
+        ))
+        worker_tasks.append(asyncio.create_task(
+            MatchRescoreService.run_worker(worker_stop)
+        ))
+    if settings.webhook_worker_in_process:
+        from app.services.webhook_inbox_service import WebhookInboxService
+        worker_tasks.append(asyncio.create_task(
+            WebhookInboxService.run_worker(worker_stop)
+        ))
     yield
     # Shutdown
+    if worker_tasks:
+        worker_stop.set()
+        await asyncio.gather(*worker_tasks)
+    password_pool.shutdown()
+    await razorpay_gateway.aclose()
     await close_db()
 
 
@@ -47,6 +81,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-request SQL statement counts (Server-Timing / X-DB-Queries)
+if settings.query_stats_enabled:
+    install_query_stats(engine.sync_engine)
+    app.add_middleware(QueryStatsMiddleware)
+
 # Exception handlers
 app.add_exception_handler(AppException, app_exception_handler)
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
@@ -78,5 +117,16 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", dependencies=[Depends(require_admin)])
+async def metrics():
+    """Runtime metrics (admins only)"""
+    return {
+        "password_hashing": password_pool.metrics(),
+        "principal_cache": principal_cache.metrics(),
+        "profile_cache": profile_cache.metrics(),
+        "token_cache": token_cache.metrics()
+    }
+
+
 # Store settings in app state for exception handlers
 app.state.settings = settings
@@ -20,8 +20,8 @@ from app.models.professional import (
     ReconstructionWorkType
 )
 from app.models.verification import FARCalculation, FeasibilityReport, PIDVerification
-from app.models.payment import Transaction, Payment
-from app.models.matching import Match, MatchScore
+from app.models.payment import Transaction, Payment, WebhookEvent
+from app.models.matching import Match, MatchScore, MatchingJob, MatchRescore
 
 __all__ = [
     "Base",
@@ -46,6 +46,9 @@ __all__ = [
     "PIDVerification",
     "Transaction",
     "Payment",
+    "WebhookEvent",
     "Match",
     "MatchScore",
+    "MatchingJob",
+    "MatchRescore",
 ]
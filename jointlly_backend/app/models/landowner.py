@@ -5,11 +5,11 @@ from uuid import uuid4
 from datetime import datetime
 from sqlalchemy import (
     Column, String, Integer, Float, Boolean, Text, DateTime,
-    ForeignKey, Enum as SQLEnum, ARRAY
+    ForeignKey, Enum as SQLEnum
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
-from app.database import Base
+from app.database import Base, StringArray
 from app.utils.constants import ProjectType, ProjectStatus, ProjectIntent, JVPostConstructionExpectation
 
 
@@ -72,11 +72,14 @@ class Property(Base):
     ward = Column(String(100), nullable=True)
     landmark = Column(String(255), nullable=True)
     google_maps_pin = Column(String(500), nullable=True)
+    # Parsed from google_maps_pin when it carries coordinates
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
     width_ft = Column(Float, nullable=True)
     length_ft = Column(Float, nullable=True)
     facing = Column(String(50), nullable=True)
     is_corner_plot = Column(Boolean, default=False, nullable=False)
-    facings = Column(ARRAY(String), nullable=True)  # For corner plots
+    facings = Column(StringArray, nullable=True)  # For corner plots
     road_width_ft = Column(Float, nullable=True)
     khatha_type = Column(String(100), nullable=True)
     e_khatha_status = Column(String(100), nullable=True)
@@ -4,19 +4,25 @@ Matching models
 from uuid import uuid4
 from datetime import datetime
 from sqlalchemy import (
-    Column, Float, DateTime, ForeignKey,
-    Enum as SQLEnum
+    Column, Float, Integer, String, Text, DateTime, ForeignKey,
+    Enum as SQLEnum, UniqueConstraint, Index, text
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.database import Base
-from app.utils.constants import MatchStatus
+from app.utils.constants import MatchStatus, JobStatus, RescoreComponent
 
 
 class Match(Base):
     """Match model between projects and professionals"""
     
     __tablename__ = "matches"
+    __table_args__ = (
+        UniqueConstraint("project_id", "professional_id", name="uq_matches_project_professional"),
+        # Serve per-project / per-professional ranking and keyset pagination
+        Index("ix_matches_project_score", "project_id", text("match_score DESC"), text("id DESC")),
+        Index("ix_matches_professional_score", "professional_id", text("match_score DESC"), text("id DESC")),
+    )
     
     id = Column(
         UUID(as_uuid=True),
@@ -92,3 +98,86 @@ class MatchScore(Base):
     
     def __repr__(self) -> str:
         return f"<MatchScore(id={self.id}, match_id={self.match_id}, total_score={self.total_score})>"
+
+
+class MatchingJob(Base):
+    """Queued matching run for a published project"""
+    
+    __tablename__ = "matching_jobs"
+    __table_args__ = (
+        Index("ix_matching_jobs_status_run_after", "status", "run_after"),
+    )
+    
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid4,
+        index=True
+    )
+    project_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("projects.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
+    # One live job per project: repeated publishes reuse this row
+    idempotency_key = Column(String(100), unique=True, nullable=False)
+    status = Column(
+        SQLEnum(JobStatus, name="job_status"),
+        default=JobStatus.QUEUED,
+        nullable=False
+    )
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, default=5, nullable=False)
+    run_after = Column(DateTime, default=datetime.utcnow, nullable=False)
+    locked_by = Column(String(100), nullable=True)
+    locked_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    matches_created = Column(Integer, nullable=True)
+    completed_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(
+        DateTime,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        nullable=False
+    )
+    
+    # Relationships
+    project = relationship("Project")
+    
+    def __repr__(self) -> str:
+        return f"<MatchingJob(id={self.id}, project_id={self.project_id}, status={self.status})>"
+
+
+class MatchRescore(Base):
+    """Match whose stored score is stale for one component"""
+    
+    __tablename__ = "match_rescores"
+    __table_args__ = (
+        # One mark per component; repeated writes collapse into it
+        UniqueConstraint("match_id", "component", name="uq_match_rescores_match_component"),
+    )
+    
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid4,
+        index=True
+    )
+    match_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("matches.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
+    component = Column(
+        SQLEnum(RescoreComponent, name="rescore_component"),
+        nullable=False
+    )
+    # Bumped when the component changes again; the worker only clears the version it scored
+    version = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    
+    def __repr__(self) -> str:
+        return f"<MatchRescore(match_id={self.match_id}, component={self.component})>"
@@ -4,7 +4,7 @@ Payment models
 from uuid import uuid4
 from datetime import datetime
 from sqlalchemy import (
-    Column, String, Float, DateTime, ForeignKey,
+    Column, String, Float, Integer, DateTime, ForeignKey,
     Enum as SQLEnum, Text
 )
 from sqlalchemy.dialects.postgresql import UUID, JSON
@@ -96,3 +96,29 @@ class Payment(Base):
     
     def __repr__(self) -> str:
         return f"<Payment(id={self.id}, transaction_id={self.transaction_id}, status={self.status})>"
+
+
+class WebhookEvent(Base):
+    """Raw Razorpay webhook delivery awaiting (or done with) processing"""
+    
+    __tablename__ = "webhook_events"
+    
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid4,
+        index=True
+    )
+    # X-Razorpay-Event-Id; redeliveries of one event share it
+    event_id = Column(String(100), nullable=False, unique=True)
+    event = Column(String(100), nullable=True)
+    razorpay_order_id = Column(String(255), nullable=True, index=True)
+    payload = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    processed_at = Column(DateTime, nullable=True, index=True)
+    # Events for an order with no local transaction yet are retried with backoff
+    attempts = Column(Integer, default=0, nullable=False)
+    next_attempt_at = Column(DateTime, nullable=True, index=True)
+    
+    def __repr__(self) -> str:
+        return f"<WebhookEvent(id={self.id}, event_id={self.event_id}, event={self.event})>"
@@ -5,11 +5,11 @@ from uuid import uuid4
 from datetime import datetime
 from sqlalchemy import (
     Column, String, Integer, Float, DateTime, Text, Boolean,
-    ForeignKey, Enum as SQLEnum, ARRAY, Date
+    ForeignKey, Enum as SQLEnum, Date
 )
 from sqlalchemy.dialects.postgresql import UUID, JSON
 from sqlalchemy.orm import relationship
-from app.database import Base
+from app.database import Base, StringArray
 from app.utils.constants import (
     CapabilityType, ProjectType, BusinessEntityType, TeamSizeCategory,
     ProjectSizeCategory as ProjectSizeCategoryEnum, WalletSizeRange, PricingTierType, JVModelType,
@@ -43,7 +43,7 @@ class ProfessionalProfile(Base):
     rera_experience = Column(Boolean, default=False, nullable=False)
     wallet_size = Column(Float, nullable=True)  # In INR
     preferred_jv_model = Column(String(255), nullable=True)
-    location_preferences = Column(ARRAY(String), nullable=True)  # Array of cities/areas
+    location_preferences = Column(StringArray, nullable=True)  # Array of cities/areas
     workforce_capacity = Column(Integer, nullable=True)
     # New onboarding fields
     business_entity_type = Column(
@@ -61,6 +61,9 @@ class ProfessionalProfile(Base):
     )
     total_projects_completed = Column(Integer, nullable=True)
     credibility_score = Column(Float, nullable=True, default=0.0)
+    # Credibility components kept in step with license/portfolio writes
+    license_count = Column(Integer, default=0, nullable=False)
+    portfolio_count = Column(Integer, default=0, nullable=False)
     onboarding_status = Column(
         SQLEnum(OnboardingStatus, name="onboarding_status"),
         default=OnboardingStatus.IN_PROGRESS,
@@ -69,11 +72,13 @@ class ProfessionalProfile(Base):
     )
     onboarding_step = Column(Integer, nullable=True, default=1)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # Also bumped whenever candidate index inputs change (see candidate_index)
     updated_at = Column(
         DateTime,
         default=datetime.utcnow,
         onupdate=datetime.utcnow,
-        nullable=False
+        nullable=False,
+        index=True
     )
     
     # Relationships
@@ -182,7 +187,7 @@ class Portfolio(Base):
     area_sqft = Column(Float, nullable=True)
     completion_date = Column(Date, nullable=True)
     duration_months = Column(Integer, nullable=True)  # Duration in months
-    images = Column(ARRAY(String), nullable=True)  # Array of image URLs
+    images = Column(StringArray, nullable=True)  # Array of image URLs
     description = Column(Text, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     
@@ -247,6 +252,8 @@ class LocationPreference(Base):
     )
     location_name = Column(String(255), nullable=False)
     radius_km = Column(Float, nullable=True)
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
     capability_type = Column(
         SQLEnum(CapabilityType, name="location_capability_type"),
         nullable=True,
@@ -397,7 +404,7 @@ class JVJDPreferences(Base):
         nullable=False,
         index=True
     )
-    preferred_jv_models = Column(ARRAY(String), nullable=True)  # Array of JVModelType values
+    preferred_jv_models = Column(StringArray, nullable=True)  # Array of JVModelType values
     rera_registered_projects_count = Column(Integer, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     
@@ -5,7 +5,7 @@ from uuid import uuid4
 from datetime import datetime
 from sqlalchemy import (
     Column, String, Float, Integer, Boolean, DateTime,
-    ForeignKey, Enum as SQLEnum, Text
+    ForeignKey, Enum as SQLEnum, Text, Index, text
 )
 from sqlalchemy.dialects.postgresql import UUID, JSON
 from sqlalchemy.orm import relationship
@@ -17,6 +17,10 @@ class FARCalculation(Base):
     """FAR (Floor Area Ratio) calculation model"""
     
     __tablename__ = "far_calculations"
+    __table_args__ = (
+        # Latest calculation per property without scanning its history
+        Index("ix_far_calculations_property_latest", "property_id", text("created_at DESC"), text("id DESC")),
+    )
     
     id = Column(
         UUID(as_uuid=True),
@@ -47,6 +51,10 @@ class FeasibilityReport(Base):
     """Feasibility report model"""
     
     __tablename__ = "feasibility_reports"
+    __table_args__ = (
+        # Latest report per property without scanning its history
+        Index("ix_feasibility_reports_property_latest", "property_id", text("created_at DESC"), text("id DESC")),
+    )
     
     id = Column(
         UUID(as_uuid=True),
@@ -69,6 +77,8 @@ class FeasibilityReport(Base):
     total_built_up_area_sqft = Column(Float, nullable=True)
     saleable_area_sqft = Column(Float, nullable=True)
     number_of_units = Column(Integer, nullable=True)
+    # Digest of the plot geometry, FAR inputs and rules version the report was computed from
+    input_digest = Column(String(64), nullable=True)
     is_unlocked = Column(Boolean, default=False, nullable=False, index=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     
@@ -64,6 +64,8 @@ class PropertyResponse(BaseModel):
     ward: Optional[str]
     landmark: Optional[str]
     google_maps_pin: Optional[str]
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
     width_ft: Optional[float]
     length_ft: Optional[float]
     facing: Optional[str]
@@ -81,9 +83,10 @@ class PropertyResponse(BaseModel):
 
 
 class ProjectCreate(BaseModel):
-    property_id: UUID
-    project_type: ProjectType
-    intent: Optional[ProjectIntent] = None
+    # JSON carries UUIDs and enums as strings
+    property_id: UUID = Field(..., strict=False)
+    project_type: ProjectType = Field(..., strict=False)
+    intent: Optional[ProjectIntent] = Field(None, strict=False)
     timeline: Optional[str] = Field(None, max_length=100)
     scope: Optional[str] = None
     
@@ -104,6 +107,10 @@ class ProjectResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True, strict=True)
 
 
+class ProjectPublishResponse(ProjectResponse):
+    matching_job_id: UUID
+
+
 class JVPreferencesCreate(BaseModel):
     post_construction_expectation: Optional[JVPostConstructionExpectation] = None
     development_vision: Optional[str] = None
@@ -119,3 +126,60 @@ class JVPreferencesResponse(BaseModel):
     created_at: datetime
     
     model_config = ConfigDict(from_attributes=True, strict=True)
+
+
+class MatchCounts(BaseModel):
+    pending: int
+    accepted: int
+    rejected: int
+    total: int
+    
+    model_config = ConfigDict(strict=True)
+
+
+class FARSummary(BaseModel):
+    id: UUID
+    road_width_ft: float
+    zone_type: Optional[str]
+    calculated_far: float
+    total_buildable_area: float
+    created_at: datetime
+    
+    model_config = ConfigDict(from_attributes=True, strict=True)
+
+
+class FeasibilitySummary(BaseModel):
+    """Basic feasibility metrics (free before unlock)"""
+    id: UUID
+    plot_category: Optional[str]
+    allowed_floors: Optional[int]
+    number_of_units: Optional[int]
+    is_unlocked: bool
+    created_at: datetime
+    
+    model_config = ConfigDict(from_attributes=True, strict=True)
+
+
+class DashboardProject(BaseModel):
+    project: ProjectResponse
+    match_counts: MatchCounts
+    
+    model_config = ConfigDict(from_attributes=True, strict=True)
+
+
+class DashboardProperty(BaseModel):
+    property: PropertyResponse
+    projects: List[DashboardProject]
+    latest_far: Optional[FARSummary]
+    latest_feasibility: Optional[FeasibilitySummary]
+    
+    model_config = ConfigDict(from_attributes=True, strict=True)
+
+
+class LandownerDashboardResponse(BaseModel):
+    profile: LandownerProfileResponse
+    properties: List[DashboardProperty]
+    project_count: int
+    match_counts: MatchCounts
+    
+    model_config = ConfigDict(from_attributes=True, strict=True)
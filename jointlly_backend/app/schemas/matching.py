@@ -2,10 +2,10 @@
 Matching schemas
 """
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 from pydantic import BaseModel, ConfigDict
-from app.utils.constants import MatchStatus
+from app.utils.constants import MatchStatus, JobStatus
 
 
 class MatchScoreResponse(BaseModel):
@@ -34,3 +34,36 @@ class MatchResponse(BaseModel):
     match_score_details: Optional[MatchScoreResponse] = None
     
     model_config = ConfigDict(from_attributes=True, strict=True)
+
+
+class MatchPageResponse(BaseModel):
+    items: List[MatchResponse]
+    # Pass back as ?cursor= to fetch the next page; null on the last page
+    next_cursor: Optional[str] = None
+
+
+class MatchPreviewResponse(BaseModel):
+    professional_id: UUID
+    project_type_score: float
+    location_score: float
+    project_size_score: float
+    pricing_score: float
+    capability_score: float
+    verification_score: float
+    total_score: float
+
+
+class MatchingJobResponse(BaseModel):
+    id: UUID
+    project_id: UUID
+    status: JobStatus
+    attempts: int
+    max_attempts: int
+    run_after: datetime
+    last_error: Optional[str]
+    matches_created: Optional[int]
+    completed_at: Optional[datetime]
+    created_at: datetime
+    updated_at: datetime
+    
+    model_config = ConfigDict(from_attributes=True, strict=True)
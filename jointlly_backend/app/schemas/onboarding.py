@@ -16,6 +16,8 @@ class LocationPreferenceCreate(BaseModel):
     """Location preference with radius"""
     location_name: str = Field(..., min_length=1, max_length=255)
     radius_km: Optional[float] = Field(None, gt=0)
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
     capability_type: Optional[CapabilityType] = None
     
     model_config = ConfigDict(strict=True)
@@ -10,8 +10,9 @@ from app.utils.constants import TransactionType, TransactionStatus
 
 class CreateOrderRequest(BaseModel):
     amount: float = Field(..., gt=0)
-    transaction_type: TransactionType
-    project_id: Optional[UUID] = None
+    # JSON carries UUIDs and enums as strings
+    transaction_type: TransactionType = Field(..., strict=False)
+    project_id: Optional[UUID] = Field(None, strict=False)
     currency: str = Field(default="INR", max_length=10)
     
     model_config = ConfigDict(strict=True)
@@ -28,7 +29,7 @@ class CreateOrderResponse(BaseModel):
 
 
 class VerifyPaymentRequest(BaseModel):
-    transaction_id: UUID
+    transaction_id: UUID = Field(..., strict=False)
     razorpay_payment_id: str = Field(..., min_length=1)
     razorpay_signature: str = Field(..., min_length=1)
     
@@ -2,10 +2,14 @@
 Professional schemas
 """
 from datetime import datetime, date
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 from uuid import UUID
 from pydantic import BaseModel, Field, ConfigDict
-from app.utils.constants import CapabilityType, ProjectType
+from app.utils.constants import (
+    CapabilityType, ProjectType, BusinessEntityType, TeamSizeCategory, OnboardingStatus,
+    SubcontractorScopeType, ProjectSizeCategory, WalletSizeRange, ProjectIntent, PricingTierType,
+    ReconstructionWorkType
+)
 
 
 class ProfessionalProfileCreate(BaseModel):
@@ -126,3 +130,96 @@ class PricingTierResponse(BaseModel):
     created_at: datetime
     
     model_config = ConfigDict(from_attributes=True, strict=True)
+
+
+class LocationPreferenceResponse(BaseModel):
+    id: UUID
+    professional_id: UUID
+    location_name: str
+    radius_km: Optional[float]
+    latitude: Optional[float]
+    longitude: Optional[float]
+    capability_type: Optional[CapabilityType]
+    created_at: datetime
+    
+    model_config = ConfigDict(from_attributes=True, strict=True)
+
+
+class SubcontractorScopeResponse(BaseModel):
+    id: UUID
+    professional_id: UUID
+    scope_type: SubcontractorScopeType
+    description: Optional[str]
+    capability_type: Optional[CapabilityType]
+    created_at: datetime
+    
+    model_config = ConfigDict(from_attributes=True, strict=True)
+
+
+class ProjectSizeCategoryResponse(BaseModel):
+    id: UUID
+    professional_id: UUID
+    capability_type: CapabilityType
+    size_category: ProjectSizeCategory
+    custom_range: Optional[str]
+    wallet_size_range: Optional[WalletSizeRange]
+    created_at: datetime
+    
+    model_config = ConfigDict(from_attributes=True, strict=True)
+
+
+class ProfessionalPricingResponse(BaseModel):
+    id: UUID
+    professional_id: UUID
+    capability_type: CapabilityType
+    project_type: Optional[ProjectIntent]
+    pricing_tier: Optional[PricingTierType]
+    price_per_sqft: Optional[float]
+    custom_pricing: Optional[Dict[str, Any]]
+    created_at: datetime
+    
+    model_config = ConfigDict(from_attributes=True, strict=True)
+
+
+class JVJDPreferencesResponse(BaseModel):
+    id: UUID
+    professional_id: UUID
+    preferred_jv_models: Optional[List[str]]
+    rera_registered_projects_count: Optional[int]
+    created_at: datetime
+    
+    model_config = ConfigDict(from_attributes=True, strict=True)
+
+
+class ReconstructionWorkTypeResponse(BaseModel):
+    id: UUID
+    professional_id: UUID
+    work_type: ReconstructionWorkType
+    custom_description: Optional[str]
+    created_at: datetime
+    
+    model_config = ConfigDict(from_attributes=True, strict=True)
+
+
+class ProfessionalProfileFullResponse(ProfessionalProfileResponse):
+    """Profile with onboarding fields and every child collection"""
+    business_entity_type: Optional[BusinessEntityType]
+    office_address: Optional[str]
+    google_maps_location: Optional[str]
+    gst_number: Optional[str]
+    rera_project_count: Optional[int]
+    team_size_category: Optional[TeamSizeCategory]
+    total_projects_completed: Optional[int]
+    credibility_score: Optional[float]
+    onboarding_status: OnboardingStatus
+    onboarding_step: Optional[int]
+    capabilities: List[CapabilityResponse]
+    licenses: List[LicenseResponse]
+    portfolio: List[PortfolioResponse]
+    pricing_tiers: List[PricingTierResponse]
+    location_preferences_detail: List[LocationPreferenceResponse]
+    subcontractor_scopes: List[SubcontractorScopeResponse]
+    project_size_categories: List[ProjectSizeCategoryResponse]
+    professional_pricing: List[ProfessionalPricingResponse]
+    jv_jd_preferences: Optional[JVJDPreferencesResponse]
+    reconstruction_work_types: List[ReconstructionWorkTypeResponse]
@@ -2,7 +2,7 @@
 Verification schemas
 """
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 from pydantic import BaseModel, Field, ConfigDict
 from app.utils.constants import VerificationStatus
@@ -45,12 +45,70 @@ class FeasibilityReportResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True, strict=True)
 
 
+class PlotInput(BaseModel):
+    """A plot to evaluate; dimensions left out are read from property_id"""
+    property_id: Optional[UUID] = Field(None, strict=False)
+    reference: Optional[str] = Field(None, max_length=255)
+    width_ft: Optional[float] = Field(None, gt=0)
+    length_ft: Optional[float] = Field(None, gt=0)
+    road_width_ft: Optional[float] = Field(None, gt=0)
+    zone_type: Optional[str] = Field(None, max_length=100)
+    
+    model_config = ConfigDict(strict=True)
+
+
+class FeasibilityBatchRequest(BaseModel):
+    plots: List[PlotInput] = Field(..., min_length=1, max_length=5000)
+    # Store FAR calculations and feasibility reports for plots with a property_id
+    persist: bool = False
+    
+    model_config = ConfigDict(strict=True)
+
+
+class PlotFeasibilityResult(BaseModel):
+    reference: Optional[str]
+    property_id: Optional[UUID]
+    width_ft: float
+    length_ft: float
+    road_width_ft: float
+    zone_type: str
+    plot_area_sqft: float
+    calculated_far: float
+    max_far: float
+    premium_far_available: bool
+    total_buildable_area_sqft: float
+    plot_category: str
+    front_setback_m: float
+    rear_setback_m: float
+    side_setback_m: float
+    net_buildable_area_sqft: float
+    allowed_floors: int
+    number_of_units: int
+    saleable_area_sqft: float
+    
+    model_config = ConfigDict(strict=True)
+
+
+class FeasibilityBatchResponse(BaseModel):
+    results: List[PlotFeasibilityResult]
+    persisted: int
+    
+    model_config = ConfigDict(strict=True)
+
+
 class PIDVerificationRequest(BaseModel):
     pid_number: str = Field(..., min_length=1, max_length=100)
     
     model_config = ConfigDict(strict=True)
 
 
+class PIDVerificationStatusUpdate(BaseModel):
+    # JSON carries enums as strings
+    verification_status: VerificationStatus = Field(..., strict=False)
+    
+    model_config = ConfigDict(strict=True)
+
+
 class PIDVerificationResponse(BaseModel):
     id: UUID
     property_id: UUID
@@ -6,7 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.models.user import User
 from app.utils.constants import Role
-from app.utils.password import verify_password, get_password_hash
+from app.utils.password import verify_password_async, get_password_hash_async
 from app.utils.jwt import create_access_token, create_refresh_token
 from app.exceptions import UnauthorizedError, ConflictError, NotFoundError
 from datetime import timedelta
@@ -34,7 +34,7 @@ class AuthService:
             raise ConflictError(f"User with email {email} already exists")
         
         # Create new user
-        hashed_password = get_password_hash(password)
+        hashed_password = await get_password_hash_async(password)
         user = User(
             email=email,
             name=name,
@@ -43,8 +43,7 @@ class AuthService:
         )
         
         db.add(user)
-        await db.commit()
-        await db.refresh(user)
+        await db.flush()
         
         return user
     
@@ -63,7 +62,7 @@ class AuthService:
         if not user:
             raise UnauthorizedError("Invalid email or password")
         
-        if not verify_password(password, user.hashed_password):
+        if not await verify_password_async(password, user.hashed_password):
             raise UnauthorizedError("Invalid email or password")
         
         if user.is_active != "true":
@@ -0,0 +1,332 @@
+"""
+Process-local professional candidate index
+
+Keeps one compact record per professional (capabilities, pricing tier area
+intervals, location preferences, service areas) and maps each capability_type
+to the professionals offering it, so matching does not re-run the
+ProfessionalProfile/Capability join on every publish.
+Geolocated service areas are also registered in every geohash cell their
+radius overlaps, so a plot's cell yields the only geolocated professionals
+that can possibly reach it.
+
+ProfessionalService marks professionals dirty on every write, effective when
+the request's transaction commits; dirty records are reloaded in one batch on
+the next lookup. The same transaction bumps the professional's updated_at, and
+lookups re-check professionals updated within
+candidate_index_change_window_seconds at most every
+candidate_index_poll_seconds, so writes made by other processes (API servers,
+the standalone worker) are picked up within that interval rather than at the
+periodic full rebuild.
+"""
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import event, select, update
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.professional import (
+    ProfessionalProfile,
+    Capability,
+    PricingTier,
+    LocationPreference
+)
+from app.utils.constants import CapabilityType
+from app.utils.geo import geohash_encode, geohash_cells_covering
+
+
+@dataclass(frozen=True)
+class TierInterval:
+    """Pricing tier reduced to its matching-relevant fields"""
+    capability_type: CapabilityType
+    min_area_sqft: Optional[float]
+    max_area_sqft: Optional[float]
+    price_per_sqft: float
+
+
+@dataclass(frozen=True)
+class ServiceArea:
+    """Geolocated location preference; capability None applies to all"""
+    latitude: float
+    longitude: float
+    radius_km: Optional[float]
+    capability_type: Optional[CapabilityType]
+
+    @property
+    def effective_radius_km(self) -> float:
+        return self.radius_km or settings.default_service_radius_km
+
+
+@dataclass(frozen=True)
+class CandidateRecord:
+    """Everything matching needs to know about one professional"""
+    professional_id: UUID
+    capability_types: FrozenSet[CapabilityType]
+    location_preferences: Tuple[str, ...]
+    tiers: Tuple[TierInterval, ...]
+    service_areas: Tuple[ServiceArea, ...] = ()
+
+    def has_service_area_for(self, capability_type: Optional[CapabilityType]) -> bool:
+        """Whether geolocated service areas constrain this capability"""
+        return any(
+            area.capability_type in (None, capability_type)
+            for area in self.service_areas
+        )
+
+
+class CandidateIndex:
+    """In-memory capability -> candidate lookup"""
+
+    def __init__(self, ttl_seconds: Optional[float] = None):
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.candidate_index_ttl_seconds
+        self._records: Dict[UUID, CandidateRecord] = {}
+        self._by_capability: Dict[CapabilityType, Set[UUID]] = {}
+        self._by_cell: Dict[str, Set[UUID]] = {}
+        self._dirty: Set[UUID] = set()
+        # updated_at of professionals inside the change window, as last seen
+        self._seen_versions: Dict[UUID, datetime] = {}
+        self._polled_at: Optional[float] = None
+        self._built_at: Optional[float] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    # ---------- invalidation (called from write paths) ----------
+
+    def mark_dirty(self, professional_id: UUID) -> None:
+        """Reload this professional on the next lookup"""
+        self._dirty.add(professional_id)
+
+    def mark_dirty_on_commit(self, db: AsyncSession, professional_id: UUID) -> None:
+        """Reload this professional once db's transaction commits"""
+        db.sync_session.info.setdefault(_PENDING_KEY, set()).add(professional_id)
+
+    def invalidate(self) -> None:
+        """Force a full rebuild on the next lookup"""
+        self._built_at = None
+
+    # ---------- lookups ----------
+
+    async def candidates(
+        self,
+        db: AsyncSession,
+        capability_type: Optional[CapabilityType] = None,
+        plot_coordinates: Optional[Tuple[float, float]] = None
+    ) -> List[CandidateRecord]:
+        """
+        Professionals with a capability
+        A None capability returns every indexed professional. With plot
+        coordinates, professionals whose geolocated service areas have no
+        grid cell in common with the plot are dropped; distances are checked
+        exactly by the scoring kernel.
+        """
+        await self.ensure_fresh(db)
+
+        if capability_type is None:
+            records = list(self._records.values())
+        else:
+            ids = self._by_capability.get(capability_type, set())
+            records = [self._records[professional_id] for professional_id in ids]
+
+        if plot_coordinates is None:
+            return records
+
+        in_cell = self._by_cell.get(geohash_encode(*plot_coordinates), set())
+        return [
+            record for record in records
+            if record.professional_id in in_cell or not record.has_service_area_for(capability_type)
+        ]
+
+    # ---------- maintenance ----------
+
+    async def ensure_fresh(self, db: AsyncSession) -> None:
+        """
+        Rebuild when expired, otherwise reload only dirty or recently changed professionals
+        Between polls of the change window a lookup with nothing dirty issues no statements.
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            now = time.monotonic()
+            expired = self._built_at is None or now - self._built_at > self.ttl_seconds
+            poll = (
+                expired or
+                self._polled_at is None or
+                now - self._polled_at >= settings.candidate_index_poll_seconds
+            )
+            changed = await self._changed_professionals(db) if poll else set()
+            if expired:
+                await self._rebuild(db)
+            elif self._dirty or changed:
+                await self._reload(db, self._dirty | changed)
+
+    async def _changed_professionals(self, db: AsyncSession) -> Set[UUID]:
+        """
+        Professionals whose updated_at moved since the last check
+        The window is re-read on every check because a write stamped before
+        the previous check may only have committed after it.
+        """
+        since = datetime.utcnow() - timedelta(seconds=settings.candidate_index_change_window_seconds)
+        result = await db.execute(
+            select(ProfessionalProfile.id, ProfessionalProfile.updated_at)
+            .where(ProfessionalProfile.updated_at >= since)
+        )
+        versions = dict(result.all())
+        changed = {
+            professional_id for professional_id, updated_at in versions.items()
+            if self._seen_versions.get(professional_id) != updated_at
+        }
+        self._seen_versions = versions
+        self._polled_at = time.monotonic()
+        return changed
+
+    async def _rebuild(self, db: AsyncSession) -> None:
+        self._dirty.clear()
+        records = await self._load_records(db, None)
+        self._records = {}
+        self._by_capability = {}
+        self._by_cell = {}
+        for record in records:
+            self._insert(record)
+        self._built_at = time.monotonic()
+
+    async def _reload(self, db: AsyncSession, professional_ids: Set[UUID]) -> None:
+        self._dirty -= professional_ids
+        for professional_id in professional_ids:
+            self._remove(professional_id)
+        for record in await self._load_records(db, professional_ids):
+            self._insert(record)
+
+    def _insert(self, record: CandidateRecord) -> None:
+        self._records[record.professional_id] = record
+        for capability_type in record.capability_types:
+            self._by_capability.setdefault(capability_type, set()).add(record.professional_id)
+        for cell in self._cells(record):
+            self._by_cell.setdefault(cell, set()).add(record.professional_id)
+
+    def _remove(self, professional_id: UUID) -> None:
+        record = self._records.pop(professional_id, None)
+        if not record:
+            return
+        for capability_type in record.capability_types:
+            self._by_capability.get(capability_type, set()).discard(professional_id)
+        for cell in self._cells(record):
+            self._by_cell.get(cell, set()).discard(professional_id)
+
+    @staticmethod
+    def _cells(record: CandidateRecord) -> Set[str]:
+        """Grid cells overlapped by any of the record's service areas"""
+        cells: Set[str] = set()
+        for area in record.service_areas:
+            cells.update(geohash_cells_covering(
+                area.latitude, area.longitude, area.effective_radius_km
+            ))
+        return cells
+
+    @staticmethod
+    async def _load_records(
+        db: AsyncSession,
+        professional_ids: Optional[Iterable[UUID]]
+    ) -> List[CandidateRecord]:
+        """Load records for the given professionals (all when None) in four queries"""
+        def scoped(query, column):
+            if professional_ids is None:
+                return query
+            return query.where(column.in_(list(professional_ids)))
+
+        profiles_result = await db.execute(scoped(
+            select(
+                ProfessionalProfile.id,
+                ProfessionalProfile.location_preferences
+            ),
+            ProfessionalProfile.id
+        ))
+        profiles = profiles_result.all()
+        if not profiles:
+            return []
+
+        capabilities: Dict[UUID, Set[CapabilityType]] = {}
+        capabilities_result = await db.execute(scoped(
+            select(Capability.professional_id, Capability.capability_type),
+            Capability.professional_id
+        ))
+        for professional_id, capability_type in capabilities_result.all():
+            capabilities.setdefault(professional_id, set()).add(capability_type)
+
+        tiers: Dict[UUID, List[TierInterval]] = {}
+        tiers_result = await db.execute(scoped(
+            select(
+                PricingTier.professional_id,
+                PricingTier.capability_type,
+                PricingTier.min_area_sqft,
+                PricingTier.max_area_sqft,
+                PricingTier.price_per_sqft
+            ).order_by(PricingTier.created_at),
+            PricingTier.professional_id
+        ))
+        for professional_id, capability_type, min_area, max_area, price in tiers_result.all():
+            tiers.setdefault(professional_id, []).append(
+                TierInterval(capability_type, min_area, max_area, price)
+            )
+
+        service_areas: Dict[UUID, List[ServiceArea]] = {}
+        locations_result = await db.execute(scoped(
+            select(
+                LocationPreference.professional_id,
+                LocationPreference.latitude,
+                LocationPreference.longitude,
+                LocationPreference.radius_km,
+                LocationPreference.capability_type
+            ).where(
+                LocationPreference.latitude.is_not(None),
+                LocationPreference.longitude.is_not(None)
+            ),
+            LocationPreference.professional_id
+        ))
+        for professional_id, latitude, longitude, radius_km, capability_type in locations_result.all():
+            service_areas.setdefault(professional_id, []).append(
+                ServiceArea(latitude, longitude, radius_km, capability_type)
+            )
+
+        return [
+            CandidateRecord(
+                professional_id=professional_id,
+                capability_types=frozenset(capabilities.get(professional_id, ())),
+                location_preferences=tuple(location_preferences or ()),
+                tiers=tuple(tiers.get(professional_id, ())),
+                service_areas=tuple(service_areas.get(professional_id, ()))
+            )
+            for professional_id, location_preferences in profiles
+        ]
+
+
+# Shared by every request handled in this process
+candidate_index = CandidateIndex()
+
+_PENDING_KEY = "candidate_index_dirty"
+
+
+@event.listens_for(Session, "before_commit")
+def _stamp_changed_professionals(session: Session) -> None:
+    # Other processes' indexes find these through updated_at
+    professional_ids = session.info.get(_PENDING_KEY)
+    if professional_ids:
+        session.execute(
+            update(ProfessionalProfile)
+            .where(ProfessionalProfile.id.in_(list(professional_ids)))
+            .values(updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+
+
+@event.listens_for(Session, "after_commit")
+def _mark_committed_dirty(session: Session) -> None:
+    for professional_id in session.info.pop(_PENDING_KEY, ()):
+        candidate_index.mark_dirty(professional_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
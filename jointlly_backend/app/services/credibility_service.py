@@ -1,13 +1,23 @@
 """
 Credibility scoring service for professionals
 """
-from typing import Dict
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import case, select, func, update
+from sqlalchemy.orm.attributes import set_committed_value
+from app.config import settings
+from app.database import AsyncSessionLocal
 from app.models.professional import ProfessionalProfile, License, Portfolio
 from app.models.verification import PIDVerification
+from app.services.profile_cache import profile_cache
 from app.utils.constants import VerificationStatus
 
+logger = logging.getLogger(__name__)
+
 
 class CredibilityService:
     """Service for calculating professional credibility scores"""
@@ -24,66 +34,52 @@ class CredibilityService:
     }
     
     @staticmethod
-    async def calculate_credibility_score(
-        db: AsyncSession,
-        professional_id: str
+    def score(
+        company_name: Optional[str],
+        rera_experience: Optional[bool],
+        experience_years: Optional[int],
+        total_projects_completed: Optional[int],
+        office_address: Optional[str],
+        license_count: int,
+        portfolio_count: int
     ) -> float:
         """
-        Calculate credibility score for a professional
+        Weighted credibility score from profile fields and license/portfolio counts
         Returns score between 0.0 and 1.0
         """
-        # Get professional profile
-        result = await db.execute(
-            select(ProfessionalProfile).where(ProfessionalProfile.id == professional_id)
-        )
-        profile = result.scalar_one_or_none()
-        
-        if not profile:
-            return 0.0
-        
         scores = {}
         
         # 1. Company verification (20%)
         # Placeholder: Assume verified if company name exists
-        scores["company_verification"] = 1.0 if profile.company_name else 0.0
+        scores["company_verification"] = 1.0 if company_name else 0.0
         
         # 2. License presence (15%)
-        license_count = await db.execute(
-            select(func.count(License.id))
-            .where(License.professional_id == professional_id)
-        )
-        license_count_val = license_count.scalar() or 0
-        scores["license_presence"] = min(1.0, license_count_val / 2.0)  # Max score with 2+ licenses
+        scores["license_presence"] = min(1.0, (license_count or 0) / 2.0)  # Max score with 2+ licenses
         
         # 3. RERA registration (10%)
-        scores["rera_registration"] = 1.0 if profile.rera_experience else 0.0
+        scores["rera_registration"] = 1.0 if rera_experience else 0.0
         
         # 4. Portfolio completeness (20%)
-        portfolio_count = await db.execute(
-            select(func.count(Portfolio.id))
-            .where(Portfolio.professional_id == professional_id)
-        )
-        portfolio_count_val = portfolio_count.scalar() or 0
         # Max score with 3+ portfolio items
-        scores["portfolio_completeness"] = min(1.0, portfolio_count_val / 3.0)
+        scores["portfolio_completeness"] = min(1.0, (portfolio_count or 0) / 3.0)
         
         # 5. Experience years (15%)
-        if profile.experience_years:
+        if experience_years:
             # Max score at 10+ years
-            scores["experience_years"] = min(1.0, profile.experience_years / 10.0)
+            scores["experience_years"] = min(1.0, experience_years / 10.0)
         else:
             scores["experience_years"] = 0.0
         
         # 6. Project count (10%)
-        if profile.total_projects_completed:
+        if total_projects_completed:
             # Max score at 20+ projects
-            scores["project_count"] = min(1.0, profile.total_projects_completed / 20.0)
+            scores["project_count"] = min(1.0, total_projects_completed / 20.0)
         else:
             scores["project_count"] = 0.0
         
         # 7. Address verification (10%)
         # Placeholder: Assume verified if address exists
-        scores["address_verification"] = 1.0 if profile.office_address else 0.0
+        scores["address_verification"] = 1.0 if office_address else 0.0
         
         # Calculate weighted total
         total_score = sum(
@@ -93,25 +89,224 @@ class CredibilityService:
         
         return round(total_score, 4)  # Round to 4 decimal places
     
+    @staticmethod
+    def apply(profile: ProfessionalProfile) -> float:
+        """
+        Refresh the cached score from the profile's fields and counters
+        Runs no queries; call after any change to a scored profile field.
+        """
+        profile.credibility_score = CredibilityService.score(
+            profile.company_name,
+            profile.rera_experience,
+            profile.experience_years,
+            profile.total_projects_completed,
+            profile.office_address,
+            profile.license_count or 0,
+            profile.portfolio_count or 0
+        )
+        return profile.credibility_score
+    
+    @staticmethod
+    async def apply_count_changes(
+        db: AsyncSession,
+        profile: ProfessionalProfile,
+        license_delta: int = 0,
+        portfolio_delta: int = 0
+    ) -> float:
+        """
+        Add license/portfolio count deltas in SQL and refresh the cached score
+        The counters are incremented by one UPDATE on the stored row, so
+        concurrent writers cannot overwrite each other's counts; the score is
+        computed from the values the database returns.
+        """
+        if license_delta or portfolio_delta:
+            counters = {
+                name: case((column + delta < 0, 0), else_=column + delta)
+                for name, column, delta in (
+                    ("license_count", ProfessionalProfile.license_count, license_delta),
+                    ("portfolio_count", ProfessionalProfile.portfolio_count, portfolio_delta)
+                )
+                if delta
+            }
+            statement = (
+                update(ProfessionalProfile)
+                .where(ProfessionalProfile.id == profile.id)
+                .values(**counters)
+                .execution_options(synchronize_session=False)
+            )
+            columns = (ProfessionalProfile.license_count, ProfessionalProfile.portfolio_count)
+            if db.bind.dialect.update_returning:
+                row = (await db.execute(statement.returning(*columns))).one()
+            else:
+                await db.execute(statement)
+                row = (await db.execute(select(*columns).where(ProfessionalProfile.id == profile.id))).one()
+            # Loaded, not changed: the flush must not write stale counters back
+            set_committed_value(profile, "license_count", row.license_count)
+            set_committed_value(profile, "portfolio_count", row.portfolio_count)
+        return CredibilityService.apply(profile)
+    
+    @staticmethod
+    async def calculate_credibility_score(
+        db: AsyncSession,
+        professional_id: UUID
+    ) -> float:
+        """
+        Calculate credibility score for a professional from its cached counters
+        Returns score between 0.0 and 1.0
+        """
+        profile = await db.get(ProfessionalProfile, professional_id)
+        
+        if not profile:
+            return 0.0
+        
+        return CredibilityService.score(
+            profile.company_name,
+            profile.rera_experience,
+            profile.experience_years,
+            profile.total_projects_completed,
+            profile.office_address,
+            profile.license_count or 0,
+            profile.portfolio_count or 0
+        )
+    
     @staticmethod
     async def update_credibility_score(
         db: AsyncSession,
-        professional_id: str
+        professional_id: UUID
     ) -> float:
         """
         Calculate and update credibility score in profile
         """
-        score = await CredibilityService.calculate_credibility_score(db, professional_id)
+        profile = await db.get(ProfessionalProfile, professional_id)
+        
+        if not profile:
+            return 0.0
         
-        # Update profile
+        score = CredibilityService.apply(profile)
+        await db.flush()
+        
+        return score
+    
+    # ---------- batch recompute ----------
+    
+    @staticmethod
+    async def recompute_page(
+        db: AsyncSession,
+        after_id: Optional[UUID],
+        batch_size: int
+    ) -> Tuple[Optional[UUID], int, int]:
+        """
+        Recompute one keyset page of professionals
+        One query for the profiles, one grouped COUNT each over licenses and
+        portfolios, and one bulk UPDATE of the scores and cached counters
+        that drifted.
+        Returns (last id, professionals read, scores changed).
+        """
+        query = select(
+            ProfessionalProfile.id,
+            ProfessionalProfile.company_name,
+            ProfessionalProfile.rera_experience,
+            ProfessionalProfile.experience_years,
+            ProfessionalProfile.total_projects_completed,
+            ProfessionalProfile.office_address,
+            ProfessionalProfile.credibility_score,
+            ProfessionalProfile.license_count,
+            ProfessionalProfile.portfolio_count
+        ).order_by(ProfessionalProfile.id).limit(batch_size)
+        if after_id is not None:
+            query = query.where(ProfessionalProfile.id > after_id)
+        profiles = (await db.execute(query)).all()
+        if not profiles:
+            return None, 0, 0
+        
+        ids = [profile.id for profile in profiles]
+        license_counts = await CredibilityService._count_by_professional(db, License, ids)
+        portfolio_counts = await CredibilityService._count_by_professional(db, Portfolio, ids)
+        
+        changes = []
+        for profile in profiles:
+            license_count = license_counts.get(profile.id, 0)
+            portfolio_count = portfolio_counts.get(profile.id, 0)
+            score = CredibilityService.score(
+                profile.company_name,
+                profile.rera_experience,
+                profile.experience_years,
+                profile.total_projects_completed,
+                profile.office_address,
+                license_count,
+                portfolio_count
+            )
+            if (
+                score != profile.credibility_score
+                or license_count != profile.license_count
+                or portfolio_count != profile.portfolio_count
+            ):
+                changes.append({
+                    "id": profile.id,
+                    "credibility_score": score,
+                    "license_count": license_count,
+                    "portfolio_count": portfolio_count
+                })
+        
+        if changes:
+            # ORM bulk UPDATE by primary key (executemany)
+            await db.execute(update(ProfessionalProfile), changes)
+            for change in changes:
+                profile_cache.invalidate_on_commit(db, change["id"])
+        return ids[-1], len(profiles), len(changes)
+    
+    @staticmethod
+    async def _count_by_professional(db: AsyncSession, model, professional_ids: List[UUID]) -> Dict[UUID, int]:
         result = await db.execute(
-            select(ProfessionalProfile).where(ProfessionalProfile.id == professional_id)
+            select(model.professional_id, func.count(model.id))
+            .where(model.professional_id.in_(professional_ids))
+            .group_by(model.professional_id)
         )
-        profile = result.scalar_one_or_none()
+        return {professional_id: count for professional_id, count in result.all()}
+    
+    @staticmethod
+    async def recompute_all(batch_size: Optional[int] = None) -> int:
+        """
+        Recompute every professional's score, committing page by page
+        Returns the number of scores that changed
+        """
+        batch_size = batch_size or settings.credibility_batch_size
+        async with AsyncSessionLocal() as db:
+            total = (await db.execute(select(func.count(ProfessionalProfile.id)))).scalar() or 0
         
-        if profile:
-            profile.credibility_score = score
-            await db.commit()
-            await db.refresh(profile)
+        started = time.monotonic()
+        after_id, done, changed = None, 0, 0
+        while True:
+            async with AsyncSessionLocal() as db:
+                after_id, read, page_changed = await CredibilityService.recompute_page(db, after_id, batch_size)
+                await db.commit()
+            if not read:
+                break
+            done += read
+            changed += page_changed
+            logger.info(
+                "Credibility recompute: %d/%d professionals, %d scores changed (%.1fs)",
+                done, total, changed, time.monotonic() - started
+            )
         
-        return score
+        return changed
+    
+    @staticmethod
+    async def run_worker(
+        stop_event: asyncio.Event,
+        interval_seconds: Optional[float] = None
+    ) -> None:
+        """Recompute all scores every interval_seconds until stop_event is set"""
+        interval_seconds = interval_seconds or settings.credibility_recompute_interval_seconds
+        logger.info("Credibility recompute scheduled every %.0fs", interval_seconds)
+        
+        while not stop_event.is_set():
+            try:
+                await CredibilityService.recompute_all()
+            except Exception:
+                logger.exception("Credibility recompute failed")
+            
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=interval_seconds)
+            except asyncio.TimeoutError:
+                pass
@@ -1,9 +1,10 @@
 """
 FAR (Floor Area Ratio) calculation service
 """
-from typing import Optional
+from typing import Dict, List, Optional
+from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func
 from app.models.verification import FARCalculation
 from app.models.landowner import Property
 from app.utils.constants import BENGALURU_FAR_MIN, BENGALURU_FAR_MAX
@@ -12,6 +13,17 @@ from app.utils.constants import BENGALURU_FAR_MIN, BENGALURU_FAR_MAX
 class FARService:
     """Service for FAR calculations"""
     
+    # Bump whenever the bands below change; stored feasibility reports are keyed on it
+    RULES_VERSION = "blr-far-1"
+    
+    # Bengaluru FAR by road width: (upper bound in ft, exclusive, base FAR, max FAR)
+    ROAD_WIDTH_FAR_BANDS = (
+        (30.0, 1.5, 2.0),
+        (40.0, 2.0, 2.5),
+        (60.0, 2.5, 3.0),
+        (float("inf"), 3.0, 3.25),
+    )
+    
     @staticmethod
     def calculate_far(
         plot_area_sqft: float,
@@ -36,18 +48,11 @@ class FARService:
             pass
         
         # Determine FAR based on road width
-        if road_width_ft < 30:
-            base_far = 1.5
-            max_far = 2.0
-        elif road_width_ft < 40:
-            base_far = 2.0
-            max_far = 2.5
-        elif road_width_ft < 60:
-            base_far = 2.5
-            max_far = 3.0
-        else:
-            base_far = 3.0
-            max_far = 3.25
+        base_far, max_far = next(
+            (base, maximum)
+            for upper, base, maximum in FARService.ROAD_WIDTH_FAR_BANDS
+            if road_width_ft < upper
+        )
         
         # Use base FAR for calculation (can be upgraded with premium payment)
         calculated_far = base_far
@@ -70,7 +75,7 @@ class FARService:
     @staticmethod
     async def create_far_calculation(
         db: AsyncSession,
-        property_id: str,
+        property_id: UUID,
         road_width_ft: float,
         zone_type: Optional[str] = None
     ) -> FARCalculation:
@@ -105,15 +110,14 @@ class FARService:
         )
         
         db.add(far_calculation)
-        await db.commit()
-        await db.refresh(far_calculation)
+        await db.flush()
         
         return far_calculation
     
     @staticmethod
     async def get_far_calculation(
         db: AsyncSession,
-        property_id: str
+        property_id: UUID
     ) -> Optional[FARCalculation]:
         """
         Get latest FAR calculation for a property
@@ -121,6 +125,32 @@ class FARService:
         result = await db.execute(
             select(FARCalculation)
             .where(FARCalculation.property_id == property_id)
-            .order_by(FARCalculation.created_at.desc())
+            .order_by(FARCalculation.created_at.desc(), FARCalculation.id.desc())
+            .limit(1)
         )
         return result.scalar_one_or_none()
+    
+    @staticmethod
+    async def get_latest_far_calculations(
+        db: AsyncSession,
+        property_ids: List[UUID]
+    ) -> Dict[UUID, FARCalculation]:
+        """
+        Latest FAR calculation of each property, in one query
+        Properties without a calculation are left out.
+        """
+        if not property_ids:
+            return {}
+        ranked = select(
+            FARCalculation.id,
+            func.row_number().over(
+                partition_by=FARCalculation.property_id,
+                order_by=(FARCalculation.created_at.desc(), FARCalculation.id.desc())
+            ).label("position")
+        ).where(FARCalculation.property_id.in_(property_ids)).subquery()
+        result = await db.execute(
+            select(FARCalculation)
+            .join(ranked, FARCalculation.id == ranked.c.id)
+            .where(ranked.c.position == 1)
+        )
+        return {far_calculation.property_id: far_calculation for far_calculation in result.scalars().all()}
@@ -0,0 +1,177 @@
+"""
+Batch FAR and feasibility evaluation
+
+Evaluates thousands of plots in one pass with the vectorized kernel and,
+optionally, stores the FAR calculations and feasibility reports of the
+plots that reference a property with two multi-row INSERTs. Plots whose
+latest report was computed from the same inputs are not stored again.
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID, uuid4
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import insert, select
+from app.exceptions import NotFoundError, ValidationError
+from app.models.landowner import Property
+from app.models.verification import FARCalculation, FeasibilityReport
+from app.services.feasibility_kernel import compute_feasibility
+from app.services.feasibility_service import FeasibilityService
+
+DEFAULT_ZONE_TYPE = "Residential"
+DIMENSIONS = ("width_ft", "length_ft", "road_width_ft")
+
+
+class FeasibilityBatchService:
+    """Service for evaluating many plots at once"""
+
+    @staticmethod
+    async def resolve_plots(
+        db: AsyncSession,
+        plots: List[Dict[str, Any]],
+        landowner_id: Optional[UUID] = None,
+        match_property: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Fill dimensions a plot leaves out from its property, in one query
+        With landowner_id, every referenced property must belong to that landowner.
+        With match_property, a plot may not override dimensions its property has.
+        """
+        property_ids = {plot["property_id"] for plot in plots if plot.get("property_id")}
+        properties: Dict[UUID, Any] = {}
+        if property_ids:
+            query = select(
+                Property.id, Property.width_ft, Property.length_ft, Property.road_width_ft
+            ).where(Property.id.in_(list(property_ids)))
+            if landowner_id is not None:
+                query = query.where(Property.landowner_id == landowner_id)
+            properties = {row.id: row for row in (await db.execute(query)).all()}
+            missing = property_ids - properties.keys()
+            if missing:
+                raise NotFoundError("Property", ", ".join(sorted(str(property_id) for property_id in missing)))
+
+        resolved = []
+        for index, plot in enumerate(plots):
+            plot = dict(plot)
+            source = properties.get(plot.get("property_id"))
+            for name in DIMENSIONS:
+                if plot.get(name) is None and source is not None:
+                    plot[name] = getattr(source, name)
+                elif (
+                    match_property and source is not None
+                    and getattr(source, name) is not None and plot[name] != getattr(source, name)
+                ):
+                    raise ValidationError(
+                        f"Plot {plot.get('reference') or index}: {name} differs from the property; "
+                        "only the property's own dimensions can be stored"
+                    )
+                if not plot.get(name) or plot[name] <= 0:
+                    raise ValidationError(f"Plot {plot.get('reference') or index}: {name} is required")
+            plot["zone_type"] = plot.get("zone_type") or DEFAULT_ZONE_TYPE
+            resolved.append(plot)
+        return resolved
+
+    @staticmethod
+    def compute(plots: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Evaluate resolved plots; one result dict per plot, in order"""
+        if not plots:
+            return []
+        columns = compute_feasibility(*(
+            np.fromiter((plot[name] for plot in plots), dtype=np.float64, count=len(plots))
+            for name in DIMENSIONS
+        ))
+        # Plain Python values for the response models and the database drivers
+        values = {name: column.tolist() for name, column in columns.items()}
+        return [
+            {
+                "reference": plot.get("reference"),
+                "property_id": plot.get("property_id"),
+                "width_ft": plot["width_ft"],
+                "length_ft": plot["length_ft"],
+                "road_width_ft": plot["road_width_ft"],
+                "zone_type": plot["zone_type"],
+                **{name: column[row] for name, column in values.items()}
+            }
+            for row, plot in enumerate(plots)
+        ]
+
+    @staticmethod
+    async def persist(db: AsyncSession, results: List[Dict[str, Any]]) -> int:
+        """
+        Store a FAR calculation and a feasibility report for every result
+        with a property_id; returns the number of plots stored
+
+        A property listed twice is stored once, from its last plot. Plots
+        whose latest report has the same input digest are skipped, and a
+        replaced report keeps its unlocked state.
+        """
+        latest_rows = {result["property_id"]: result for result in results if result.get("property_id")}
+        if not latest_rows:
+            return 0
+
+        digests = {
+            property_id: FeasibilityService.input_digest(
+                row["width_ft"],
+                row["length_ft"],
+                row["road_width_ft"],
+                row["zone_type"],
+                row["total_buildable_area_sqft"]
+            )
+            for property_id, row in latest_rows.items()
+        }
+        reports = await FeasibilityService.get_latest_feasibility_reports(db, list(latest_rows))
+        rows = [
+            row for property_id, row in latest_rows.items()
+            if property_id not in reports or reports[property_id].input_digest != digests[property_id]
+        ]
+        if not rows:
+            return 0
+
+        now = datetime.utcnow()
+        await db.execute(insert(FARCalculation), [
+            {
+                "id": uuid4(),
+                "property_id": row["property_id"],
+                "road_width_ft": row["road_width_ft"],
+                "zone_type": row["zone_type"],
+                "calculated_far": row["calculated_far"],
+                "total_buildable_area": row["total_buildable_area_sqft"],
+                "created_at": now
+            }
+            for row in rows
+        ])
+        await db.execute(insert(FeasibilityReport), [
+            {
+                "id": uuid4(),
+                "property_id": row["property_id"],
+                "plot_category": row["plot_category"],
+                "front_setback_m": row["front_setback_m"],
+                "rear_setback_m": row["rear_setback_m"],
+                "side_setback_m": row["side_setback_m"],
+                "net_buildable_area_sqft": row["net_buildable_area_sqft"],
+                "allowed_floors": row["allowed_floors"],
+                "total_built_up_area_sqft": row["total_buildable_area_sqft"],
+                "saleable_area_sqft": row["saleable_area_sqft"],
+                "number_of_units": row["number_of_units"],
+                "input_digest": digests[row["property_id"]],
+                # A landowner who paid for the report keeps access to its replacement
+                "is_unlocked": row["property_id"] in reports and reports[row["property_id"]].is_unlocked,
+                "created_at": now
+            }
+            for row in rows
+        ])
+        return len(rows)
+
+    @staticmethod
+    async def evaluate(
+        db: AsyncSession,
+        plots: List[Dict[str, Any]],
+        landowner_id: Optional[UUID] = None,
+        persist: bool = False
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Resolve, compute and optionally store a batch; returns (results, stored)"""
+        results = FeasibilityBatchService.compute(
+            await FeasibilityBatchService.resolve_plots(db, plots, landowner_id, match_property=persist)
+        )
+        persisted = await FeasibilityBatchService.persist(db, results) if persist else 0
+        return results, persisted
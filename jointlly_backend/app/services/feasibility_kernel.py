@@ -0,0 +1,92 @@
+"""
+Vectorized FAR and feasibility kernel
+
+Columnar counterpart of FARService.calculate_far,
+FeasibilityService.calculate_setbacks and
+FeasibilityService.calculate_floors_and_units. Band lookups read the same
+tables on those services, so a batch of plots gets exactly the figures the
+single-property endpoints would store.
+"""
+from typing import Dict
+import numpy as np
+from app.services.far_service import FARService
+from app.services.feasibility_service import FeasibilityService
+
+_FAR_UPPER = np.array([band[0] for band in FARService.ROAD_WIDTH_FAR_BANDS])
+_BASE_FAR = np.array([band[1] for band in FARService.ROAD_WIDTH_FAR_BANDS])
+_MAX_FAR = np.array([band[2] for band in FARService.ROAD_WIDTH_FAR_BANDS])
+
+_SETBACK_UPPER = np.array([band[0] for band in FeasibilityService.SETBACK_BANDS])
+# NaN marks the percentage-based band
+_FRONT_M = np.array([np.nan if band[1] is None else band[1] for band in FeasibilityService.SETBACK_BANDS])
+_REAR_M = np.array([np.nan if band[2] is None else band[2] for band in FeasibilityService.SETBACK_BANDS])
+_SIDE_M = np.array([np.nan if band[3] is None else band[3] for band in FeasibilityService.SETBACK_BANDS])
+_CATEGORY = np.array([band[4] for band in FeasibilityService.SETBACK_BANDS], dtype=object)
+
+
+def compute_feasibility(
+    width_ft: np.ndarray,
+    length_ft: np.ndarray,
+    road_width_ft: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """FAR, setbacks, floors, units and saleable area for every plot"""
+    width_ft = np.asarray(width_ft, dtype=np.float64)
+    length_ft = np.asarray(length_ft, dtype=np.float64)
+    road_width_ft = np.asarray(road_width_ft, dtype=np.float64)
+    meter_to_feet = FeasibilityService.METER_TO_FEET
+
+    # FAR: first band whose (exclusive) road width bound exceeds the road width
+    plot_area_sqft = width_ft * length_ft
+    far_band = np.searchsorted(_FAR_UPPER, road_width_ft, side="right")
+    calculated_far = _BASE_FAR[far_band]
+    max_far = _MAX_FAR[far_band]
+    total_buildable_area_sqft = plot_area_sqft * calculated_far
+
+    # Setbacks: first band whose (inclusive) area bound covers the plot
+    plot_area_sqm = plot_area_sqft / FeasibilityService.SQFT_PER_SQM
+    setback_band = np.searchsorted(_SETBACK_UPPER, plot_area_sqm, side="left")
+    front_setback_m = _FRONT_M[setback_band]
+    rear_setback_m = _REAR_M[setback_band]
+    side_setback_m = _SIDE_M[setback_band]
+
+    percentage = np.isnan(front_setback_m)
+    if percentage.any():
+        front_share, rear_share, side_share = FeasibilityService.PERCENTAGE_SETBACKS
+        depth_ft = np.maximum(width_ft, length_ft)
+        front_setback_m = np.where(percentage, (depth_ft * front_share) / meter_to_feet, front_setback_m)
+        rear_setback_m = np.where(percentage, (depth_ft * rear_share) / meter_to_feet, rear_setback_m)
+        side_setback_m = np.where(
+            percentage, (np.minimum(width_ft, length_ft) * side_share) / meter_to_feet, side_setback_m
+        )
+
+    net_length_ft = np.maximum(length_ft - front_setback_m * meter_to_feet - rear_setback_m * meter_to_feet, 0.0)
+    net_width_ft = np.maximum(width_ft - 2 * (side_setback_m * meter_to_feet), 0.0)
+    net_buildable_area_sqft = net_length_ft * net_width_ft
+
+    # Floors and units (all quantities are non-negative, so floor == int())
+    has_net_area = net_buildable_area_sqft > 0
+    floors = np.where(
+        has_net_area,
+        np.floor(total_buildable_area_sqft / np.where(has_net_area, net_buildable_area_sqft, 1.0)),
+        0.0
+    )
+    allowed_floors = np.minimum(floors, FeasibilityService.MAX_FLOORS).astype(np.int64)
+    number_of_units = np.floor(
+        total_buildable_area_sqft / FeasibilityService.AVERAGE_UNIT_SIZE_SQFT
+    ).astype(np.int64)
+
+    return {
+        "plot_area_sqft": plot_area_sqft,
+        "calculated_far": calculated_far,
+        "max_far": max_far,
+        "premium_far_available": max_far > calculated_far,
+        "total_buildable_area_sqft": total_buildable_area_sqft,
+        "plot_category": _CATEGORY[setback_band],
+        "front_setback_m": front_setback_m,
+        "rear_setback_m": rear_setback_m,
+        "side_setback_m": side_setback_m,
+        "net_buildable_area_sqft": net_buildable_area_sqft,
+        "allowed_floors": allowed_floors,
+        "number_of_units": number_of_units,
+        "saleable_area_sqft": total_buildable_area_sqft * FeasibilityService.SALEABLE_RATIO,
+    }
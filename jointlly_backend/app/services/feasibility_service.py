@@ -1,19 +1,45 @@
 """
 Feasibility calculation service with BBMP setback rules
 """
-from typing import Optional, Dict
+import hashlib
+import json
+from typing import Optional, Dict, List
+from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func
 from app.models.verification import FeasibilityReport
 from app.models.landowner import Property
+from app.services.far_service import FARService
 from app.exceptions import NotFoundError
 
 
 class FeasibilityService:
     """Service for feasibility calculations with BBMP setback rules"""
     
+    # Bump whenever the setback bands or floor/unit constants change
+    RULES_VERSION = "bbmp-2026-01-05"
+    
     # Conversion: 1 meter = 3.28084 feet
     METER_TO_FEET = 3.28084
+    SQFT_PER_SQM = 10.764
+    
+    # BBMP setback bands: (plot area upper bound in sq m, inclusive,
+    # front, rear and side setbacks in m, category). None marks the
+    # percentage-based band.
+    SETBACK_BANDS = (
+        (60.0, 0.7, 0.0, 0.6, "≤60 sq m"),
+        (150.0, 0.9, 0.7, 0.7, "60-150 sq m"),
+        (250.0, 1.0, 0.8, 0.8, "150-250 sq m"),
+        (4000.0, None, None, None, "250-4000 sq m"),
+        (float("inf"), 5.0, 5.0, 5.0, ">4000 sq m"),
+    )
+    # Percentage-based band: front and rear as a share of the depth, sides of the width
+    PERCENTAGE_SETBACKS = (0.12, 0.08, 0.08)
+    
+    # Floors and units
+    MAX_FLOORS = 5  # Stilt + 4
+    AVERAGE_UNIT_SIZE_SQFT = 1000
+    SALEABLE_RATIO = 0.75
     
     @staticmethod
     def calculate_setbacks(
@@ -33,38 +59,20 @@ class FeasibilityService:
         - >4000 sq m: Minimum 5m all sides
         """
         # Convert sqft to sqm (1 sqm = 10.764 sqft)
-        plot_area_sqm = plot_area_sqft / 10.764
+        plot_area_sqm = plot_area_sqft / FeasibilityService.SQFT_PER_SQM
         
         # Determine plot category and setbacks
-        if plot_area_sqm <= 60:
-            front_setback_m = 0.7
-            rear_setback_m = 0.0  # Eliminated
-            side_setback_m = 0.6
-            plot_category = "≤60 sq m"
-        elif plot_area_sqm <= 150:
-            front_setback_m = 0.9
-            rear_setback_m = 0.7
-            side_setback_m = 0.7
-            plot_category = "60-150 sq m"
-        elif plot_area_sqm <= 250:
-            front_setback_m = 1.0
-            rear_setback_m = 0.8
-            side_setback_m = 0.8
-            plot_category = "150-250 sq m"
-        elif plot_area_sqm <= 4000:
+        _, front_setback_m, rear_setback_m, side_setback_m, plot_category = next(
+            band for band in FeasibilityService.SETBACK_BANDS if plot_area_sqm <= band[0]
+        )
+        if front_setback_m is None:
             # Percentage-based: 12% front, 8% rear/sides
             # Assume length is the depth (front to back)
             depth_ft = max(width_ft, length_ft)
-            front_setback_m = (depth_ft * 0.12) / FeasibilityService.METER_TO_FEET
-            rear_setback_m = (depth_ft * 0.08) / FeasibilityService.METER_TO_FEET
-            side_setback_m = (min(width_ft, length_ft) * 0.08) / FeasibilityService.METER_TO_FEET
-            plot_category = "250-4000 sq m"
-        else:
-            # Minimum 5m all sides
-            front_setback_m = 5.0
-            rear_setback_m = 5.0
-            side_setback_m = 5.0
-            plot_category = ">4000 sq m"
+            front_share, rear_share, side_share = FeasibilityService.PERCENTAGE_SETBACKS
+            front_setback_m = (depth_ft * front_share) / FeasibilityService.METER_TO_FEET
+            rear_setback_m = (depth_ft * rear_share) / FeasibilityService.METER_TO_FEET
+            side_setback_m = (min(width_ft, length_ft) * side_share) / FeasibilityService.METER_TO_FEET
         
         # Convert setbacks to feet
         front_setback_ft = front_setback_m * FeasibilityService.METER_TO_FEET
@@ -114,15 +122,15 @@ class FeasibilityService:
         floors = int(total_buildable_area_sqft / net_buildable_area_sqft) if net_buildable_area_sqft > 0 else 0
         
         # Limit to typical pattern (stilt + 4)
-        if floors > 5:
-            floors = 5
+        if floors > FeasibilityService.MAX_FLOORS:
+            floors = FeasibilityService.MAX_FLOORS
         
         # Calculate units (assuming typical unit size ~800-1200 sqft)
-        avg_unit_size = 1000  # sqft
+        avg_unit_size = FeasibilityService.AVERAGE_UNIT_SIZE_SQFT
         number_of_units = int(total_buildable_area_sqft / avg_unit_size)
         
         # Saleable area (typically 70-80% of built-up area)
-        saleable_area_sqft = total_buildable_area_sqft * 0.75
+        saleable_area_sqft = total_buildable_area_sqft * FeasibilityService.SALEABLE_RATIO
         
         return {
             "allowed_floors": floors,
@@ -132,15 +140,43 @@ class FeasibilityService:
             "average_unit_size_sqft": avg_unit_size
         }
     
+    @staticmethod
+    def input_digest(
+        width_ft: Optional[float],
+        length_ft: Optional[float],
+        road_width_ft: Optional[float],
+        zone_type: Optional[str],
+        total_buildable_area_sqft: float
+    ) -> str:
+        """
+        Content key of a report: plot geometry, FAR inputs and both rules versions
+        """
+        key = json.dumps([
+            FARService.RULES_VERSION,
+            FeasibilityService.RULES_VERSION,
+            width_ft,
+            length_ft,
+            road_width_ft,
+            zone_type or "Residential",
+            total_buildable_area_sqft
+        ])
+        return hashlib.sha256(key.encode()).hexdigest()
+    
     @staticmethod
     async def create_feasibility_report(
         db: AsyncSession,
-        property_id: str,
+        property_id: UUID,
         total_buildable_area_sqft: float,
-        is_unlocked: bool = False
+        is_unlocked: bool = False,
+        road_width_ft: Optional[float] = None,
+        zone_type: Optional[str] = None
     ) -> FeasibilityReport:
         """
         Create feasibility report with setbacks and floor calculations
+        
+        When the property's latest report was computed from the same inputs
+        and rules it is returned as is, so repeated requests write nothing.
+        Changed dimensions or a bumped RULES_VERSION produce a new report.
         """
         # Get property
         result = await db.execute(
@@ -151,6 +187,17 @@ class FeasibilityService:
         if not property_obj:
             raise NotFoundError("Property", property_id)
         
+        input_digest = FeasibilityService.input_digest(
+            property_obj.width_ft,
+            property_obj.length_ft,
+            road_width_ft,
+            zone_type,
+            total_buildable_area_sqft
+        )
+        latest = await FeasibilityService.get_feasibility_report(db, property_id)
+        if latest is not None and latest.input_digest == input_digest:
+            return latest
+        
         # Calculate setbacks
         setback_data = FeasibilityService.calculate_setbacks(
             property_obj.plot_area_sqft,
@@ -178,19 +225,19 @@ class FeasibilityService:
             total_built_up_area_sqft=total_buildable_area_sqft,
             saleable_area_sqft=floor_data["saleable_area_sqft"],
             number_of_units=floor_data["number_of_units"],
+            input_digest=input_digest,
             is_unlocked=is_unlocked
         )
         
         db.add(feasibility_report)
-        await db.commit()
-        await db.refresh(feasibility_report)
+        await db.flush()
         
         return feasibility_report
     
     @staticmethod
     async def get_feasibility_report(
         db: AsyncSession,
-        property_id: str
+        property_id: UUID
     ) -> Optional[FeasibilityReport]:
         """
         Get latest feasibility report for a property
@@ -198,14 +245,40 @@ class FeasibilityService:
         result = await db.execute(
             select(FeasibilityReport)
             .where(FeasibilityReport.property_id == property_id)
-            .order_by(FeasibilityReport.created_at.desc())
+            .order_by(FeasibilityReport.created_at.desc(), FeasibilityReport.id.desc())
+            .limit(1)
         )
         return result.scalar_one_or_none()
     
+    @staticmethod
+    async def get_latest_feasibility_reports(
+        db: AsyncSession,
+        property_ids: List[UUID]
+    ) -> Dict[UUID, FeasibilityReport]:
+        """
+        Latest feasibility report of each property, in one query
+        Properties without a report are left out.
+        """
+        if not property_ids:
+            return {}
+        ranked = select(
+            FeasibilityReport.id,
+            func.row_number().over(
+                partition_by=FeasibilityReport.property_id,
+                order_by=(FeasibilityReport.created_at.desc(), FeasibilityReport.id.desc())
+            ).label("position")
+        ).where(FeasibilityReport.property_id.in_(property_ids)).subquery()
+        result = await db.execute(
+            select(FeasibilityReport)
+            .join(ranked, FeasibilityReport.id == ranked.c.id)
+            .where(ranked.c.position == 1)
+        )
+        return {report.property_id: report for report in result.scalars().all()}
+    
     @staticmethod
     async def unlock_feasibility_report(
         db: AsyncSession,
-        property_id: str
+        property_id: UUID
     ) -> FeasibilityReport:
         """
         Unlock feasibility report after payment
@@ -216,7 +289,6 @@ class FeasibilityService:
             raise NotFoundError("FeasibilityReport", property_id)
         
         report.is_unlocked = True
-        await db.commit()
-        await db.refresh(report)
+        await db.flush()
         
         return report
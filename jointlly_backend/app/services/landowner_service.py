@@ -5,10 +5,24 @@ from uuid import UUID
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.orm import selectinload
 from app.models.landowner import LandownerProfile, Property, Project, JVPreferences
 from app.models.user import User
-from app.utils.constants import ProjectType, ProjectStatus, JVPostConstructionExpectation
+from app.models.verification import PIDVerification
+from app.utils.constants import (
+    ProjectType,
+    ProjectStatus,
+    JVPostConstructionExpectation,
+    VerificationStatus,
+    RescoreComponent,
+    MatchStatus
+)
+from app.utils.geo import parse_coordinates
 from app.exceptions import NotFoundError, ConflictError, ValidationError
+from app.services.match_rescore_service import MatchRescoreService
+from app.services.far_service import FARService
+from app.services.feasibility_service import FeasibilityService
+from app.services.matching_service import MatchingService
 
 
 class LandownerService:
@@ -40,8 +54,7 @@ class LandownerService:
         )
         
         db.add(profile)
-        await db.commit()
-        await db.refresh(profile)
+        await db.flush()
         
         return profile
     
@@ -79,8 +92,7 @@ class LandownerService:
         if city is not None:
             profile.city = city
         
-        await db.commit()
-        await db.refresh(profile)
+        await db.flush()
         
         return profile
     
@@ -105,6 +117,7 @@ class LandownerService:
         pid_number: Optional[str] = None
     ) -> Property:
         """Create property"""
+        coordinates = parse_coordinates(google_maps_pin)
         property_obj = Property(
             landowner_id=landowner_id,
             name=name,
@@ -112,6 +125,8 @@ class LandownerService:
             ward=ward,
             landmark=landmark,
             google_maps_pin=google_maps_pin,
+            latitude=coordinates[0] if coordinates else None,
+            longitude=coordinates[1] if coordinates else None,
             width_ft=width_ft,
             length_ft=length_ft,
             facing=facing,
@@ -125,8 +140,7 @@ class LandownerService:
         )
         
         db.add(property_obj)
-        await db.commit()
-        await db.refresh(property_obj)
+        await db.flush()
         
         return property_obj
     
@@ -160,6 +174,89 @@ class LandownerService:
         )
         return list(result.scalars().all())
     
+    @staticmethod
+    async def get_dashboard(
+        db: AsyncSession,
+        user_id: UUID
+    ) -> dict:
+        """
+        Profile, properties with their projects, latest FAR and feasibility
+        summaries, and match counts by status per project
+        A fixed number of queries however many properties and projects.
+        """
+        profile = await LandownerService.get_profile(db, user_id)
+        result = await db.execute(
+            select(Property)
+            .where(Property.landowner_id == profile.id)
+            .options(selectinload(Property.projects))
+            .order_by(Property.created_at.desc())
+        )
+        properties = list(result.scalars().all())
+        
+        property_ids = [property_obj.id for property_obj in properties]
+        project_ids = [project.id for property_obj in properties for project in property_obj.projects]
+        latest_far = await FARService.get_latest_far_calculations(db, property_ids)
+        latest_feasibility = await FeasibilityService.get_latest_feasibility_reports(db, property_ids)
+        match_counts = await MatchingService.count_project_matches(db, project_ids)
+        
+        totals = {match_status: 0 for match_status in MatchStatus}
+        dashboard_properties = []
+        for property_obj in properties:
+            projects = []
+            for project in sorted(property_obj.projects, key=lambda project: project.created_at, reverse=True):
+                counts = {match_status: match_counts.get(project.id, {}).get(match_status, 0) for match_status in MatchStatus}
+                for match_status, count in counts.items():
+                    totals[match_status] += count
+                projects.append({"project": project, "match_counts": LandownerService._match_summary(counts)})
+            dashboard_properties.append({
+                "property": property_obj,
+                "projects": projects,
+                "latest_far": latest_far.get(property_obj.id),
+                "latest_feasibility": latest_feasibility.get(property_obj.id)
+            })
+        
+        return {
+            "profile": profile,
+            "properties": dashboard_properties,
+            "project_count": len(project_ids),
+            "match_counts": LandownerService._match_summary(totals)
+        }
+    
+    @staticmethod
+    def _match_summary(counts: dict) -> dict:
+        return {
+            "pending": counts[MatchStatus.PENDING],
+            "accepted": counts[MatchStatus.ACCEPTED],
+            "rejected": counts[MatchStatus.REJECTED],
+            "total": sum(counts.values())
+        }
+    
+    @staticmethod
+    async def update_pid_verification_status(
+        db: AsyncSession,
+        verification_id: UUID,
+        verification_status: VerificationStatus
+    ) -> PIDVerification:
+        """Record the outcome of a PID verification"""
+        result = await db.execute(
+            select(PIDVerification).where(PIDVerification.id == verification_id)
+        )
+        pid_verification = result.scalar_one_or_none()
+        
+        if not pid_verification:
+            raise NotFoundError("PIDVerification", str(verification_id))
+        
+        if pid_verification.verification_status != verification_status:
+            pid_verification.verification_status = verification_status
+            # verification_score of every match on this property changes
+            await MatchRescoreService.mark_property(
+                db, pid_verification.property_id, [RescoreComponent.VERIFICATION]
+            )
+        
+        await db.flush()
+        
+        return pid_verification
+    
     @staticmethod
     async def create_project(
         db: AsyncSession,
@@ -183,8 +280,7 @@ class LandownerService:
         )
         
         db.add(project)
-        await db.commit()
-        await db.refresh(project)
+        await db.flush()
         
         return project
     
@@ -219,9 +315,6 @@ class LandownerService:
         # Validate project requirements based on type
         if project.project_type == ProjectType.JV_JD:
             # JV/JD requires PID verification
-            from app.models.verification import PIDVerification
-            from app.utils.constants import VerificationStatus
-            
             result = await db.execute(
                 select(PIDVerification)
                 .where(PIDVerification.property_id == project.property_id)
@@ -233,8 +326,7 @@ class LandownerService:
                 raise ValidationError("PID verification is mandatory for JV/JD projects")
         
         project.status = ProjectStatus.PUBLISHED
-        await db.commit()
-        await db.refresh(project)
+        await db.flush()
         
         # Trigger matching (will be called from router)
         return project
@@ -258,8 +350,7 @@ class LandownerService:
                 existing.post_construction_expectation = post_construction_expectation
             if development_vision is not None:
                 existing.development_vision = development_vision
-            await db.commit()
-            await db.refresh(existing)
+            await db.flush()
             return existing
         
         preferences = JVPreferences(
@@ -269,7 +360,6 @@ class LandownerService:
         )
         
         db.add(preferences)
-        await db.commit()
-        await db.refresh(preferences)
+        await db.flush()
         
         return preferences
@@ -0,0 +1,299 @@
+"""
+Change-driven match re-scoring
+
+Writes that change a scored attribute mark the affected matches dirty for
+that component (MatchRescore rows, written in the same transaction as the
+change). A worker claims marks in batches, recomputes only the marked
+components from current data and bulk-updates MatchScore and Match.
+Marking an already marked component bumps its version, and the worker
+only clears the versions it claimed, so a change made while a batch is
+being scored is picked up by the next batch.
+"""
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set
+from uuid import UUID, uuid4
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, delete
+from sqlalchemy.orm import joinedload
+from app.config import settings
+from app.database import AsyncSessionLocal, insert_ignore_conflicts, insert_or_increment
+from app.models.landowner import Project
+from app.models.matching import Match, MatchScore, MatchRescore
+from app.models.professional import ProfessionalProfile, Capability, PricingTier, LocationPreference
+from app.models.verification import PIDVerification
+from app.services.matching_service import MatchingService
+from app.utils.constants import PROJECT_CAPABILITY_MAP, CapabilityType, RescoreComponent
+
+logger = logging.getLogger(__name__)
+
+# MatchScore columns recomputed for each component
+COMPONENT_COLUMNS = {
+    RescoreComponent.LOCATION: ("location_score",),
+    RescoreComponent.PRICING: ("project_size_score", "pricing_score"),
+    RescoreComponent.CAPABILITY: ("project_type_score", "capability_score"),
+    RescoreComponent.VERIFICATION: ("verification_score",),
+}
+
+
+class MatchRescoreService:
+    """Service for marking and re-scoring stale matches"""
+
+    # ---------- marking (called from write paths, before commit) ----------
+
+    @staticmethod
+    async def mark_professional(
+        db: AsyncSession,
+        professional_id: UUID,
+        components: Iterable[RescoreComponent]
+    ) -> int:
+        """Mark every match of a professional stale for the given components"""
+        return await MatchRescoreService._mark(
+            db,
+            select(Match.id).where(Match.professional_id == professional_id),
+            components
+        )
+
+    @staticmethod
+    async def mark_property(
+        db: AsyncSession,
+        property_id: UUID,
+        components: Iterable[RescoreComponent]
+    ) -> int:
+        """Mark every match of the property's projects stale for the given components"""
+        return await MatchRescoreService._mark(
+            db,
+            select(Match.id).join(Project, Match.project_id == Project.id)
+            .where(Project.property_id == property_id),
+            components
+        )
+
+    @staticmethod
+    async def _mark(db: AsyncSession, match_ids_query, components: Iterable[RescoreComponent]) -> int:
+        components = list(dict.fromkeys(components))
+        result = await db.execute(match_ids_query)
+        match_ids = list(result.scalars().all())
+        if not match_ids or not components:
+            return 0
+
+        now = datetime.utcnow()
+        rows = [
+            {"id": uuid4(), "match_id": match_id, "component": component, "version": 0, "created_at": now}
+            for match_id in match_ids
+            for component in components
+        ]
+        # Pairs that are already marked (possibly claimed by a running batch) get a new version
+        await db.execute(
+            insert_or_increment(
+                MatchRescore.__table__, db.bind.dialect.name, ["match_id", "component"], "version"
+            ),
+            rows
+        )
+        return len(rows)
+
+    # ---------- re-scoring ----------
+
+    @staticmethod
+    async def run_batch(batch_size: Optional[int] = None) -> int:
+        """
+        Claim up to batch_size marks, re-score their matches and clear the
+        claimed versions; marks bumped meanwhile stay for the next batch
+        Returns the number of marks processed
+        """
+        batch_size = batch_size or settings.rescore_batch_size
+
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(MatchRescore.id, MatchRescore.match_id, MatchRescore.component, MatchRescore.version)
+                .order_by(MatchRescore.created_at)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            marks = result.all()
+            if not marks:
+                await db.rollback()
+                return 0
+
+            components_by_match: Dict[UUID, Set[RescoreComponent]] = defaultdict(set)
+            mark_ids_by_version: Dict[int, List[UUID]] = defaultdict(list)
+            for mark_id, match_id, component, version in marks:
+                components_by_match[match_id].add(component)
+                mark_ids_by_version[version].append(mark_id)
+
+            await MatchRescoreService.rescore(db, components_by_match)
+            for version, mark_ids in mark_ids_by_version.items():
+                await db.execute(
+                    delete(MatchRescore)
+                    .where(MatchRescore.id.in_(mark_ids), MatchRescore.version == version)
+                )
+            await db.commit()
+
+        return len(marks)
+
+    @staticmethod
+    async def rescore(
+        db: AsyncSession,
+        components_by_match: Dict[UUID, Set[RescoreComponent]]
+    ) -> int:
+        """
+        Recompute the given components of each match and bulk-update
+        MatchScore and Match. Matches without a MatchScore row are fully
+        re-scored. Returns the number of matches updated.
+        """
+        matches_result = await db.execute(
+            select(Match, MatchScore)
+            .outerjoin(MatchScore, MatchScore.match_id == Match.id)
+            .where(Match.id.in_(list(components_by_match)))
+        )
+        rows = matches_result.all()
+        if not rows:
+            return 0
+
+        all_components = set(RescoreComponent)
+        needed: Dict[UUID, Set[RescoreComponent]] = {
+            match.id: components_by_match[match.id] if score else all_components
+            for match, score in rows
+        }
+        needed_anywhere = set().union(*needed.values())
+
+        # Load only what the marked components need, once per batch
+        project_ids = {match.project_id for match, _ in rows}
+        projects_result = await db.execute(
+            select(Project)
+            .options(joinedload(Project.property))
+            .where(Project.id.in_(project_ids))
+        )
+        projects = {project.id: project for project in projects_result.scalars().all()}
+
+        professional_ids = {match.professional_id for match, _ in rows}
+        professionals: Dict[UUID, ProfessionalProfile] = {}
+        capabilities: Dict[UUID, List[Capability]] = defaultdict(list)
+        pricing_tiers: Dict[UUID, List[PricingTier]] = defaultdict(list)
+        service_areas: Dict[UUID, List[LocationPreference]] = defaultdict(list)
+        pid_verifications: Dict[UUID, List[PIDVerification]] = defaultdict(list)
+
+        if RescoreComponent.LOCATION in needed_anywhere:
+            professionals_result = await db.execute(
+                select(ProfessionalProfile).where(ProfessionalProfile.id.in_(professional_ids))
+            )
+            professionals = {profile.id: profile for profile in professionals_result.scalars().all()}
+            locations_result = await db.execute(
+                select(LocationPreference).where(LocationPreference.professional_id.in_(professional_ids))
+            )
+            for location in locations_result.scalars().all():
+                service_areas[location.professional_id].append(location)
+
+        if RescoreComponent.CAPABILITY in needed_anywhere:
+            capabilities_result = await db.execute(
+                select(Capability).where(Capability.professional_id.in_(professional_ids))
+            )
+            for capability in capabilities_result.scalars().all():
+                capabilities[capability.professional_id].append(capability)
+
+        if RescoreComponent.PRICING in needed_anywhere:
+            pricing_result = await db.execute(
+                select(PricingTier).where(PricingTier.professional_id.in_(professional_ids))
+            )
+            for tier in pricing_result.scalars().all():
+                pricing_tiers[tier.professional_id].append(tier)
+
+        if RescoreComponent.VERIFICATION in needed_anywhere:
+            property_ids = {project.property_id for project in projects.values()}
+            pid_result = await db.execute(
+                select(PIDVerification).where(PIDVerification.property_id.in_(property_ids))
+            )
+            for verification in pid_result.scalars().all():
+                pid_verifications[verification.property_id].append(verification)
+
+        now = datetime.utcnow()
+        score_updates = []
+        score_inserts = []
+        match_updates = []
+        for match, score in rows:
+            project = projects[match.project_id]
+            property_obj = project.property
+            capability_type = PROJECT_CAPABILITY_MAP.get(project.project_type, CapabilityType.CONSTRUCTION)
+            components = needed[match.id]
+
+            values = {
+                column: getattr(score, column) if score else None
+                for columns in COMPONENT_COLUMNS.values()
+                for column in columns
+            }
+
+            if RescoreComponent.LOCATION in components:
+                professional = professionals.get(match.professional_id)
+                values["location_score"] = MatchingService.calculate_location_score(
+                    property_obj.city,
+                    professional.location_preferences if professional else None,
+                    MatchingService.plot_coordinates(property_obj),
+                    service_areas[match.professional_id],
+                    capability_type
+                )
+            if RescoreComponent.PRICING in components:
+                values["project_size_score"] = MatchingService.calculate_project_size_score(
+                    property_obj.plot_area_sqft, pricing_tiers[match.professional_id], capability_type
+                )
+                values["pricing_score"] = MatchingService.calculate_pricing_score(
+                    property_obj.plot_area_sqft, pricing_tiers[match.professional_id], capability_type
+                )
+            if RescoreComponent.CAPABILITY in components:
+                values["project_type_score"] = MatchingService.calculate_project_type_score(
+                    project.project_type, capabilities[match.professional_id]
+                )
+                values["capability_score"] = MatchingService.calculate_capability_score(
+                    capabilities[match.professional_id], project.project_type
+                )
+            if RescoreComponent.VERIFICATION in components:
+                values["verification_score"] = MatchingService.calculate_verification_score(
+                    property_obj, pid_verifications[property_obj.id]
+                )
+
+            values["total_score"] = MatchingService.weighted_total(values)
+
+            if score:
+                score_updates.append({"id": score.id, **values})
+            else:
+                score_inserts.append({"id": uuid4(), "match_id": match.id, "created_at": now, **values})
+            match_updates.append({"id": match.id, "match_score": values["total_score"], "updated_at": now})
+
+        if score_updates:
+            await db.execute(update(MatchScore), score_updates)
+        if score_inserts:
+            await db.execute(
+                insert_ignore_conflicts(MatchScore.__table__, db.bind.dialect.name),
+                score_inserts
+            )
+        await db.execute(update(Match), match_updates)
+
+        return len(match_updates)
+
+    @staticmethod
+    async def run_worker(
+        stop_event: asyncio.Event,
+        poll_seconds: Optional[float] = None
+    ) -> None:
+        """Drain marks in batches until stop_event is set"""
+        poll_seconds = poll_seconds or settings.rescore_poll_seconds
+        batch_size = settings.rescore_batch_size
+        logger.info("Match rescore worker started")
+
+        while not stop_event.is_set():
+            try:
+                processed = await MatchRescoreService.run_batch(batch_size)
+            except Exception:
+                logger.exception("Match rescore batch failed")
+                processed = 0
+
+            # A full batch means more are probably waiting
+            if processed >= batch_size:
+                continue
+
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+        logger.info("Match rescore worker stopped")
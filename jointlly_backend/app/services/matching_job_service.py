@@ -0,0 +1,287 @@
+"""
+Durable matching job queue
+
+Publishing a project enqueues a MatchingJob row instead of running matching
+inline. Workers (in-process or `python -m app.workers.matching_worker`) claim
+jobs with SELECT ... FOR UPDATE SKIP LOCKED, run the bulk matcher and retry
+failures with exponential backoff. enqueue only flushes: the job becomes
+visible, and idle in-process workers wake, when the request commits.
+"""
+import asyncio
+import logging
+import random
+from datetime import datetime, timedelta
+from typing import Optional
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import event, select, and_, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.matching import MatchingJob
+from app.utils.constants import JobStatus
+from app.exceptions import NotFoundError
+
+logger = logging.getLogger(__name__)
+
+# Set when an enqueue commits so an idle in-process worker wakes up immediately
+_job_available = asyncio.Event()
+_ENQUEUED_KEY = "matching_job_enqueued"
+
+
+class MatchingJobService:
+    """Service for enqueueing and running matching jobs"""
+
+    @staticmethod
+    def idempotency_key(project_id: UUID) -> str:
+        """Key that collapses repeated publishes of one project into one job"""
+        return f"match-project:{project_id}"
+
+    @staticmethod
+    def backoff_delay(attempts: int) -> float:
+        """Exponential backoff with jitter, in seconds"""
+        ceiling = settings.matching_job_backoff_seconds * (2 ** max(0, attempts - 1))
+        return random.uniform(ceiling / 2, ceiling)
+
+    @staticmethod
+    async def enqueue(
+        db: AsyncSession,
+        project_id: UUID
+    ) -> MatchingJob:
+        """
+        Enqueue matching for a project
+
+        A job that is already queued or running is returned unchanged. A finished
+        job is re-queued so newly onboarded professionals get matched, at most
+        once per matching_job_requeue_cooldown_seconds; existing pairs are
+        skipped by the matcher, so nothing is computed twice. The job is
+        flushed, not committed: the caller's unit of work commits it.
+        """
+        result = await db.execute(
+            select(MatchingJob)
+            .where(MatchingJob.idempotency_key == MatchingJobService.idempotency_key(project_id))
+            .with_for_update()
+        )
+        job = result.scalar_one_or_none()
+
+        if job and job.status in (JobStatus.QUEUED, JobStatus.RUNNING):
+            return job
+
+        if job:
+            cooldown = timedelta(seconds=settings.matching_job_requeue_cooldown_seconds)
+            if job.completed_at and job.completed_at > datetime.utcnow() - cooldown:
+                return job
+            job.status = JobStatus.QUEUED
+            job.attempts = 0
+            job.run_after = datetime.utcnow()
+            job.last_error = None
+            job.locked_by = None
+            job.locked_at = None
+            job.completed_at = None
+        else:
+            try:
+                # Savepoint so a lost race keeps the caller's pending writes
+                async with db.begin_nested():
+                    job = MatchingJob(
+                        project_id=project_id,
+                        idempotency_key=MatchingJobService.idempotency_key(project_id),
+                        status=JobStatus.QUEUED,
+                        max_attempts=settings.matching_job_max_attempts,
+                        run_after=datetime.utcnow()
+                    )
+                    db.add(job)
+            except IntegrityError:
+                # A concurrent publish created the job first; use that one
+                result = await db.execute(
+                    select(MatchingJob)
+                    .where(MatchingJob.idempotency_key == MatchingJobService.idempotency_key(project_id))
+                    .with_for_update()
+                )
+                job = result.scalar_one()
+
+        await db.flush()
+        # Workers only wake for jobs they can see
+        db.sync_session.info[_ENQUEUED_KEY] = True
+        return job
+
+    @staticmethod
+    async def get_job(
+        db: AsyncSession,
+        project_id: UUID,
+        job_id: UUID
+    ) -> MatchingJob:
+        """Get a matching job for a project"""
+        result = await db.execute(
+            select(MatchingJob).where(
+                and_(
+                    MatchingJob.id == job_id,
+                    MatchingJob.project_id == project_id
+                )
+            )
+        )
+        job = result.scalar_one_or_none()
+
+        if not job:
+            raise NotFoundError("MatchingJob", str(job_id))
+
+        return job
+
+    @staticmethod
+    async def claim_next(
+        db: AsyncSession,
+        worker_id: str
+    ) -> Optional[MatchingJob]:
+        """
+        Lock the next runnable job for this worker; the caller commits
+        A job reclaimed from a dead worker has used an attempt, and one that
+        has no attempts left is marked FAILED instead of being run again.
+        """
+        while True:
+            now = datetime.utcnow()
+            stale_before = now - timedelta(seconds=settings.matching_job_lock_timeout_seconds)
+
+            result = await db.execute(
+                select(MatchingJob)
+                .where(
+                    or_(
+                        and_(
+                            MatchingJob.status == JobStatus.QUEUED,
+                            MatchingJob.run_after <= now
+                        ),
+                        # Reclaim jobs whose worker died mid-run
+                        and_(
+                            MatchingJob.status == JobStatus.RUNNING,
+                            MatchingJob.locked_at < stale_before
+                        )
+                    )
+                )
+                .order_by(MatchingJob.run_after)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            )
+            job = result.scalar_one_or_none()
+
+            if not job:
+                return None
+
+            if job.status == JobStatus.RUNNING and job.attempts >= job.max_attempts:
+                logger.error("Matching job %s lost its worker on the last attempt", job.id)
+                job.status = JobStatus.FAILED
+                job.last_error = f"Worker {job.locked_by} stopped responding on attempt {job.attempts}"
+                job.completed_at = now
+                job.locked_by = None
+                job.locked_at = None
+                await db.flush()
+                continue
+
+            job.status = JobStatus.RUNNING
+            job.attempts += 1
+            job.locked_by = worker_id
+            job.locked_at = now
+            await db.flush()
+
+            return job
+
+    @staticmethod
+    async def run_next(worker_id: str) -> bool:
+        """
+        Claim and run one job
+        Returns False when the queue had nothing runnable
+        """
+        from app.services.matching_service import MatchingService
+
+        async with AsyncSessionLocal() as db:
+            job = await MatchingJobService.claim_next(db, worker_id)
+            # Commit the claim (and any jobs failed on the way) before the long run
+            await db.commit()
+            if not job:
+                return False
+
+            job_id = job.id
+            attempt = job.attempts
+            try:
+                matches = await MatchingService.match_project_to_professionals(db, job.project_id)
+            except Exception as e:
+                await db.rollback()
+                logger.exception("Matching job %s failed (attempt %s)", job_id, attempt)
+                await MatchingJobService._record_failure(db, job_id, e)
+                await db.commit()
+                return True
+
+            job.status = JobStatus.SUCCEEDED
+            job.matches_created = len(matches)
+            job.completed_at = datetime.utcnow()
+            job.locked_by = None
+            job.locked_at = None
+            job.last_error = None
+            await db.commit()
+
+        return True
+
+    @staticmethod
+    async def _record_failure(
+        db: AsyncSession,
+        job_id: UUID,
+        error: Exception
+    ) -> None:
+        """Schedule a retry with backoff, or give up after max_attempts; the caller commits"""
+        result = await db.execute(select(MatchingJob).where(MatchingJob.id == job_id))
+        job = result.scalar_one_or_none()
+        if not job:
+            return
+
+        job.last_error = str(error)[:2000]
+        job.locked_by = None
+        job.locked_at = None
+
+        if job.attempts >= job.max_attempts:
+            job.status = JobStatus.FAILED
+            job.completed_at = datetime.utcnow()
+        else:
+            job.status = JobStatus.QUEUED
+            job.run_after = datetime.utcnow() + timedelta(
+                seconds=MatchingJobService.backoff_delay(job.attempts)
+            )
+
+        await db.flush()
+
+    @staticmethod
+    async def run_worker(
+        worker_id: str,
+        stop_event: asyncio.Event,
+        poll_seconds: Optional[float] = None
+    ) -> None:
+        """Process jobs until stop_event is set"""
+        poll_seconds = poll_seconds or settings.matching_worker_poll_seconds
+        logger.info("Matching worker %s started", worker_id)
+
+        while not stop_event.is_set():
+            try:
+                ran = await MatchingJobService.run_next(worker_id)
+            except Exception:
+                # Queue unreachable (e.g. DB restart): back off and keep going
+                logger.exception("Matching worker %s could not poll the queue", worker_id)
+                ran = False
+
+            if ran:
+                continue
+
+            _job_available.clear()
+            try:
+                await asyncio.wait_for(_job_available.wait(), timeout=poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+        logger.info("Matching worker %s stopped", worker_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_workers_after_commit(session: Session) -> None:
+    if session.info.pop(_ENQUEUED_KEY, False):
+        _job_available.set()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_enqueued_after_rollback(session: Session) -> None:
+    session.info.pop(_ENQUEUED_KEY, None)
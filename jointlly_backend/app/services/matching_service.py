@@ -1,24 +1,39 @@
 """
 Matching service with scoring algorithm
 """
+import heapq
 import math
-from uuid import UUID
-from typing import List, Optional
+from collections import defaultdict
+from datetime import datetime
+from uuid import UUID, uuid4
+from typing import Dict, List, Optional, Set, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, or_, exists, insert, func
+from sqlalchemy.orm import joinedload, selectinload
+import numpy as np
+from app.config import settings
+from app.database import insert_ignore_conflicts
 from app.models.matching import Match, MatchScore
 from app.models.landowner import Project
-from app.models.professional import ProfessionalProfile, Capability, PricingTier
+from app.models.professional import ProfessionalProfile, Capability, PricingTier, LocationPreference
 from app.models.landowner import Property
 from app.models.verification import PIDVerification
 from app.utils.constants import (
     MatchStatus,
     MATCH_WEIGHTS,
+    PROJECT_CAPABILITY_MAP,
     ProjectType,
     CapabilityType,
     VerificationStatus
 )
+from app.utils.geo import parse_coordinates
+from app.utils.pagination import encode_score_cursor, decode_score_cursor
 from app.exceptions import NotFoundError
+from app.services.candidate_index import candidate_index
+from app.services.scoring_kernel import ScoringKernel, CandidateArrays
+
+# Candidates scored per kernel pass in preview_top_matches
+TOP_K_CHUNK_SIZE = 2048
 
 
 class MatchingService:
@@ -44,6 +59,13 @@ class MatchingService:
         
         return R * c
     
+    @staticmethod
+    def plot_coordinates(property_obj: Property) -> Optional[Tuple[float, float]]:
+        """Stored plot coordinates, falling back to parsing the map pin"""
+        if property_obj.latitude is not None and property_obj.longitude is not None:
+            return property_obj.latitude, property_obj.longitude
+        return parse_coordinates(property_obj.google_maps_pin)
+    
     @staticmethod
     def calculate_project_type_score(
         project_type: ProjectType,
@@ -70,9 +92,32 @@ class MatchingService:
     @staticmethod
     def calculate_location_score(
         property_city: str,
-        location_preferences: Optional[List[str]]
+        location_preferences: Optional[List[str]],
+        plot_coordinates: Optional[Tuple[float, float]] = None,
+        service_areas: Optional[List[LocationPreference]] = None,
+        capability_type: CapabilityType = CapabilityType.CONSTRUCTION
     ) -> float:
-        """Calculate location match score (25% weight)"""
+        """
+        Calculate location match score (25% weight)
+        
+        When the plot and the professional's service areas for this capability
+        are geolocated, the score is 1.0 inside any service radius and 0.0
+        outside all of them; otherwise city names are compared.
+        """
+        applicable_areas = [
+            area for area in service_areas or []
+            if area.latitude is not None and area.longitude is not None and
+            area.capability_type in (None, capability_type)
+        ]
+        if plot_coordinates and applicable_areas:
+            for area in applicable_areas:
+                distance = MatchingService.haversine_distance(
+                    plot_coordinates[0], plot_coordinates[1], area.latitude, area.longitude
+                )
+                if distance <= (area.radius_km or settings.default_service_radius_km):
+                    return 1.0
+            return 0.0
+        
         if not location_preferences:
             return 0.5  # Neutral score if no preferences
         
@@ -187,41 +232,17 @@ class MatchingService:
         return min(1.0, score)
     
     @staticmethod
-    async def calculate_match_score(
-        db: AsyncSession,
+    def score_professional(
         project: Project,
-        professional: ProfessionalProfile
+        property_obj: Property,
+        professional: ProfessionalProfile,
+        capabilities: List[Capability],
+        pricing_tiers: List[PricingTier],
+        pid_verifications: List[PIDVerification],
+        service_areas: Optional[List[LocationPreference]] = None
     ) -> dict:
-        """Calculate comprehensive match score"""
-        # Get project property
-        property_obj = project.property
-        
-        # Get professional capabilities
-        capabilities_result = await db.execute(
-            select(Capability).where(Capability.professional_id == professional.id)
-        )
-        capabilities = list(capabilities_result.scalars().all())
-        
-        # Get pricing tiers
-        pricing_result = await db.execute(
-            select(PricingTier).where(PricingTier.professional_id == professional.id)
-        )
-        pricing_tiers = list(pricing_result.scalars().all())
-        
-        # Get PID verifications
-        pid_result = await db.execute(
-            select(PIDVerification).where(PIDVerification.property_id == property_obj.id)
-        )
-        pid_verifications = list(pid_result.scalars().all())
-        
-        # Map project type to capability type
-        capability_type_map = {
-            ProjectType.CONTRACT_CONSTRUCTION: CapabilityType.CONSTRUCTION,
-            ProjectType.INTERIOR: CapabilityType.INTERIOR,
-            ProjectType.RECONSTRUCTION: CapabilityType.RECONSTRUCTION,
-            ProjectType.JV_JD: CapabilityType.JV_JD,
-        }
-        capability_type = capability_type_map.get(project.project_type, CapabilityType.CONSTRUCTION)
+        """Score one professional against a project from already-loaded rows"""
+        capability_type = PROJECT_CAPABILITY_MAP.get(project.project_type, CapabilityType.CONSTRUCTION)
         
         # Calculate project area
         project_area = property_obj.plot_area_sqft
@@ -234,7 +255,10 @@ class MatchingService:
         
         location_score = MatchingService.calculate_location_score(
             property_obj.city,
-            professional.location_preferences
+            professional.location_preferences,
+            MatchingService.plot_coordinates(property_obj),
+            service_areas,
+            capability_type
         )
         
         project_size_score = MatchingService.calculate_project_size_score(
@@ -259,25 +283,72 @@ class MatchingService:
             pid_verifications
         )
         
-        # Calculate weighted total score
-        total_score = (
-            project_type_score * MATCH_WEIGHTS["project_type"] +
-            location_score * MATCH_WEIGHTS["location"] +
-            project_size_score * MATCH_WEIGHTS["project_size"] +
-            pricing_score * MATCH_WEIGHTS["pricing"] +
-            capability_score * MATCH_WEIGHTS["capability"] +
-            verification_score * MATCH_WEIGHTS["verification"]
-        )
-        
-        return {
+        components = {
             "project_type_score": project_type_score,
             "location_score": location_score,
             "project_size_score": project_size_score,
             "pricing_score": pricing_score,
             "capability_score": capability_score,
-            "verification_score": verification_score,
-            "total_score": total_score
+            "verification_score": verification_score
         }
+        
+        return {**components, "total_score": MatchingService.weighted_total(components)}
+    
+    @staticmethod
+    def weighted_total(components: dict) -> float:
+        """Weighted total score from the six component scores"""
+        return (
+            components["project_type_score"] * MATCH_WEIGHTS["project_type"] +
+            components["location_score"] * MATCH_WEIGHTS["location"] +
+            components["project_size_score"] * MATCH_WEIGHTS["project_size"] +
+            components["pricing_score"] * MATCH_WEIGHTS["pricing"] +
+            components["capability_score"] * MATCH_WEIGHTS["capability"] +
+            components["verification_score"] * MATCH_WEIGHTS["verification"]
+        )
+    
+    @staticmethod
+    async def calculate_match_score(
+        db: AsyncSession,
+        project: Project,
+        professional: ProfessionalProfile
+    ) -> dict:
+        """Calculate comprehensive match score"""
+        # Get project property
+        property_obj = project.property
+        
+        # Get professional capabilities
+        capabilities_result = await db.execute(
+            select(Capability).where(Capability.professional_id == professional.id)
+        )
+        capabilities = list(capabilities_result.scalars().all())
+        
+        # Get pricing tiers
+        pricing_result = await db.execute(
+            select(PricingTier).where(PricingTier.professional_id == professional.id)
+        )
+        pricing_tiers = list(pricing_result.scalars().all())
+        
+        # Get service areas
+        locations_result = await db.execute(
+            select(LocationPreference).where(LocationPreference.professional_id == professional.id)
+        )
+        service_areas = list(locations_result.scalars().all())
+        
+        # Get PID verifications
+        pid_result = await db.execute(
+            select(PIDVerification).where(PIDVerification.property_id == property_obj.id)
+        )
+        pid_verifications = list(pid_result.scalars().all())
+        
+        return MatchingService.score_professional(
+            project,
+            property_obj,
+            professional,
+            capabilities,
+            pricing_tiers,
+            pid_verifications,
+            service_areas
+        )
     
     @staticmethod
     async def create_match(
@@ -304,19 +375,15 @@ class MatchingService:
         # Calculate match score
         score_data = await MatchingService.calculate_match_score(db, project, professional)
         
-        # Create match
+        # Create match and its score details in one flush
         match = Match(
+            id=uuid4(),
             project_id=project_id,
             professional_id=professional_id,
             match_score=score_data["total_score"],
             status=MatchStatus.PENDING
         )
         
-        db.add(match)
-        await db.commit()
-        await db.refresh(match)
-        
-        # Create match score details
         match_score = MatchScore(
             match_id=match.id,
             project_type_score=score_data["project_type_score"],
@@ -328,8 +395,8 @@ class MatchingService:
             total_score=score_data["total_score"]
         )
         
-        db.add(match_score)
-        await db.commit()
+        db.add_all([match, match_score])
+        await db.flush()
         
         return match
     
@@ -338,100 +405,415 @@ class MatchingService:
         db: AsyncSession,
         project_id: UUID
     ) -> List[Match]:
-        """Match a project to all suitable professionals"""
-        # Get project
+        """
+        Match a project to all suitable professionals
+        
+        Candidates, their capabilities and pricing tiers and the property's PID
+        verifications are loaded in a fixed number of queries, scored in memory,
+        and written with one multi-row insert per table. Professionals whose
+        geolocated service areas cannot reach a geolocated plot are not scored.
+        Nothing is committed; the job worker commits with the job's status.
+        """
+        # Get project with its property
         project_result = await db.execute(
-            select(Project).where(Project.id == project_id)
+            select(Project)
+            .options(joinedload(Project.property))
+            .where(Project.id == project_id)
         )
         project = project_result.scalar_one_or_none()
         if not project:
             raise NotFoundError("Project", str(project_id))
         
-        # Get all professionals with matching capabilities
-        capability_type_map = {
-            ProjectType.CONTRACT_CONSTRUCTION: CapabilityType.CONSTRUCTION,
-            ProjectType.INTERIOR: CapabilityType.INTERIOR,
-            ProjectType.RECONSTRUCTION: CapabilityType.RECONSTRUCTION,
-            ProjectType.JV_JD: CapabilityType.JV_JD,
-        }
-        required_capability = capability_type_map.get(project.project_type)
+        property_obj = project.property
+        plot_coordinates = MatchingService.plot_coordinates(property_obj)
         
-        if required_capability:
-            professionals_result = await db.execute(
-                select(ProfessionalProfile)
-                .join(Capability)
-                .where(Capability.capability_type == required_capability)
+        required_capability = PROJECT_CAPABILITY_MAP.get(project.project_type)
+        if settings.candidate_index_enabled:
+            arrays = await MatchingService._candidate_arrays_from_index(
+                db, project_id, required_capability, plot_coordinates
             )
         else:
-            professionals_result = await db.execute(select(ProfessionalProfile))
+            arrays = await MatchingService._candidate_arrays_from_db(
+                db, project_id, required_capability
+            )
         
-        professionals = list(professionals_result.scalars().all())
+        # Exact distance check on whatever the grid (or the DB) let through
+        scoring_capability = required_capability or CapabilityType.CONSTRUCTION
+        arrays = arrays.take(
+            ScoringKernel.reachable_rows(arrays, plot_coordinates, scoring_capability)
+        )
+        if not len(arrays):
+            return []
         
-        # Create matches
-        matches = []
-        for professional in professionals:
-            # Check if match already exists
-            existing_result = await db.execute(
-                select(Match).where(
+        pid_result = await db.execute(
+            select(PIDVerification).where(PIDVerification.property_id == property_obj.id)
+        )
+        pid_verifications = list(pid_result.scalars().all())
+        
+        # Score every candidate in one vectorized pass
+        scores = ScoringKernel.score(
+            arrays,
+            project.project_type,
+            property_obj.city,
+            property_obj.plot_area_sqft,
+            MatchingService.calculate_verification_score(property_obj, pid_verifications),
+            scoring_capability,
+            plot_coordinates
+        )
+        component_columns = {name: column.tolist() for name, column in scores.items()}
+        
+        now = datetime.utcnow()
+        match_rows = []
+        score_rows = []
+        for row, professional_id in enumerate(arrays.professional_ids):
+            score_data = {name: column[row] for name, column in component_columns.items()}
+            match_id = uuid4()
+            match_rows.append({
+                "id": match_id,
+                "project_id": project_id,
+                "professional_id": professional_id,
+                "match_score": score_data["total_score"],
+                "status": MatchStatus.PENDING,
+                "created_at": now,
+                "updated_at": now
+            })
+            score_rows.append({
+                "id": uuid4(),
+                "match_id": match_id,
+                "created_at": now,
+                **score_data
+            })
+        
+        inserted_ids = await MatchingService._insert_matches(db, match_rows)
+        score_rows = [row for row in score_rows if row["match_id"] in inserted_ids]
+        if score_rows:
+            await db.execute(insert(MatchScore), score_rows)
+        
+        if not inserted_ids:
+            return []
+        matches_result = await db.execute(
+            select(Match).where(Match.id.in_(inserted_ids))
+        )
+        return list(matches_result.scalars().all())
+    
+    @staticmethod
+    async def _candidate_arrays_from_index(
+        db: AsyncSession,
+        project_id: UUID,
+        required_capability: Optional[CapabilityType],
+        plot_coordinates: Optional[Tuple[float, float]] = None
+    ) -> CandidateArrays:
+        """Unmatched candidates from the in-memory candidate index"""
+        candidates = await candidate_index.candidates(
+            db, required_capability, plot_coordinates=plot_coordinates
+        )
+        matched_result = await db.execute(
+            select(Match.professional_id).where(Match.project_id == project_id)
+        )
+        matched_ids = set(matched_result.scalars().all())
+        return ScoringKernel.build_arrays_from_candidates([
+            candidate for candidate in candidates
+            if candidate.professional_id not in matched_ids
+        ])
+    
+    @staticmethod
+    async def _candidate_arrays_from_db(
+        db: AsyncSession,
+        project_id: Optional[UUID],
+        required_capability: Optional[CapabilityType]
+    ) -> CandidateArrays:
+        """
+        Candidates not yet matched to the project, loaded straight from the
+        database; every candidate when project_id is None
+        """
+        # Filtering through a subquery keeps one row per profile even when a
+        # professional has several capability rows.
+        candidate_ids = select(ProfessionalProfile.id)
+        if project_id is not None:
+            candidate_ids = candidate_ids.where(
+                ~exists().where(
                     and_(
                         Match.project_id == project_id,
-                        Match.professional_id == professional.id
+                        Match.professional_id == ProfessionalProfile.id
                     )
                 )
             )
-            if existing_result.scalar_one_or_none():
-                continue
-            
-            match = await MatchingService.create_match(db, project_id, professional.id)
-            matches.append(match)
+        if required_capability:
+            candidate_ids = candidate_ids.where(
+                ProfessionalProfile.id.in_(
+                    select(Capability.professional_id)
+                    .where(Capability.capability_type == required_capability)
+                )
+            )
+        candidate_ids = candidate_ids.scalar_subquery()
+        
+        professionals_result = await db.execute(
+            select(ProfessionalProfile).where(ProfessionalProfile.id.in_(candidate_ids))
+        )
+        professionals = list(professionals_result.scalars().all())
+        if not professionals:
+            return ScoringKernel.build_arrays([], {}, {})
+        
+        capabilities_result = await db.execute(
+            select(Capability).where(Capability.professional_id.in_(candidate_ids))
+        )
+        capabilities_by_professional = defaultdict(list)
+        for capability in capabilities_result.scalars().all():
+            capabilities_by_professional[capability.professional_id].append(capability)
         
-        return matches
+        pricing_result = await db.execute(
+            select(PricingTier).where(PricingTier.professional_id.in_(candidate_ids))
+        )
+        pricing_by_professional = defaultdict(list)
+        for tier in pricing_result.scalars().all():
+            pricing_by_professional[tier.professional_id].append(tier)
+        
+        locations_result = await db.execute(
+            select(LocationPreference).where(
+                and_(
+                    LocationPreference.professional_id.in_(candidate_ids),
+                    LocationPreference.latitude.is_not(None),
+                    LocationPreference.longitude.is_not(None)
+                )
+            )
+        )
+        locations_by_professional = defaultdict(list)
+        for location in locations_result.scalars().all():
+            locations_by_professional[location.professional_id].append(location)
+        
+        return ScoringKernel.build_arrays(
+            professionals,
+            capabilities_by_professional,
+            pricing_by_professional,
+            locations_by_professional
+        )
+    
+    @staticmethod
+    async def _insert_matches(
+        db: AsyncSession,
+        match_rows: List[dict]
+    ) -> Set[UUID]:
+        """
+        Insert Match rows in one statement, skipping (project_id, professional_id)
+        pairs that already exist. Returns the ids that were actually written.
+        """
+        if not match_rows:
+            return set()
+        
+        dialect = db.bind.dialect
+        stmt = insert_ignore_conflicts(Match.__table__, dialect.name)
+        
+        if dialect.insert_executemany_returning:
+            result = await db.execute(stmt.returning(Match.id), match_rows)
+            return set(result.scalars().all())
+        
+        # No RETURNING support (MySQL): read back which of our ids landed
+        await db.execute(stmt, match_rows)
+        written_result = await db.execute(
+            select(Match.id).where(Match.id.in_([row["id"] for row in match_rows]))
+        )
+        return set(written_result.scalars().all())
     
     @staticmethod
     async def get_project_matches(
         db: AsyncSession,
         project_id: UUID,
-        limit: int = 10
-    ) -> List[Match]:
-        """Get matches for a project, sorted by score"""
+        limit: int = 10,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Match], Optional[str]]:
+        """
+        Get a page of matches for a project, best first
+        Returns the matches and the cursor for the next page (None on the last page)
+        """
+        return await MatchingService._match_page(
+            db, Match.project_id == project_id, limit, cursor
+        )
+    
+    @staticmethod
+    async def count_project_matches(
+        db: AsyncSession,
+        project_ids: List[UUID]
+    ) -> Dict[UUID, Dict[MatchStatus, int]]:
+        """Match counts by status for each project, in one grouped query"""
+        counts: Dict[UUID, Dict[MatchStatus, int]] = defaultdict(dict)
+        if not project_ids:
+            return counts
         result = await db.execute(
-            select(Match)
-            .where(Match.project_id == project_id)
-            .order_by(Match.match_score.desc())
-            .limit(limit)
+            select(Match.project_id, Match.status, func.count(Match.id))
+            .where(Match.project_id.in_(project_ids))
+            .group_by(Match.project_id, Match.status)
         )
-        return list(result.scalars().all())
+        for project_id, match_status, count in result.all():
+            counts[project_id][match_status] = count
+        return counts
     
     @staticmethod
     async def get_professional_matches(
         db: AsyncSession,
         professional_id: UUID,
-        limit: int = 10
-    ) -> List[Match]:
-        """Get matches for a professional, sorted by score"""
-        result = await db.execute(
+        limit: int = 10,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Match], Optional[str]]:
+        """
+        Get a page of matches for a professional, best first
+        Returns the matches and the cursor for the next page (None on the last page)
+        """
+        return await MatchingService._match_page(
+            db, Match.professional_id == professional_id, limit, cursor
+        )
+    
+    @staticmethod
+    async def _match_page(
+        db: AsyncSession,
+        owner_filter,
+        limit: int,
+        cursor: Optional[str]
+    ) -> Tuple[List[Match], Optional[str]]:
+        """
+        Keyset page ordered by (match_score DESC, id DESC)
+        Served by the (owner, match_score DESC, id DESC) composite indexes
+        """
+        query = (
             select(Match)
-            .where(Match.professional_id == professional_id)
-            .order_by(Match.match_score.desc())
-            .limit(limit)
+            .options(selectinload(Match.match_score_details))
+            .where(owner_filter)
         )
-        return list(result.scalars().all())
+        if cursor:
+            after_score, after_id = decode_score_cursor(cursor)
+            query = query.where(
+                or_(
+                    Match.match_score < after_score,
+                    and_(Match.match_score == after_score, Match.id < after_id)
+                )
+            )
+        
+        # One extra row tells whether another page exists
+        result = await db.execute(
+            query
+            .order_by(Match.match_score.desc(), Match.id.desc())
+            .limit(limit + 1)
+        )
+        matches = list(result.scalars().all())
+        
+        next_cursor = None
+        if len(matches) > limit:
+            matches = matches[:limit]
+            next_cursor = encode_score_cursor(matches[-1].match_score, matches[-1].id)
+        return matches, next_cursor
     
     @staticmethod
-    async def accept_match(
+    async def preview_top_matches(
+        db: AsyncSession,
+        project_id: UUID,
+        k: int = 10
+    ) -> List[dict]:
+        """
+        Score every candidate for a project without persisting anything and
+        return the best k, highest first
+        
+        Candidates are scored in chunks; a k-sized min-heap keeps the running
+        best, so only k score breakdowns are ever materialized.
+        """
+        project_result = await db.execute(
+            select(Project)
+            .options(joinedload(Project.property))
+            .where(Project.id == project_id)
+        )
+        project = project_result.scalar_one_or_none()
+        if not project:
+            raise NotFoundError("Project", str(project_id))
+        
+        property_obj = project.property
+        plot_coordinates = MatchingService.plot_coordinates(property_obj)
+        required_capability = PROJECT_CAPABILITY_MAP.get(project.project_type)
+        scoring_capability = required_capability or CapabilityType.CONSTRUCTION
+        
+        pid_result = await db.execute(
+            select(PIDVerification).where(PIDVerification.property_id == property_obj.id)
+        )
+        verification_score = MatchingService.calculate_verification_score(
+            property_obj, list(pid_result.scalars().all())
+        )
+        
+        if settings.candidate_index_enabled:
+            candidates = await candidate_index.candidates(
+                db, required_capability, plot_coordinates=plot_coordinates
+            )
+            chunks = (
+                ScoringKernel.build_arrays_from_candidates(candidates[start:start + TOP_K_CHUNK_SIZE])
+                for start in range(0, len(candidates), TOP_K_CHUNK_SIZE)
+            )
+        else:
+            # The rows are loaded in full anyway, so score them in one pass
+            chunks = [await MatchingService._candidate_arrays_from_db(db, None, required_capability)]
+        
+        # ((total_score, professional id), breakdown); worst of the best k on top
+        heap: List[tuple] = []
+        for arrays in chunks:
+            arrays = arrays.take(
+                ScoringKernel.reachable_rows(arrays, plot_coordinates, scoring_capability)
+            )
+            if not len(arrays):
+                continue
+            
+            scores = ScoringKernel.score(
+                arrays,
+                project.project_type,
+                property_obj.city,
+                property_obj.plot_area_sqft,
+                verification_score,
+                scoring_capability,
+                plot_coordinates
+            )
+            total_scores = scores["total_score"]
+            
+            # Skip rows that cannot displace anything once the heap is full
+            rows = np.arange(len(arrays))
+            if len(heap) == k:
+                rows = rows[total_scores >= heap[0][0][0]]
+            
+            for row in rows.tolist():
+                key = (float(total_scores[row]), str(arrays.professional_ids[row]))
+                if len(heap) == k and key <= heap[0][0]:
+                    continue
+                breakdown = {name: float(column[row]) for name, column in scores.items()}
+                breakdown["professional_id"] = arrays.professional_ids[row]
+                if len(heap) < k:
+                    heapq.heappush(heap, (key, breakdown))
+                else:
+                    heapq.heapreplace(heap, (key, breakdown))
+        
+        return [breakdown for _, breakdown in sorted(heap, key=lambda item: item[0], reverse=True)]
+    
+    @staticmethod
+    async def _get_match(
         db: AsyncSession,
         match_id: UUID
     ) -> Match:
-        """Accept a match"""
-        result = await db.execute(select(Match).where(Match.id == match_id))
+        """Get a match with its score breakdown loaded"""
+        result = await db.execute(
+            select(Match)
+            .options(selectinload(Match.match_score_details))
+            .where(Match.id == match_id)
+            .execution_options(populate_existing=True)
+        )
         match = result.scalar_one_or_none()
         
         if not match:
             raise NotFoundError("Match", str(match_id))
         
+        return match
+    
+    @staticmethod
+    async def accept_match(
+        db: AsyncSession,
+        match_id: UUID
+    ) -> Match:
+        """Accept a match"""
+        match = await MatchingService._get_match(db, match_id)
+        
         match.status = MatchStatus.ACCEPTED
-        await db.commit()
-        await db.refresh(match)
+        await db.flush()
         
         return match
     
@@ -441,14 +823,9 @@ class MatchingService:
         match_id: UUID
     ) -> Match:
         """Reject a match"""
-        result = await db.execute(select(Match).where(Match.id == match_id))
-        match = result.scalar_one_or_none()
-        
-        if not match:
-            raise NotFoundError("Match", str(match_id))
+        match = await MatchingService._get_match(db, match_id)
         
         match.status = MatchStatus.REJECTED
-        await db.commit()
-        await db.refresh(match)
+        await db.flush()
         
         return match
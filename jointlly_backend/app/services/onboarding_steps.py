@@ -0,0 +1,440 @@
+"""
+Declarative onboarding step pipeline
+
+Every (capability type, step number) maps to a handler that copies scalar
+fields onto the already-loaded profile and collects the step's child rows
+in an OnboardingBatch. Nothing touches the database until write_batch,
+which diffs those rows against the stored ones by natural key, so a step
+costs the same number of queries however many portfolio items, locations
+or pricing tiers it submits, and re-submitting it writes nothing new.
+"""
+from dataclasses import dataclass, field
+from datetime import date
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.exceptions import ValidationError
+from app.models.professional import (
+    ProfessionalProfile,
+    License,
+    Portfolio,
+    LocationPreference,
+    SubcontractorScope,
+    ProjectSizeCategory as ProjectSizeCategoryModel,
+    ProfessionalPricing,
+    JVJDPreferences,
+    ReconstructionWorkType as ReconstructionWorkTypeModel
+)
+from app.utils.constants import (
+    CapabilityType, ProjectIntent, PricingTierType,
+    ProjectSizeCategory as ProjectSizeCategoryEnum,
+    ReconstructionWorkType as ReconstructionWorkTypeEnum
+)
+
+TOTAL_STEPS = {
+    CapabilityType.CONSTRUCTION: 7,
+    CapabilityType.JV_JD: 8,
+    CapabilityType.INTERIOR: 5,
+    CapabilityType.RECONSTRUCTION: 6,
+}
+DEFAULT_TOTAL_STEPS = 5
+
+# A submitted row with the same natural key as a stored one updates it in place
+NATURAL_KEYS = {
+    License: ("license_number",),
+    Portfolio: ("project_name",),
+    LocationPreference: ("capability_type", "location_name"),
+    SubcontractorScope: ("capability_type", "scope_type"),
+    ProjectSizeCategoryModel: ("capability_type", "size_category", "wallet_size_range"),
+    ProfessionalPricing: ("capability_type", "project_type", "pricing_tier"),
+    JVJDPreferences: ("professional_id",),
+    ReconstructionWorkTypeModel: ("work_type",),
+}
+
+RowScope = Callable[[Any], bool]
+
+
+@dataclass
+class OnboardingBatch:
+    """Child rows collected by one onboarding step, per model"""
+    professional_id: UUID
+    capability_type: CapabilityType
+    rows: Dict[type, List[Dict[str, Any]]] = field(default_factory=dict)
+    owned: Dict[type, List[Optional[RowScope]]] = field(default_factory=dict)
+
+    def add(self, model: type, **values: Any) -> None:
+        self.rows.setdefault(model, []).append({"professional_id": self.professional_id, **values})
+
+    def owns(self, model: type, scope: Optional[RowScope] = None) -> None:
+        """
+        The step submits the whole set of model rows for its capability
+        (narrowed by scope); stored rows it no longer submits are deleted
+        """
+        self.owned.setdefault(model, []).append(scope)
+
+    def owns_row(self, model: type, row: Any) -> bool:
+        if hasattr(model, "capability_type") and row.capability_type != self.capability_type:
+            return False
+        return any(scope is None or scope(row) for scope in self.owned.get(model, ()))
+
+
+@dataclass
+class WriteCounts:
+    """Rows written (or skipped as unchanged) for one child table"""
+    inserted: int = 0
+    updated: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+
+    @property
+    def net(self) -> int:
+        return self.inserted - self.deleted
+
+    @property
+    def written(self) -> int:
+        return self.inserted + self.updated + self.deleted
+
+
+StepHandler = Callable[[ProfessionalProfile, dict, OnboardingBatch], None]
+
+
+def _key_part(value: Any) -> Any:
+    # Enum values arrive as plain strings in the step data
+    return value.value if isinstance(value, Enum) else value
+
+
+def _same(stored: Any, submitted: Any) -> bool:
+    if stored == submitted or _key_part(stored) == _key_part(submitted):
+        return True
+    # ISO dates arrive as plain strings in the step data
+    return isinstance(stored, date) and submitted == stored.isoformat()
+
+
+async def write_batch(db: AsyncSession, batch: OnboardingBatch) -> Dict[type, WriteCounts]:
+    """
+    Diff the step's rows against the stored ones by natural key
+    Unchanged rows are not written, changed ones are updated in place and
+    new ones inserted with one multi-row INSERT per table. Stored
+    duplicates of a submitted key, and rows of an owned set the step no
+    longer submits, are deleted. A step submitting one key twice is
+    rejected.
+    """
+    counts: Dict[type, WriteCounts] = {}
+    for model in dict.fromkeys([*batch.rows, *batch.owned]):
+        key_columns = NATURAL_KEYS[model]
+        table_counts = counts[model] = WriteCounts()
+
+        submitted: Dict[tuple, Dict[str, Any]] = {}
+        for row in batch.rows.get(model, ()):
+            key = tuple(_key_part(row.get(column)) for column in key_columns)
+            if key in submitted:
+                raise ValidationError(
+                    f"Duplicate {model.__tablename__} entry: "
+                    + ", ".join(f"{column}={part}" for column, part in zip(key_columns, key))
+                )
+            submitted[key] = row
+
+        result = await db.execute(select(model).where(model.professional_id == batch.professional_id))
+        kept = set()
+        for stored in result.scalars().all():
+            key = tuple(_key_part(getattr(stored, column)) for column in key_columns)
+            row = submitted.get(key)
+            if row is None or key in kept:
+                if key in kept or batch.owns_row(model, stored):
+                    await db.delete(stored)
+                    table_counts.deleted += 1
+                continue
+            kept.add(key)
+            changed = {
+                name: value for name, value in row.items() if not _same(getattr(stored, name), value)
+            }
+            if changed:
+                for name, value in changed.items():
+                    setattr(stored, name, value)
+                table_counts.updated += 1
+            else:
+                table_counts.unchanged += 1
+
+        new_rows = [row for key, row in submitted.items() if key not in kept]
+        if new_rows:
+            # render_nulls keeps rows with and without optional values in one statement
+            await db.execute(insert(model).execution_options(render_nulls=True), new_rows)
+            table_counts.inserted = len(new_rows)
+    return counts
+
+
+# ---------- shared pieces ----------
+
+def _copy_fields(profile: ProfessionalProfile, data: dict, names: Iterable[str]) -> None:
+    for name in names:
+        if name in data:
+            setattr(profile, name, data[name])
+
+
+def _add_license(data: dict, batch: OnboardingBatch, issuing_authority: str = None) -> None:
+    if data.get("builder_license"):
+        batch.add(
+            License,
+            license_number=data["builder_license"],
+            issuing_authority=issuing_authority
+        )
+
+
+def _add_locations(data: dict, batch: OnboardingBatch) -> None:
+    if "location_preferences" in data:
+        batch.owns(LocationPreference)
+    for location in data.get("location_preferences", []):
+        location = {"location_name": location} if isinstance(location, str) else location
+        batch.add(
+            LocationPreference,
+            location_name=location.get("location_name"),
+            radius_km=location.get("radius_km"),
+            latitude=location.get("latitude"),
+            longitude=location.get("longitude"),
+            capability_type=batch.capability_type
+        )
+
+
+def _add_portfolio(projects: List[dict], max_images: int, batch: OnboardingBatch) -> None:
+    for project in projects:
+        batch.add(
+            Portfolio,
+            project_name=project.get("project_name"),
+            location=project.get("location"),
+            area_sqft=project.get("area_sqft"),
+            completion_date=project.get("completion_date"),
+            duration_months=project.get("duration_months"),
+            images=project.get("images", [])[:max_images],
+            description=project.get("description")
+        )
+
+
+def _add_scopes(data: dict, batch: OnboardingBatch) -> None:
+    if "subcontractor_scopes" in data:
+        batch.owns(SubcontractorScope)
+    for scope_type in data.get("subcontractor_scopes", []):
+        batch.add(
+            SubcontractorScope,
+            scope_type=scope_type,
+            capability_type=batch.capability_type
+        )
+
+
+def _add_project_size(data: dict, batch: OnboardingBatch) -> None:
+    if "typical_project_size" in data:
+        batch.owns(ProjectSizeCategoryModel, lambda row: row.wallet_size_range is None)
+        batch.add(
+            ProjectSizeCategoryModel,
+            capability_type=batch.capability_type,
+            size_category=data["typical_project_size"]
+        )
+
+
+def _add_custom_pricing(custom_pricing: dict, batch: OnboardingBatch) -> None:
+    batch.add(
+        ProfessionalPricing,
+        capability_type=batch.capability_type,
+        custom_pricing=custom_pricing
+    )
+
+
+# ---------- Contract Construction ----------
+
+def _construction_company(profile, data, batch):
+    _copy_fields(profile, data, ("company_name", "experience_years", "office_address", "google_maps_location"))
+    _add_license(data, batch, issuing_authority="KPWD or equivalent")
+    if data.get("rera_registration"):
+        profile.rera_experience = True
+
+
+def _construction_locations(profile, data, batch):
+    _add_locations(data, batch)
+
+
+def _construction_portfolio(profile, data, batch):
+    _copy_fields(profile, data, ("total_projects_completed",))
+    _add_portfolio(data.get("portfolio_projects", [])[:5], 5, batch)
+
+
+def _construction_scopes(profile, data, batch):
+    _add_scopes(data, batch)
+
+
+def _construction_project_size(profile, data, batch):
+    _add_project_size(data, batch)
+
+
+def _construction_pricing(profile, data, batch):
+    if any(key in data for key in ("residential_pricing", "commercial_pricing", "industrial_pricing")):
+        batch.owns(ProfessionalPricing)
+    for project_type, key in [
+        (ProjectIntent.RESIDENTIAL, "residential_pricing"),
+        (ProjectIntent.COMMERCIAL, "commercial_pricing"),
+        (ProjectIntent.INDUSTRIAL, "industrial_pricing")
+    ]:
+        pricing_data = data.get(key, {})
+        for tier_name, tier_key in [
+            (PricingTierType.BASIC_REGULAR, "basic_regular"),
+            (PricingTierType.STANDARD, "standard"),
+            (PricingTierType.LUXURY, "luxury")
+        ]:
+            if pricing_data.get(tier_key):
+                batch.add(
+                    ProfessionalPricing,
+                    capability_type=batch.capability_type,
+                    project_type=project_type,
+                    pricing_tier=tier_name,
+                    price_per_sqft=pricing_data[tier_key]
+                )
+
+
+# ---------- JV/JD Developer ----------
+
+def _jvjd_company(profile, data, batch):
+    _copy_fields(
+        profile, data,
+        ("company_name", "experience_years", "business_entity_type", "office_address", "google_maps_location")
+    )
+
+
+def _jvjd_registrations(profile, data, batch):
+    _add_license(data, batch)
+    if data.get("rera_registration"):
+        profile.rera_experience = True
+    _copy_fields(profile, data, ("gst_number",))
+
+
+def _jvjd_portfolio(profile, data, batch):
+    _copy_fields(profile, data, ("total_projects_completed",))
+    _add_portfolio(data.get("recent_projects", [])[:3], 2, batch)
+
+
+def _jvjd_scopes(profile, data, batch):
+    _add_scopes(data, batch)
+    _add_project_size(data, batch)
+
+
+def _jvjd_wallet(profile, data, batch):
+    if "rera_registered_projects_count" in data:
+        profile.rera_project_count = data["rera_registered_projects_count"]
+    if "wallet_size_range" in data:
+        batch.owns(ProjectSizeCategoryModel, lambda row: row.wallet_size_range is not None)
+        batch.add(
+            ProjectSizeCategoryModel,
+            capability_type=batch.capability_type,
+            size_category=ProjectSizeCategoryEnum.CUSTOM,
+            wallet_size_range=data["wallet_size_range"]
+        )
+
+
+def _jvjd_locations(profile, data, batch):
+    _add_locations(data, batch)
+    _copy_fields(profile, data, ("team_size_category",))
+
+
+def _jvjd_preferences(profile, data, batch):
+    batch.add(
+        JVJDPreferences,
+        preferred_jv_models=[
+            model.value if hasattr(model, "value") else str(model)
+            for model in data.get("preferred_jv_models", [])
+        ],
+        rera_registered_projects_count=profile.rera_project_count
+    )
+
+
+# ---------- Interior Designer ----------
+
+def _interior_company(profile, data, batch):
+    _copy_fields(profile, data, ("company_name", "experience_years", "office_address", "google_maps_location"))
+
+
+def _interior_portfolio(profile, data, batch):
+    _add_portfolio(data.get("recent_projects", [])[:3], 2, batch)
+
+
+def _interior_pricing(profile, data, batch):
+    tentative = data.get("tentative_pricing", {})
+    _add_custom_pricing({
+        "flat_1200_sft": tentative.get("flat_1200_sft"),
+        "duplex_1500_sft": tentative.get("duplex_1500_sft"),
+        "commercial_1800_sft": tentative.get("commercial_1800_sft"),
+        "other": tentative.get("other")
+    }, batch)
+
+
+def _interior_locations(profile, data, batch):
+    _add_locations(data, batch)
+
+
+# ---------- Reconstruction ----------
+
+def _reconstruction_company(profile, data, batch):
+    _copy_fields(
+        profile, data,
+        (
+            "company_name", "experience_years", "business_entity_type", "office_address",
+            "google_maps_location", "gst_number"
+        )
+    )
+    _add_license(data, batch)
+
+
+def _reconstruction_locations(profile, data, batch):
+    _add_locations(data, batch)
+
+
+def _reconstruction_experience(profile, data, batch):
+    _copy_fields(profile, data, ("total_projects_completed",))
+
+
+def _reconstruction_scopes(profile, data, batch):
+    _add_scopes(data, batch)
+    _add_project_size(data, batch)
+
+
+def _reconstruction_work_types(profile, data, batch):
+    if "work_type_preferences" in data:
+        batch.owns(ReconstructionWorkTypeModel)
+    for work_type in data.get("work_type_preferences", []):
+        batch.add(
+            ReconstructionWorkTypeModel,
+            work_type=work_type,
+            custom_description=(
+                data.get("custom_work_description") if work_type == ReconstructionWorkTypeEnum.CUSTOM else None
+            )
+        )
+
+
+def _reconstruction_pricing(profile, data, batch):
+    if "tentative_pricing" in data:
+        _add_custom_pricing({"tentative_pricing": data["tentative_pricing"]}, batch)
+
+
+ONBOARDING_STEPS: Dict[Tuple[CapabilityType, int], StepHandler] = {
+    (CapabilityType.CONSTRUCTION, 1): _construction_company,
+    (CapabilityType.CONSTRUCTION, 3): _construction_locations,
+    (CapabilityType.CONSTRUCTION, 4): _construction_portfolio,
+    (CapabilityType.CONSTRUCTION, 5): _construction_scopes,
+    (CapabilityType.CONSTRUCTION, 6): _construction_project_size,
+    (CapabilityType.CONSTRUCTION, 7): _construction_pricing,
+    (CapabilityType.JV_JD, 1): _jvjd_company,
+    (CapabilityType.JV_JD, 2): _jvjd_registrations,
+    (CapabilityType.JV_JD, 4): _jvjd_portfolio,
+    (CapabilityType.JV_JD, 5): _jvjd_scopes,
+    (CapabilityType.JV_JD, 6): _jvjd_wallet,
+    (CapabilityType.JV_JD, 7): _jvjd_locations,
+    (CapabilityType.JV_JD, 8): _jvjd_preferences,
+    (CapabilityType.INTERIOR, 1): _interior_company,
+    (CapabilityType.INTERIOR, 3): _interior_portfolio,
+    (CapabilityType.INTERIOR, 4): _interior_pricing,
+    (CapabilityType.INTERIOR, 5): _interior_locations,
+    (CapabilityType.RECONSTRUCTION, 1): _reconstruction_company,
+    (CapabilityType.RECONSTRUCTION, 2): _reconstruction_locations,
+    (CapabilityType.RECONSTRUCTION, 3): _reconstruction_experience,
+    (CapabilityType.RECONSTRUCTION, 4): _reconstruction_scopes,
+    (CapabilityType.RECONSTRUCTION, 5): _reconstruction_work_types,
+    (CapabilityType.RECONSTRUCTION, 6): _reconstruction_pricing,
+}
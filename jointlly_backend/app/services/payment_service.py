@@ -1,26 +1,36 @@
 """
 Payment service with Razorpay integration
+
+A transaction is committed as PENDING, in its own short session, before
+its Razorpay order is created, so every order Razorpay knows about has a
+local row carrying its receipt. The order id is attached in the caller's
+unit of work; if that never commits, reconcile_pending_orders finds the
+order by receipt later. Failures that must outlive the rolled-back request
+are recorded the same way, in a session of their own.
 """
-from uuid import UUID
+import logging
+from datetime import datetime, timedelta
+from uuid import UUID, uuid4
 from typing import Optional
-import razorpay
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
 from app.config import settings
+from app.database import AsyncSessionLocal
 from app.models.payment import Transaction, Payment
 from app.models.user import User
+from app.services.razorpay_gateway import RazorpayGateway, razorpay_gateway
 from app.utils.constants import TransactionType, TransactionStatus
 from app.exceptions import NotFoundError, ValidationError
 
+logger = logging.getLogger(__name__)
+
 
 class PaymentService:
     """Service for payment operations with Razorpay"""
     
-    def __init__(self):
-        """Initialize Razorpay client"""
-        self.client = razorpay.Client(
-            auth=(settings.razorpay_key_id, settings.razorpay_key_secret)
-        )
+    def __init__(self, gateway: Optional[RazorpayGateway] = None):
+        """Use the shared async Razorpay gateway unless one is given"""
+        self.gateway = gateway or razorpay_gateway
     
     async def create_order(
         self,
@@ -32,8 +42,8 @@ class PaymentService:
         currency: str = "INR"
     ) -> dict:
         """Create Razorpay order"""
-        # Create transaction record
         transaction = Transaction(
+            id=uuid4(),
             user_id=user_id,
             project_id=project_id,
             transaction_type=transaction_type,
@@ -41,16 +51,16 @@ class PaymentService:
             currency=currency,
             status=TransactionStatus.PENDING
         )
-        
-        db.add(transaction)
-        await db.commit()
-        await db.refresh(transaction)
+        # Durable before Razorpay hears of it; no connection is held while Razorpay responds
+        async with AsyncSessionLocal() as session:
+            session.add(transaction)
+            await session.commit()
         
         # Create Razorpay order
         order_data = {
             "amount": int(amount * 100),  # Convert to paise
             "currency": currency,
-            "receipt": f"txn_{transaction.id}",
+            "receipt": PaymentService.receipt(transaction.id),
             "notes": {
                 "transaction_id": str(transaction.id),
                 "transaction_type": transaction_type.value,
@@ -59,24 +69,24 @@ class PaymentService:
         }
         
         try:
-            razorpay_order = self.client.order.create(data=order_data)
-            
-            # Update transaction with order ID
-            transaction.razorpay_order_id = razorpay_order["id"]
-            await db.commit()
-            await db.refresh(transaction)
-            
-            return {
-                "transaction_id": str(transaction.id),
-                "order_id": razorpay_order["id"],
-                "amount": amount,
-                "currency": currency,
-                "razorpay_key_id": settings.razorpay_key_id
-            }
+            razorpay_order = await self.gateway.create_order(order_data)
         except Exception as e:
-            transaction.status = TransactionStatus.FAILED
-            await db.commit()
+            # An order that may exist stays PENDING for reconcile_pending_orders
+            if not getattr(e, "maybe_applied", False):
+                await PaymentService._record_status(transaction.id, TransactionStatus.FAILED)
             raise ValidationError(f"Failed to create Razorpay order: {str(e)}")
+        
+        db.add(transaction)
+        transaction.razorpay_order_id = razorpay_order["id"]
+        await db.flush()
+        
+        return {
+            "transaction_id": transaction.id,
+            "order_id": razorpay_order["id"],
+            "amount": amount,
+            "currency": currency,
+            "razorpay_key_id": settings.razorpay_key_id
+        }
     
     async def verify_payment(
         self,
@@ -99,83 +109,85 @@ class PaymentService:
             raise ValidationError("Transaction does not have a Razorpay order")
         
         # Verify signature
-        params_dict = {
-            "razorpay_order_id": transaction.razorpay_order_id,
-            "razorpay_payment_id": razorpay_payment_id,
-            "razorpay_signature": razorpay_signature
-        }
+        if not self.gateway.verify_payment_signature(
+            transaction.razorpay_order_id,
+            razorpay_payment_id,
+            razorpay_signature
+        ):
+            # Keep the failure even though the request errors out
+            await PaymentService._record_status(transaction.id, TransactionStatus.FAILED)
+            raise ValidationError("Payment signature verification failed")
+        
+        # Update transaction and create the payment record in one flush
+        transaction.razorpay_payment_id = razorpay_payment_id
+        transaction.razorpay_signature = razorpay_signature
+        transaction.status = TransactionStatus.SUCCESS
+        db.add(Payment(
+            transaction_id=transaction.id,
+            payment_method="razorpay",
+            status="success",
+            payment_metadata={"razorpay_payment_id": razorpay_payment_id}
+        ))
         
         try:
-            self.client.utility.verify_payment_signature(params_dict)
-            
-            # Update transaction
-            transaction.razorpay_payment_id = razorpay_payment_id
-            transaction.razorpay_signature = razorpay_signature
-            transaction.status = TransactionStatus.SUCCESS
-            
-            await db.commit()
-            await db.refresh(transaction)
-            
-            # Create payment record
-            payment = Payment(
-                transaction_id=transaction.id,
-                payment_method="razorpay",
-                status="success",
-                payment_metadata={"razorpay_payment_id": razorpay_payment_id}
-            )
-            
-            db.add(payment)
-            await db.commit()
-            
-            return transaction
-        except razorpay.errors.SignatureVerificationError:
-            transaction.status = TransactionStatus.FAILED
-            await db.commit()
-            raise ValidationError("Payment signature verification failed")
+            await db.flush()
         except Exception as e:
-            transaction.status = TransactionStatus.FAILED
-            await db.commit()
+            # Release the failed flush's locks before recording the failure
+            await db.rollback()
+            await PaymentService._record_status(transaction_id, TransactionStatus.FAILED)
             raise ValidationError(f"Payment verification failed: {str(e)}")
+        
+        return transaction
     
-    async def handle_webhook(
+    async def reconcile_pending_orders(
         self,
         db: AsyncSession,
-        webhook_data: dict
-    ) -> Optional[Transaction]:
-        """Handle Razorpay webhook"""
-        # Verify webhook signature
-        webhook_signature = webhook_data.get("razorpay_signature")
-        if not webhook_signature:
-            return None
-        
-        # Get order ID from webhook
-        order_id = webhook_data.get("payload", {}).get("payment", {}).get("entity", {}).get("order_id")
-        if not order_id:
-            return None
-        
-        # Find transaction by order ID
+        older_than_seconds: float,
+        limit: int = 100
+    ) -> int:
+        """
+        Settle PENDING transactions whose order id was never stored
+        Each is looked up at Razorpay by receipt: a found order is attached,
+        so its webhooks match, and a missing one marks the transaction FAILED.
+        Returns the number of transactions settled.
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=older_than_seconds)
         result = await db.execute(
-            select(Transaction).where(Transaction.razorpay_order_id == order_id)
+            select(Transaction)
+            .where(
+                Transaction.status == TransactionStatus.PENDING,
+                Transaction.razorpay_order_id.is_(None),
+                Transaction.created_at < cutoff
+            )
+            .order_by(Transaction.created_at)
+            .limit(limit)
         )
-        transaction = result.scalar_one_or_none()
-        
-        if not transaction:
-            return None
-        
-        # Update transaction status based on webhook event
-        event = webhook_data.get("event")
-        if event == "payment.captured":
-            transaction.status = TransactionStatus.SUCCESS
-            payment_id = webhook_data.get("payload", {}).get("payment", {}).get("entity", {}).get("id")
-            if payment_id:
-                transaction.razorpay_payment_id = payment_id
-        elif event == "payment.failed":
-            transaction.status = TransactionStatus.FAILED
-        
-        await db.commit()
-        await db.refresh(transaction)
-        
-        return transaction
+        transactions = list(result.scalars().all())
+        for transaction in transactions:
+            order = await self.gateway.find_order_by_receipt(PaymentService.receipt(transaction.id))
+            if order is None:
+                transaction.status = TransactionStatus.FAILED
+            else:
+                transaction.razorpay_order_id = order["id"]
+                logger.warning("Attached Razorpay order %s to transaction %s", order["id"], transaction.id)
+        await db.flush()
+        return len(transactions)
+    
+    @staticmethod
+    def receipt(transaction_id: UUID) -> str:
+        """Razorpay receipt of a transaction's order"""
+        return f"txn_{transaction_id}"
+    
+    @staticmethod
+    async def _record_status(transaction_id: UUID, status: TransactionStatus) -> None:
+        """Commit a status in a session of its own, outside the request's unit of work"""
+        async with AsyncSessionLocal() as session:
+            await session.execute(
+                update(Transaction)
+                .where(Transaction.id == transaction_id)
+                .values(status=status, updated_at=datetime.utcnow())
+            )
+            await session.commit()
     
     async def get_transactions(
         self,
@@ -0,0 +1,120 @@
+"""
+Authenticated-user principal cache
+
+get_current_user only needs a user's id, role and active flag, plus the
+ids of the user's landowner and professional profiles, so it reads them
+from a process-local TTL + LRU cache instead of querying on every request.
+A miss loads all of them in one joined query. ORM updates and deletes of a
+User, and inserts and deletes of either profile, invalidate the entry at
+flush and again after commit; bulk statements bypass the ORM events and
+are only picked up when the entry expires.
+"""
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+from uuid import UUID
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from app.config import settings
+from app.models.user import User
+from app.models.landowner import LandownerProfile
+from app.models.professional import ProfessionalProfile
+from app.utils.constants import Role
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Snapshot of the authenticated user used for authorization"""
+    id: UUID
+    role: Role
+    is_active: bool
+    # None when the profile does not exist or was not resolved (token claims)
+    landowner_profile_id: Optional[UUID] = None
+    professional_profile_id: Optional[UUID] = None
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(id=user.id, role=user.role, is_active=user.is_active == "true")
+
+
+class PrincipalCache:
+    """TTL + LRU cache of principals keyed by user id"""
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[UUID, Tuple[float, Principal]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: UUID) -> Optional[Principal]:
+        """Cached principal, or None when missing or expired"""
+        entry = self._entries.get(user_id)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[user_id]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(user_id)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, principal: Principal) -> None:
+        """Cache a principal, evicting the least recently used entry when full"""
+        self._entries[principal.id] = (time.monotonic() + self.ttl_seconds, principal)
+        self._entries.move_to_end(principal.id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: UUID) -> None:
+        """Drop one user's entry"""
+        self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        """Drop every entry"""
+        self._entries.clear()
+
+    def metrics(self) -> dict:
+        """Size and hit counters"""
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+principal_cache = PrincipalCache(
+    ttl_seconds=settings.principal_cache_ttl_seconds,
+    max_entries=settings.principal_cache_max_entries
+)
+
+_PENDING_KEY = "principal_cache_invalidations"
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_changed_user(mapper, connection, target: User) -> None:
+    principal_cache.invalidate(target.id)
+    # A concurrent request may re-cache the old row before this commits
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_KEY, set()).add(target.id)
+
+
+@event.listens_for(LandownerProfile, "after_insert")
+@event.listens_for(LandownerProfile, "after_delete")
+@event.listens_for(ProfessionalProfile, "after_insert")
+@event.listens_for(ProfessionalProfile, "after_delete")
+def _invalidate_profile_owner(mapper, connection, target) -> None:
+    principal_cache.invalidate(target.user_id)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_KEY, set()).add(target.user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    for user_id in session.info.pop(_PENDING_KEY, ()):
+        principal_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
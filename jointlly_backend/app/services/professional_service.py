@@ -6,27 +6,27 @@ from typing import List, Optional
 from datetime import date
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.orm import selectinload
 from app.models.professional import (
     ProfessionalProfile,
     Capability,
     License,
     Portfolio,
     PricingTier,
-    LocationPreference,
-    SubcontractorScope,
-    ProjectSizeCategory as ProjectSizeCategoryModel,
-    ProfessionalPricing,
-    JVJDPreferences,
-    ReconstructionWorkType as ReconstructionWorkTypeModel
+    LocationPreference
 )
 from app.utils.constants import (
-    CapabilityType, ProjectType, ProjectIntent, TeamStructure,
-    TeamSizeCategory, ProjectSizeCategory as ProjectSizeCategoryEnum, WalletSizeRange,
-    PricingTierType, JVModelType, ReconstructionWorkType as ReconstructionWorkTypeEnum,
-    SubcontractorScopeType, OnboardingStatus, BusinessEntityType
+    CapabilityType, ProjectType, TeamStructure, TeamSizeCategory, WalletSizeRange,
+    JVModelType, SubcontractorScopeType, OnboardingStatus, BusinessEntityType, RescoreComponent
 )
 from app.exceptions import NotFoundError, ConflictError, ValidationError
 from app.services.credibility_service import CredibilityService
+from app.services.candidate_index import candidate_index
+from app.services.profile_cache import profile_cache
+from app.services.match_rescore_service import MatchRescoreService
+from app.services.onboarding_steps import (
+    ONBOARDING_STEPS, TOTAL_STEPS, DEFAULT_TOTAL_STEPS, OnboardingBatch, write_batch
+)
 
 
 class ProfessionalService:
@@ -68,10 +68,11 @@ class ProfessionalService:
             location_preferences=location_preferences,
             workforce_capacity=workforce_capacity
         )
+        CredibilityService.apply(profile)
         
         db.add(profile)
-        await db.commit()
-        await db.refresh(profile)
+        await db.flush()
+        candidate_index.mark_dirty_on_commit(db, profile.id)
         
         return profile
     
@@ -91,6 +92,35 @@ class ProfessionalService:
         
         return profile
     
+    @staticmethod
+    async def get_full_profile(
+        db: AsyncSession,
+        user_id: UUID
+    ) -> ProfessionalProfile:
+        """Get professional profile with every child collection, one query per collection"""
+        result = await db.execute(
+            select(ProfessionalProfile)
+            .where(ProfessionalProfile.user_id == user_id)
+            .options(
+                selectinload(ProfessionalProfile.capabilities),
+                selectinload(ProfessionalProfile.licenses),
+                selectinload(ProfessionalProfile.portfolio),
+                selectinload(ProfessionalProfile.pricing_tiers),
+                selectinload(ProfessionalProfile.location_preferences_detail),
+                selectinload(ProfessionalProfile.subcontractor_scopes),
+                selectinload(ProfessionalProfile.project_size_categories),
+                selectinload(ProfessionalProfile.professional_pricing),
+                selectinload(ProfessionalProfile.jv_jd_preferences),
+                selectinload(ProfessionalProfile.reconstruction_work_types)
+            )
+        )
+        profile = result.scalar_one_or_none()
+        
+        if not profile:
+            raise NotFoundError("ProfessionalProfile", str(user_id))
+        
+        return profile
+    
     @staticmethod
     async def update_profile(
         db: AsyncSession,
@@ -103,9 +133,15 @@ class ProfessionalService:
         for key, value in kwargs.items():
             if hasattr(profile, key) and value is not None:
                 setattr(profile, key, value)
+        CredibilityService.apply(profile)
+        
+        if kwargs.get("location_preferences") is not None:
+            await MatchRescoreService.mark_professional(
+                db, profile.id, [RescoreComponent.LOCATION]
+            )
         
-        await db.commit()
-        await db.refresh(profile)
+        await db.flush()
+        candidate_index.mark_dirty_on_commit(db, profile.id)
         
         return profile
     
@@ -124,8 +160,11 @@ class ProfessionalService:
         )
         
         db.add(capability)
-        await db.commit()
-        await db.refresh(capability)
+        await MatchRescoreService.mark_professional(
+            db, professional_id, [RescoreComponent.CAPABILITY]
+        )
+        await db.flush()
+        candidate_index.mark_dirty_on_commit(db, professional_id)
         
         return capability
     
@@ -159,8 +198,10 @@ class ProfessionalService:
         )
         
         db.add(license_obj)
-        await db.commit()
-        await db.refresh(license_obj)
+        profile = await db.get(ProfessionalProfile, professional_id)
+        if profile:
+            await CredibilityService.apply_count_changes(db, profile, license_delta=1)
+        await db.flush()
         
         return license_obj
     
@@ -200,8 +241,10 @@ class ProfessionalService:
         )
         
         db.add(portfolio)
-        await db.commit()
-        await db.refresh(portfolio)
+        profile = await db.get(ProfessionalProfile, professional_id)
+        if profile:
+            await CredibilityService.apply_count_changes(db, profile, portfolio_delta=1)
+        await db.flush()
         
         return portfolio
     
@@ -237,8 +280,11 @@ class ProfessionalService:
         )
         
         db.add(pricing_tier)
-        await db.commit()
-        await db.refresh(pricing_tier)
+        await MatchRescoreService.mark_professional(
+            db, professional_id, [RescoreComponent.PRICING]
+        )
+        await db.flush()
+        candidate_index.mark_dirty_on_commit(db, professional_id)
         
         return pricing_tier
     
@@ -275,8 +321,7 @@ class ProfessionalService:
         profile.onboarding_status = OnboardingStatus.IN_PROGRESS
         profile.onboarding_step = 1
         
-        await db.commit()
-        await db.refresh(profile)
+        await db.flush()
         
         return profile
     
@@ -290,12 +335,7 @@ class ProfessionalService:
         profile = await ProfessionalService.get_profile(db, user_id)
         
         # Determine total steps based on capability type
-        total_steps = {
-            CapabilityType.CONSTRUCTION: 7,
-            CapabilityType.JV_JD: 8,
-            CapabilityType.INTERIOR: 5,
-            CapabilityType.RECONSTRUCTION: 6,
-        }.get(capability_type, 5)
+        total_steps = TOTAL_STEPS.get(capability_type, DEFAULT_TOTAL_STEPS)
         
         return {
             "capability_type": capability_type.value,
@@ -309,47 +349,49 @@ class ProfessionalService:
     @staticmethod
     async def complete_onboarding_step(
         db: AsyncSession,
-        user_id: UUID,
+        profile: ProfessionalProfile,
         capability_type: CapabilityType,
         step_number: int,
         step_data: dict
     ) -> dict:
-        """Complete a specific onboarding step"""
-        profile = await ProfessionalService.get_profile(db, user_id)
-        
-        # Process step data based on capability type and step number
-        if capability_type == CapabilityType.CONSTRUCTION:
-            await ProfessionalService._process_construction_step(
-                db, profile.id, step_number, step_data
-            )
-        elif capability_type == CapabilityType.JV_JD:
-            await ProfessionalService._process_jvjd_step(
-                db, profile.id, step_number, step_data
-            )
-        elif capability_type == CapabilityType.INTERIOR:
-            await ProfessionalService._process_interior_step(
-                db, profile.id, step_number, step_data
-            )
-        elif capability_type == CapabilityType.RECONSTRUCTION:
-            await ProfessionalService._process_reconstruction_step(
-                db, profile.id, step_number, step_data
-            )
+        """
+        Complete a specific onboarding step for an already-loaded profile
+        Child rows are diffed against the stored ones by natural key, so
+        re-submitting a step writes only what changed.
+        """
+        batch = OnboardingBatch(profile.id, capability_type)
+        handler = ONBOARDING_STEPS.get((capability_type, step_number))
+        if handler:
+            handler(profile, step_data, batch)
         
         # Update step number
-        total_steps = {
-            CapabilityType.CONSTRUCTION: 7,
-            CapabilityType.JV_JD: 8,
-            CapabilityType.INTERIOR: 5,
-            CapabilityType.RECONSTRUCTION: 6,
-        }.get(capability_type, 5)
+        total_steps = TOTAL_STEPS.get(capability_type, DEFAULT_TOTAL_STEPS)
         
         if step_number < total_steps:
             profile.onboarding_step = step_number + 1
         else:
             profile.onboarding_step = total_steps
         
-        await db.commit()
-        await db.refresh(profile)
+        counts = await write_batch(db, batch)
+        
+        # Steps may change scored fields and add licenses and portfolio items
+        await CredibilityService.apply_count_changes(
+            db,
+            profile,
+            license_delta=counts[License].net if License in counts else 0,
+            portfolio_delta=counts[Portfolio].net if Portfolio in counts else 0
+        )
+        
+        if LocationPreference in counts and counts[LocationPreference].written:
+            # Geolocated service areas changed
+            await MatchRescoreService.mark_professional(
+                db, profile.id, [RescoreComponent.LOCATION]
+            )
+        await db.flush()
+        # Steps may add capabilities, pricing tiers and service locations
+        candidate_index.mark_dirty_on_commit(db, profile.id)
+        # Child rows are inserted in bulk, which the cache's ORM events miss
+        profile_cache.invalidate_on_commit(db, profile.id)
         
         return {
             "step_number": step_number,
@@ -358,365 +400,6 @@ class ProfessionalService:
             "message": "Step completed successfully"
         }
     
-    @staticmethod
-    async def _process_construction_step(
-        db: AsyncSession,
-        professional_id: UUID,
-        step_number: int,
-        step_data: dict
-    ):
-        """Process Contract Construction onboarding step"""
-        from app.models.professional import ProfessionalProfile
-        
-        profile_result = await db.execute(
-            select(ProfessionalProfile).where(ProfessionalProfile.id == professional_id)
-        )
-        profile = profile_result.scalar_one_or_none()
-        
-        if step_number == 1:
-            if "company_name" in step_data:
-                profile.company_name = step_data["company_name"]
-            if "experience_years" in step_data:
-                profile.experience_years = step_data["experience_years"]
-            if "office_address" in step_data:
-                profile.office_address = step_data["office_address"]
-            if "google_maps_location" in step_data:
-                profile.google_maps_location = step_data["google_maps_location"]
-            if "builder_license" in step_data and step_data["builder_license"]:
-                await ProfessionalService.add_license(
-                    db, professional_id, step_data["builder_license"],
-                    issuing_authority="KPWD or equivalent"
-                )
-            if "rera_registration" in step_data and step_data["rera_registration"]:
-                profile.rera_experience = True
-        
-        elif step_number == 3:
-            location_prefs = step_data.get("location_preferences", [])
-            for loc_pref in location_prefs:
-                location = LocationPreference(
-                    professional_id=professional_id,
-                    location_name=loc_pref.get("location_name"),
-                    radius_km=loc_pref.get("radius_km"),
-                    capability_type=CapabilityType.CONSTRUCTION
-                )
-                db.add(location)
-        
-        elif step_number == 4:
-            if "total_projects_completed" in step_data:
-                profile.total_projects_completed = step_data["total_projects_completed"]
-            portfolio_projects = step_data.get("portfolio_projects", [])
-            for proj in portfolio_projects[:5]:
-                portfolio = Portfolio(
-                    professional_id=professional_id,
-                    project_name=proj.get("project_name"),
-                    location=proj.get("location"),
-                    area_sqft=proj.get("area_sqft"),
-                    completion_date=proj.get("completion_date"),
-                    duration_months=proj.get("duration_months"),
-                    images=proj.get("images", [])[:5],
-                    description=proj.get("description")
-                )
-                db.add(portfolio)
-        
-        elif step_number == 5:
-            subcontractor_scopes = step_data.get("subcontractor_scopes", [])
-            for scope_type in subcontractor_scopes:
-                scope = SubcontractorScope(
-                    professional_id=professional_id,
-                    scope_type=scope_type,
-                    capability_type=CapabilityType.CONSTRUCTION
-                )
-                db.add(scope)
-        
-        elif step_number == 6:
-            if "typical_project_size" in step_data:
-                size_cat = ProjectSizeCategoryModel(
-                    professional_id=professional_id,
-                    capability_type=CapabilityType.CONSTRUCTION,
-                    size_category=step_data["typical_project_size"]
-                )
-                db.add(size_cat)
-        
-        elif step_number == 7:
-            residential = step_data.get("residential_pricing", {})
-            commercial = step_data.get("commercial_pricing", {})
-            industrial = step_data.get("industrial_pricing", {})
-            
-            for project_type, pricing_data in [
-                (ProjectIntent.RESIDENTIAL, residential),
-                (ProjectIntent.COMMERCIAL, commercial),
-                (ProjectIntent.INDUSTRIAL, industrial)
-            ]:
-                for tier_name, tier_value in [
-                    (PricingTierType.BASIC_REGULAR, pricing_data.get("basic_regular")),
-                    (PricingTierType.STANDARD, pricing_data.get("standard")),
-                    (PricingTierType.LUXURY, pricing_data.get("luxury"))
-                ]:
-                    if tier_value:
-                        pricing = ProfessionalPricing(
-                            professional_id=professional_id,
-                            capability_type=CapabilityType.CONSTRUCTION,
-                            project_type=project_type,
-                            pricing_tier=tier_name,
-                            price_per_sqft=tier_value
-                        )
-                        db.add(pricing)
-    
-    @staticmethod
-    async def _process_jvjd_step(
-        db: AsyncSession,
-        professional_id: UUID,
-        step_number: int,
-        step_data: dict
-    ):
-        """Process JV/JD Developer onboarding step"""
-        from app.models.professional import ProfessionalProfile
-        
-        profile_result = await db.execute(
-            select(ProfessionalProfile).where(ProfessionalProfile.id == professional_id)
-        )
-        profile = profile_result.scalar_one_or_none()
-        
-        if step_number == 1:
-            if "company_name" in step_data:
-                profile.company_name = step_data["company_name"]
-            if "experience_years" in step_data:
-                profile.experience_years = step_data["experience_years"]
-            if "business_entity_type" in step_data:
-                profile.business_entity_type = step_data["business_entity_type"]
-            if "office_address" in step_data:
-                profile.office_address = step_data["office_address"]
-            if "google_maps_location" in step_data:
-                profile.google_maps_location = step_data["google_maps_location"]
-        
-        elif step_number == 2:
-            if "builder_license" in step_data and step_data["builder_license"]:
-                await ProfessionalService.add_license(
-                    db, professional_id, step_data["builder_license"]
-                )
-            if "rera_registration" in step_data and step_data["rera_registration"]:
-                profile.rera_experience = True
-            if "gst_number" in step_data:
-                profile.gst_number = step_data["gst_number"]
-        
-        elif step_number == 4:
-            if "total_projects_completed" in step_data:
-                profile.total_projects_completed = step_data["total_projects_completed"]
-            recent_projects = step_data.get("recent_projects", [])
-            for proj in recent_projects[:3]:
-                portfolio = Portfolio(
-                    professional_id=professional_id,
-                    project_name=proj.get("project_name"),
-                    location=proj.get("location"),
-                    area_sqft=proj.get("area_sqft"),
-                    completion_date=proj.get("completion_date"),
-                    duration_months=proj.get("duration_months"),
-                    images=proj.get("images", [])[:2],
-                    description=proj.get("description")
-                )
-                db.add(portfolio)
-        
-        elif step_number == 5:
-            subcontractor_scopes = step_data.get("subcontractor_scopes", [])
-            for scope_type in subcontractor_scopes:
-                scope = SubcontractorScope(
-                    professional_id=professional_id,
-                    scope_type=scope_type,
-                    capability_type=CapabilityType.JV_JD
-                )
-                db.add(scope)
-            if "typical_project_size" in step_data:
-                size_cat = ProjectSizeCategoryModel(
-                    professional_id=professional_id,
-                    capability_type=CapabilityType.JV_JD,
-                    size_category=step_data["typical_project_size"]
-                )
-                db.add(size_cat)
-        
-        elif step_number == 6:
-            if "rera_registered_projects_count" in step_data:
-                profile.rera_project_count = step_data["rera_registered_projects_count"]
-            if "wallet_size_range" in step_data:
-                size_cat = ProjectSizeCategoryModel(
-                    professional_id=professional_id,
-                    capability_type=CapabilityType.JV_JD,
-                    size_category=ProjectSizeCategoryEnum.CUSTOM,
-                    wallet_size_range=step_data["wallet_size_range"]
-                )
-                db.add(size_cat)
-        
-        elif step_number == 7:
-            location_prefs = step_data.get("location_preferences", [])
-            for loc_pref in location_prefs:
-                location = LocationPreference(
-                    professional_id=professional_id,
-                    location_name=loc_pref.get("location_name"),
-                    radius_km=loc_pref.get("radius_km"),
-                    capability_type=CapabilityType.JV_JD
-                )
-                db.add(location)
-            if "team_size_category" in step_data:
-                profile.team_size_category = step_data["team_size_category"]
-        
-        elif step_number == 8:
-            preferred_models = step_data.get("preferred_jv_models", [])
-            jv_prefs = JVJDPreferences(
-                professional_id=professional_id,
-                preferred_jv_models=[m.value if hasattr(m, 'value') else str(m) for m in preferred_models],
-                rera_registered_projects_count=profile.rera_project_count
-            )
-            db.add(jv_prefs)
-    
-    @staticmethod
-    async def _process_interior_step(
-        db: AsyncSession,
-        professional_id: UUID,
-        step_number: int,
-        step_data: dict
-    ):
-        """Process Interior Designer onboarding step"""
-        from app.models.professional import ProfessionalProfile
-        
-        profile_result = await db.execute(
-            select(ProfessionalProfile).where(ProfessionalProfile.id == professional_id)
-        )
-        profile = profile_result.scalar_one_or_none()
-        
-        if step_number == 1:
-            if "company_name" in step_data:
-                profile.company_name = step_data["company_name"]
-            if "experience_years" in step_data:
-                profile.experience_years = step_data["experience_years"]
-            if "office_address" in step_data:
-                profile.office_address = step_data["office_address"]
-            if "google_maps_location" in step_data:
-                profile.google_maps_location = step_data["google_maps_location"]
-        
-        elif step_number == 3:
-            recent_projects = step_data.get("recent_projects", [])
-            for proj in recent_projects[:3]:
-                portfolio = Portfolio(
-                    professional_id=professional_id,
-                    project_name=proj.get("project_name"),
-                    location=proj.get("location"),
-                    area_sqft=proj.get("area_sqft"),
-                    completion_date=proj.get("completion_date"),
-                    duration_months=proj.get("duration_months"),
-                    images=proj.get("images", [])[:2],
-                    description=proj.get("description")
-                )
-                db.add(portfolio)
-        
-        elif step_number == 4:
-            tentative = step_data.get("tentative_pricing", {})
-            custom_pricing = {
-                "flat_1200_sft": tentative.get("flat_1200_sft"),
-                "duplex_1500_sft": tentative.get("duplex_1500_sft"),
-                "commercial_1800_sft": tentative.get("commercial_1800_sft"),
-                "other": tentative.get("other")
-            }
-            pricing = ProfessionalPricing(
-                professional_id=professional_id,
-                capability_type=CapabilityType.INTERIOR,
-                custom_pricing=custom_pricing
-            )
-            db.add(pricing)
-        
-        elif step_number == 5:
-            location_prefs = step_data.get("location_preferences", [])
-            for loc_pref in location_prefs:
-                location = LocationPreference(
-                    professional_id=professional_id,
-                    location_name=loc_pref.get("location_name"),
-                    radius_km=loc_pref.get("radius_km"),
-                    capability_type=CapabilityType.INTERIOR
-                )
-                db.add(location)
-    
-    @staticmethod
-    async def _process_reconstruction_step(
-        db: AsyncSession,
-        professional_id: UUID,
-        step_number: int,
-        step_data: dict
-    ):
-        """Process Reconstruction onboarding step"""
-        from app.models.professional import ProfessionalProfile
-        
-        profile_result = await db.execute(
-            select(ProfessionalProfile).where(ProfessionalProfile.id == professional_id)
-        )
-        profile = profile_result.scalar_one_or_none()
-        
-        if step_number == 1:
-            if "company_name" in step_data:
-                profile.company_name = step_data["company_name"]
-            if "experience_years" in step_data:
-                profile.experience_years = step_data["experience_years"]
-            if "business_entity_type" in step_data:
-                profile.business_entity_type = step_data["business_entity_type"]
-            if "office_address" in step_data:
-                profile.office_address = step_data["office_address"]
-            if "google_maps_location" in step_data:
-                profile.google_maps_location = step_data["google_maps_location"]
-            if "gst_number" in step_data:
-                profile.gst_number = step_data["gst_number"]
-            if "builder_license" in step_data and step_data["builder_license"]:
-                await ProfessionalService.add_license(
-                    db, professional_id, step_data["builder_license"]
-                )
-        
-        elif step_number == 2:
-            location_prefs = step_data.get("location_preferences", [])
-            for loc in location_prefs:
-                location_name = loc if isinstance(loc, str) else loc.get("location_name")
-                location = LocationPreference(
-                    professional_id=professional_id,
-                    location_name=location_name,
-                    capability_type=CapabilityType.RECONSTRUCTION
-                )
-                db.add(location)
-        
-        elif step_number == 3:
-            if "total_projects_completed" in step_data:
-                profile.total_projects_completed = step_data["total_projects_completed"]
-        
-        elif step_number == 4:
-            subcontractor_scopes = step_data.get("subcontractor_scopes", [])
-            for scope_type in subcontractor_scopes:
-                scope = SubcontractorScope(
-                    professional_id=professional_id,
-                    scope_type=scope_type,
-                    capability_type=CapabilityType.RECONSTRUCTION
-                )
-                db.add(scope)
-            if "typical_project_size" in step_data:
-                size_cat = ProjectSizeCategoryModel(
-                    professional_id=professional_id,
-                    capability_type=CapabilityType.RECONSTRUCTION,
-                    size_category=step_data["typical_project_size"]
-                )
-                db.add(size_cat)
-        
-        elif step_number == 5:
-            work_types = step_data.get("work_type_preferences", [])
-            for work_type in work_types:
-                recon_work = ReconstructionWorkTypeModel(
-                    professional_id=professional_id,
-                    work_type=work_type,
-                    custom_description=step_data.get("custom_work_description") if work_type == ReconstructionWorkTypeEnum.CUSTOM else None
-                )
-                db.add(recon_work)
-        
-        elif step_number == 6:
-            if "tentative_pricing" in step_data:
-                pricing = ProfessionalPricing(
-                    professional_id=professional_id,
-                    capability_type=CapabilityType.RECONSTRUCTION,
-                    custom_pricing={"tentative_pricing": step_data["tentative_pricing"]}
-                )
-                db.add(pricing)
-    
     @staticmethod
     async def submit_onboarding(
         db: AsyncSession,
@@ -728,14 +411,13 @@ class ProfessionalService:
         
         # Calculate credibility score
         credibility_score = await CredibilityService.update_credibility_score(
-            db, str(profile.id)
+            db, profile.id
         )
         
         # Mark onboarding as completed
         profile.onboarding_status = OnboardingStatus.COMPLETED
         profile.credibility_score = credibility_score
         
-        await db.commit()
-        await db.refresh(profile)
+        await db.flush()
         
         return profile
@@ -0,0 +1,156 @@
+"""
+Aggregated professional profile cache
+
+GET /professionals/profile/full serves a professional's profile and every
+onboarding child collection from a process-local TTL + LRU cache keyed by
+user id. ORM inserts, updates and deletes of the profile or any of its
+child rows invalidate the entry at flush and again after commit. Bulk
+statements bypass the ORM events, so the code issuing them calls
+invalidate_on_commit; anything else is picked up when the entry expires.
+Every invalidation of a profile that is being loaded bumps its generation,
+and a profile loaded while its generation moved on is not cached;
+generations are only kept while a load is in flight.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+from app.config import settings
+from app.models.professional import (
+    ProfessionalProfile, Capability, License, Portfolio, PricingTier, LocationPreference,
+    SubcontractorScope, ProjectSizeCategory, ProfessionalPricing, JVJDPreferences, ReconstructionWorkType
+)
+
+CHILD_MODELS = (
+    Capability, License, Portfolio, PricingTier, LocationPreference, SubcontractorScope,
+    ProjectSizeCategory, ProfessionalPricing, JVJDPreferences, ReconstructionWorkType
+)
+
+
+class ProfileCache:
+    """TTL + LRU cache of aggregated profiles keyed by user id"""
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[UUID, Tuple[float, UUID, Any]]" = OrderedDict()
+        # Invalidations arrive by professional profile id
+        self._users_by_profile: Dict[UUID, UUID] = {}
+        # Invalidations seen per profile id during in-flight loads; a load that
+        # raced one is not cached. Both drop a profile once its loads finish.
+        self._generations: Dict[UUID, int] = {}
+        self._loads: Dict[UUID, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def get(self, user_id: UUID) -> Optional[Any]:
+        """Cached profile, or None when missing or expired"""
+        entry = self._entries.get(user_id)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                self._drop(user_id)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(user_id)
+        self.hits += 1
+        return entry[2]
+
+    def generation(self, profile_id: UUID) -> int:
+        """
+        Start loading a profile and return its current generation
+        Every call must be followed by put, or by release if the load fails.
+        """
+        self._loads[profile_id] = self._loads.get(profile_id, 0) + 1
+        return self._generations.get(profile_id, 0)
+
+    def release(self, profile_id: UUID) -> None:
+        """End a load started with generation without caching anything"""
+        remaining = self._loads.get(profile_id, 0) - 1
+        if remaining > 0:
+            self._loads[profile_id] = remaining
+        else:
+            self._loads.pop(profile_id, None)
+            self._generations.pop(profile_id, None)
+
+    def put(self, user_id: UUID, profile_id: UUID, value: Any, generation: int) -> None:
+        """
+        Cache a profile loaded at generation, evicting the least recently
+        used entry when full; skipped if the profile was invalidated since
+        """
+        current = self._generations.get(profile_id, 0)
+        self.release(profile_id)
+        if not self.enabled or current != generation:
+            return
+        self._entries[user_id] = (time.monotonic() + self.ttl_seconds, profile_id, value)
+        self._entries.move_to_end(user_id)
+        self._users_by_profile[profile_id] = user_id
+        while len(self._entries) > self.max_entries:
+            self._drop(next(iter(self._entries)))
+
+    def invalidate(self, profile_id: UUID) -> None:
+        """Drop one professional's entry"""
+        if profile_id in self._loads:
+            self._generations[profile_id] = self._generations.get(profile_id, 0) + 1
+        user_id = self._users_by_profile.get(profile_id)
+        if user_id is not None:
+            self._drop(user_id)
+
+    def invalidate_on_commit(self, db: AsyncSession, profile_id: UUID) -> None:
+        """Drop one professional's entry now and once db's transaction commits"""
+        self.invalidate(profile_id)
+        db.sync_session.info.setdefault(_PENDING_KEY, set()).add(profile_id)
+
+    def clear(self) -> None:
+        """Drop every entry; loads in flight are not cached"""
+        self._entries.clear()
+        self._users_by_profile.clear()
+        self._generations = {profile_id: self._generations.get(profile_id, 0) + 1 for profile_id in self._loads}
+
+    def metrics(self) -> dict:
+        """Size and hit counters"""
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def _drop(self, user_id: UUID) -> None:
+        entry = self._entries.pop(user_id, None)
+        if entry is not None:
+            self._users_by_profile.pop(entry[1], None)
+
+
+profile_cache = ProfileCache(
+    ttl_seconds=settings.profile_cache_ttl_seconds,
+    max_entries=settings.profile_cache_max_entries
+)
+
+_PENDING_KEY = "profile_cache_invalidations"
+
+
+def _invalidate_changed_row(mapper, connection, target) -> None:
+    profile_id = target.id if isinstance(target, ProfessionalProfile) else target.professional_id
+    profile_cache.invalidate(profile_id)
+    # A concurrent request may re-cache the old rows before this commits
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_KEY, set()).add(profile_id)
+
+
+for _model in (ProfessionalProfile, *CHILD_MODELS):
+    for _event in ("after_insert", "after_update", "after_delete"):
+        event.listen(_model, _event, _invalidate_changed_row)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    for profile_id in session.info.pop(_PENDING_KEY, ()):
+        profile_cache.invalidate(profile_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,185 @@
+"""
+Async Razorpay gateway
+
+Talks to the Razorpay REST API through one shared, pooled httpx.AsyncClient
+(keep-alive connections, bounded pool, explicit timeouts) so order creation
+never blocks the event loop. Transient failures are retried with
+exponential backoff and full jitter; order creation is not idempotent, so
+it is only resent blindly when the request never reached Razorpay, and
+otherwise after checking for an order with the same receipt. Signatures are verified locally with
+HMAC-SHA256, exactly as the razorpay SDK does, without a network call.
+"""
+import asyncio
+import hashlib
+import hmac
+import logging
+import random
+from typing import Any, Dict, Optional
+import httpx
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Worth retrying: rate limiting and gateway-side failures
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+# Of those, the ones returned before Razorpay acted on the request
+REJECTED_STATUS_CODES = {429}
+# Transport failures raised before the request was sent
+UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class PaymentGatewayError(Exception):
+    """Razorpay rejected a request or could not be reached"""
+    def __init__(self, message: str, status_code: Optional[int] = None, maybe_applied: bool = False):
+        self.status_code = status_code
+        # True when Razorpay may have acted on the request despite the error
+        self.maybe_applied = maybe_applied
+        super().__init__(message)
+
+
+class RazorpayGateway:
+    """Async Razorpay client on a pooled HTTP connection layer"""
+
+    def __init__(
+        self,
+        key_id: str,
+        key_secret: str,
+        base_url: str,
+        timeout_seconds: float,
+        max_retries: int,
+        backoff_seconds: float,
+        max_connections: int,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self.key_id = key_id
+        self.key_secret = key_secret
+        self.base_url = base_url
+        self.timeout_seconds = timeout_seconds
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.max_connections = max_connections
+        self.transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared client, created on first use"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                auth=(self.key_id, self.key_secret),
+                timeout=httpx.Timeout(self.timeout_seconds, connect=min(self.timeout_seconds, 5.0)),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                    keepalive_expiry=60.0
+                ),
+                transport=self.transport
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close pooled connections"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    # ---------- API calls ----------
+
+    async def create_order(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Create an order; data follows Razorpay's Orders API
+
+        A read timeout or 5xx leaves it unknown whether the order was
+        created, so before sending it again the order is looked up by its
+        receipt and returned if it exists.
+        """
+        attempt = 0
+        while True:
+            try:
+                return await self._request("POST", "/v1/orders", idempotent=False, json=data)
+            except PaymentGatewayError as error:
+                if not error.maybe_applied or not data.get("receipt") or attempt >= self.max_retries:
+                    raise
+                existing = await self.find_order_by_receipt(data["receipt"])
+                if existing is not None:
+                    logger.warning("Razorpay order for receipt %s was created despite %s", data["receipt"], error)
+                    return existing
+                await self._backoff("POST", "/v1/orders", error, attempt)
+                attempt += 1
+
+    async def find_order_by_receipt(self, receipt: str) -> Optional[Dict[str, Any]]:
+        """Most recent order created with this receipt, if any"""
+        orders = await self._request("GET", "/v1/orders", params={"receipt": receipt})
+        items = orders.get("items") or []
+        return items[0] if items else None
+
+    async def _request(self, method: str, path: str, idempotent: bool = True, **kwargs) -> Dict[str, Any]:
+        """Send a request, retrying transient failures
+
+        Non-idempotent requests are only retried when Razorpay cannot have
+        acted on them; other failures are raised with maybe_applied set.
+        """
+        attempt = 0
+        while True:
+            try:
+                response = await self.client.request(method, path, **kwargs)
+            except httpx.TransportError as e:
+                error = PaymentGatewayError(
+                    f"Razorpay unreachable: {e.__class__.__name__}",
+                    maybe_applied=not isinstance(e, UNSENT_ERRORS)
+                )
+            else:
+                if response.status_code < 400:
+                    return response.json()
+                error = PaymentGatewayError(
+                    self._error_description(response),
+                    status_code=response.status_code,
+                    maybe_applied=response.status_code in RETRYABLE_STATUS_CODES - REJECTED_STATUS_CODES
+                )
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    raise error
+
+            if attempt >= self.max_retries or (error.maybe_applied and not idempotent):
+                raise error
+            await self._backoff(method, path, error, attempt)
+            attempt += 1
+
+    async def _backoff(self, method: str, path: str, error: PaymentGatewayError, attempt: int) -> None:
+        # Full jitter keeps concurrent retries from arriving together
+        delay = random.uniform(0, self.backoff_seconds * (2 ** attempt))
+        logger.warning("Razorpay %s %s failed (%s), retrying in %.2fs", method, path, error, delay)
+        await asyncio.sleep(delay)
+
+    @staticmethod
+    def _error_description(response: httpx.Response) -> str:
+        try:
+            return response.json()["error"]["description"]
+        except Exception:
+            return f"Razorpay returned HTTP {response.status_code}"
+
+    # ---------- signatures ----------
+
+    def verify_payment_signature(self, order_id: str, payment_id: str, signature: str) -> bool:
+        """Check the signature Checkout returns for a completed payment"""
+        return self._signature_matches(f"{order_id}|{payment_id}".encode(), signature, self.key_secret)
+
+    def verify_webhook_signature(self, body: bytes, signature: str, secret: str) -> bool:
+        """Check X-Razorpay-Signature against the raw webhook body"""
+        return self._signature_matches(body, signature, secret)
+
+    @staticmethod
+    def _signature_matches(message: bytes, signature: str, secret: str) -> bool:
+        expected = hmac.new(secret.encode(), message, hashlib.sha256).hexdigest()
+        return hmac.compare_digest(expected, signature or "")
+
+
+# Shared by every request handled in this process
+razorpay_gateway = RazorpayGateway(
+    key_id=settings.razorpay_key_id,
+    key_secret=settings.razorpay_key_secret,
+    base_url=settings.razorpay_base_url,
+    timeout_seconds=settings.razorpay_timeout_seconds,
+    max_retries=settings.razorpay_max_retries,
+    backoff_seconds=settings.razorpay_backoff_seconds,
+    max_connections=settings.razorpay_max_connections
+)
@@ -0,0 +1,404 @@
+"""
+Vectorized match scoring kernel
+
+Columnar counterpart of the per-professional scorers in MatchingService.
+Candidate attributes are packed into NumPy arrays once and the six
+MATCH_WEIGHTS components are computed for every candidate in one pass.
+Results are identical to the scalar functions, including their edge cases
+(a max_area_sqft of 0 counts as unbounded for size but not for pricing).
+
+When the plot has coordinates, professionals with geolocated service areas
+are scored on distance instead of city names, and those whose radius cannot
+reach the plot are dropped with reachable_rows() before scoring.
+"""
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from uuid import UUID
+import numpy as np
+from app.config import settings
+from app.models.professional import (
+    ProfessionalProfile,
+    Capability,
+    PricingTier,
+    LocationPreference
+)
+from app.services.candidate_index import CandidateRecord
+from app.utils.constants import (
+    MATCH_WEIGHTS,
+    PROJECT_CAPABILITY_MAP,
+    CapabilityType,
+    ProjectType
+)
+from app.utils.geo import haversine_km
+
+# Bit position of each capability type in CandidateArrays.capability_mask
+CAPABILITY_BITS = {capability: 1 << index for index, capability in enumerate(CapabilityType)}
+CAPABILITY_CODES = {capability: index for index, capability in enumerate(CapabilityType)}
+# Service areas without a capability apply to every project type
+ANY_CAPABILITY_CODE = -1
+
+
+@dataclass
+class CandidateArrays:
+    """Columnar view of a candidate pool"""
+    professional_ids: List[UUID]
+    # One bit per CapabilityType the professional has
+    capability_mask: np.ndarray
+    # Candidates whose location_preferences list is non-empty
+    has_location_preferences: np.ndarray
+    # Flattened location preferences: owning candidate row and vocabulary id
+    location_owner: np.ndarray
+    location_token: np.ndarray
+    # Lower-cased preference strings indexed by token id
+    location_vocabulary: List[str]
+    # Flattened pricing tiers: owning candidate row, capability code, bounds and price
+    tier_owner: np.ndarray
+    tier_capability: np.ndarray
+    tier_min_area: np.ndarray
+    tier_max_area: np.ndarray
+    tier_price: np.ndarray
+    # Flattened geolocated service areas: owning row, capability code, centre and radius
+    area_owner: np.ndarray
+    area_capability: np.ndarray
+    area_latitude: np.ndarray
+    area_longitude: np.ndarray
+    area_radius_km: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.professional_ids)
+
+    def take(self, rows: np.ndarray) -> "CandidateArrays":
+        """Sub-pool of the rows where the boolean mask is True"""
+        new_row = np.cumsum(rows) - 1
+        keep_locations = rows[self.location_owner]
+        keep_tiers = rows[self.tier_owner]
+        keep_areas = rows[self.area_owner]
+        return CandidateArrays(
+            professional_ids=[
+                professional_id
+                for professional_id, keep in zip(self.professional_ids, rows.tolist())
+                if keep
+            ],
+            capability_mask=self.capability_mask[rows],
+            has_location_preferences=self.has_location_preferences[rows],
+            location_owner=new_row[self.location_owner[keep_locations]],
+            location_token=self.location_token[keep_locations],
+            location_vocabulary=self.location_vocabulary,
+            tier_owner=new_row[self.tier_owner[keep_tiers]],
+            tier_capability=self.tier_capability[keep_tiers],
+            tier_min_area=self.tier_min_area[keep_tiers],
+            tier_max_area=self.tier_max_area[keep_tiers],
+            tier_price=self.tier_price[keep_tiers],
+            area_owner=new_row[self.area_owner[keep_areas]],
+            area_capability=self.area_capability[keep_areas],
+            area_latitude=self.area_latitude[keep_areas],
+            area_longitude=self.area_longitude[keep_areas],
+            area_radius_km=self.area_radius_km[keep_areas],
+        )
+
+
+class ScoringKernel:
+    """Vectorized scoring over a CandidateArrays pool"""
+
+    @staticmethod
+    def build_arrays(
+        professionals: Sequence[ProfessionalProfile],
+        capabilities_by_professional: Dict[UUID, List[Capability]],
+        pricing_by_professional: Dict[UUID, List[PricingTier]],
+        locations_by_professional: Optional[Dict[UUID, List[LocationPreference]]] = None
+    ) -> CandidateArrays:
+        """Pack ORM rows into the columnar layout used by score()"""
+        locations_by_professional = locations_by_professional or {}
+        return ScoringKernel._pack(
+            (
+                professional.id,
+                [capability.capability_type for capability in capabilities_by_professional.get(professional.id, [])],
+                professional.location_preferences or [],
+                pricing_by_professional.get(professional.id, []),
+                locations_by_professional.get(professional.id, [])
+            )
+            for professional in professionals
+        )
+
+    @staticmethod
+    def build_arrays_from_candidates(candidates: Sequence[CandidateRecord]) -> CandidateArrays:
+        """Pack candidate index records into the columnar layout used by score()"""
+        return ScoringKernel._pack(
+            (
+                candidate.professional_id,
+                candidate.capability_types,
+                candidate.location_preferences,
+                candidate.tiers,
+                candidate.service_areas
+            )
+            for candidate in candidates
+        )
+
+    @staticmethod
+    def _pack(
+        entries: Iterable[Tuple[UUID, Iterable[CapabilityType], Sequence[str], Sequence, Sequence]]
+    ) -> CandidateArrays:
+        """
+        Build CandidateArrays from (id, capability types, location preferences,
+        tiers, service areas). Tiers need capability_type, min/max_area_sqft and
+        price_per_sqft; service areas need latitude, longitude, radius_km and
+        capability_type, and are skipped when they have no coordinates.
+        """
+        professional_ids: List[UUID] = []
+        capability_masks: List[int] = []
+        has_location_preferences: List[bool] = []
+        location_owner: List[int] = []
+        location_token: List[int] = []
+        vocabulary: Dict[str, int] = {}
+        tier_owner: List[int] = []
+        tier_capability: List[int] = []
+        tier_min_area: List[float] = []
+        tier_max_area: List[float] = []
+        tier_price: List[float] = []
+        area_owner: List[int] = []
+        area_capability: List[int] = []
+        area_latitude: List[float] = []
+        area_longitude: List[float] = []
+        area_radius_km: List[float] = []
+
+        for row, (professional_id, capability_types, preferences, tiers, areas) in enumerate(entries):
+            professional_ids.append(professional_id)
+
+            mask = 0
+            for capability_type in capability_types:
+                mask |= CAPABILITY_BITS[capability_type]
+            capability_masks.append(mask)
+
+            has_location_preferences.append(bool(preferences))
+            for preference in preferences:
+                token = vocabulary.setdefault(preference.lower(), len(vocabulary))
+                location_owner.append(row)
+                location_token.append(token)
+
+            for tier in tiers:
+                tier_owner.append(row)
+                tier_capability.append(CAPABILITY_CODES[tier.capability_type])
+                tier_min_area.append(np.nan if tier.min_area_sqft is None else tier.min_area_sqft)
+                tier_max_area.append(np.nan if tier.max_area_sqft is None else tier.max_area_sqft)
+                tier_price.append(tier.price_per_sqft)
+
+            for area in areas:
+                if area.latitude is None or area.longitude is None:
+                    continue
+                area_owner.append(row)
+                area_capability.append(
+                    ANY_CAPABILITY_CODE if area.capability_type is None
+                    else CAPABILITY_CODES[area.capability_type]
+                )
+                area_latitude.append(area.latitude)
+                area_longitude.append(area.longitude)
+                area_radius_km.append(area.radius_km or settings.default_service_radius_km)
+
+        return CandidateArrays(
+            professional_ids=professional_ids,
+            capability_mask=np.asarray(capability_masks, dtype=np.uint8),
+            has_location_preferences=np.asarray(has_location_preferences, dtype=bool),
+            location_owner=np.asarray(location_owner, dtype=np.int64),
+            location_token=np.asarray(location_token, dtype=np.int64),
+            location_vocabulary=list(vocabulary),
+            tier_owner=np.asarray(tier_owner, dtype=np.int64),
+            tier_capability=np.asarray(tier_capability, dtype=np.int64),
+            tier_min_area=np.asarray(tier_min_area, dtype=np.float64),
+            tier_max_area=np.asarray(tier_max_area, dtype=np.float64),
+            tier_price=np.asarray(tier_price, dtype=np.float64),
+            area_owner=np.asarray(area_owner, dtype=np.int64),
+            area_capability=np.asarray(area_capability, dtype=np.int64),
+            area_latitude=np.asarray(area_latitude, dtype=np.float64),
+            area_longitude=np.asarray(area_longitude, dtype=np.float64),
+            area_radius_km=np.asarray(area_radius_km, dtype=np.float64),
+        )
+
+    @staticmethod
+    def project_type_scores(
+        arrays: CandidateArrays,
+        project_type: ProjectType
+    ) -> np.ndarray:
+        """Vector form of calculate_project_type_score"""
+        required = PROJECT_CAPABILITY_MAP.get(project_type)
+        if not required:
+            return np.zeros(len(arrays), dtype=np.float64)
+        has_required = (arrays.capability_mask & CAPABILITY_BITS[required]) != 0
+        return has_required.astype(np.float64)
+
+    @staticmethod
+    def capability_scores(
+        arrays: CandidateArrays,
+        project_type: ProjectType
+    ) -> np.ndarray:
+        """Vector form of calculate_capability_score"""
+        # An empty capability mask can never contain the required bit, so this
+        # reduces to the project type check
+        return ScoringKernel.project_type_scores(arrays, project_type)
+
+    @staticmethod
+    def service_area_reach(
+        arrays: CandidateArrays,
+        plot_coordinates: Tuple[float, float],
+        capability_type: CapabilityType
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Per-row (has an applicable geolocated service area, some area reaches the plot)
+        Areas apply when their capability matches or is unset
+        """
+        geolocated = np.zeros(len(arrays), dtype=bool)
+        reached = np.zeros(len(arrays), dtype=bool)
+        applicable = (
+            (arrays.area_capability == CAPABILITY_CODES[capability_type]) |
+            (arrays.area_capability == ANY_CAPABILITY_CODE)
+        )
+        if not applicable.any():
+            return geolocated, reached
+
+        owners = arrays.area_owner[applicable]
+        distances = haversine_km(
+            plot_coordinates[0],
+            plot_coordinates[1],
+            arrays.area_latitude[applicable],
+            arrays.area_longitude[applicable]
+        )
+        geolocated[owners] = True
+        reached[owners[distances <= arrays.area_radius_km[applicable]]] = True
+        return geolocated, reached
+
+    @staticmethod
+    def reachable_rows(
+        arrays: CandidateArrays,
+        plot_coordinates: Optional[Tuple[float, float]],
+        capability_type: CapabilityType
+    ) -> np.ndarray:
+        """Rows without geolocated service areas, or whose radius reaches the plot"""
+        if plot_coordinates is None:
+            return np.ones(len(arrays), dtype=bool)
+        geolocated, reached = ScoringKernel.service_area_reach(arrays, plot_coordinates, capability_type)
+        return ~geolocated | reached
+
+    @staticmethod
+    def location_scores(
+        arrays: CandidateArrays,
+        property_city: str,
+        plot_coordinates: Optional[Tuple[float, float]] = None,
+        capability_type: CapabilityType = CapabilityType.CONSTRUCTION
+    ) -> np.ndarray:
+        """Vector form of calculate_location_score"""
+        city = property_city.lower()
+        # Substring checks run once per distinct preference, not once per row
+        vocabulary_match = np.fromiter(
+            (city in token or token in city for token in arrays.location_vocabulary),
+            dtype=bool,
+            count=len(arrays.location_vocabulary)
+        )
+        matched_rows = np.zeros(len(arrays), dtype=bool)
+        if arrays.location_token.size:
+            matched_rows[arrays.location_owner[vocabulary_match[arrays.location_token]]] = True
+
+        city_scores = np.where(
+            ~arrays.has_location_preferences,
+            0.5,
+            np.where(matched_rows, 1.0, 0.3)
+        )
+        if plot_coordinates is None:
+            return city_scores
+
+        geolocated, reached = ScoringKernel.service_area_reach(arrays, plot_coordinates, capability_type)
+        return np.where(geolocated, np.where(reached, 1.0, 0.0), city_scores)
+
+    @staticmethod
+    def project_size_scores(
+        arrays: CandidateArrays,
+        project_area_sqft: float,
+        capability_type: CapabilityType
+    ) -> np.ndarray:
+        """Vector form of calculate_project_size_score"""
+        same_capability = arrays.tier_capability == CAPABILITY_CODES[capability_type]
+
+        # Scalar version uses `min or 0` and `max or inf`
+        min_area = np.where(np.isnan(arrays.tier_min_area), 0.0, arrays.tier_min_area)
+        max_area = np.where(
+            np.isnan(arrays.tier_max_area) | (arrays.tier_max_area == 0),
+            np.inf,
+            arrays.tier_max_area
+        )
+        fits = same_capability & (min_area <= project_area_sqft) & (project_area_sqft <= max_area)
+
+        fitting_rows = np.zeros(len(arrays), dtype=bool)
+        fitting_rows[arrays.tier_owner[fits]] = True
+
+        # Candidates without any tier fall through to the same neutral 0.5
+        return np.where(fitting_rows, 1.0, 0.5)
+
+    @staticmethod
+    def pricing_scores(
+        arrays: CandidateArrays,
+        project_area_sqft: float,
+        capability_type: CapabilityType
+    ) -> np.ndarray:
+        """Vector form of calculate_pricing_score"""
+        same_capability = arrays.tier_capability == CAPABILITY_CODES[capability_type]
+
+        # Scalar version only skips bounds that are None
+        above_min = np.isnan(arrays.tier_min_area) | (project_area_sqft >= arrays.tier_min_area)
+        below_max = np.isnan(arrays.tier_max_area) | (project_area_sqft <= arrays.tier_max_area)
+        applicable = same_capability & above_min & below_max
+
+        owners = arrays.tier_owner[applicable]
+        price_sum = np.bincount(owners, weights=arrays.tier_price[applicable], minlength=len(arrays))
+        price_count = np.bincount(owners, minlength=len(arrays))
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            avg_price = price_sum / price_count
+        normalized = np.maximum(0, np.minimum(1, 1 - (avg_price - 1000) / 4000))
+
+        return np.where(price_count > 0, normalized, 0.5)
+
+    @staticmethod
+    def score(
+        arrays: CandidateArrays,
+        project_type: ProjectType,
+        property_city: str,
+        project_area_sqft: float,
+        verification_score: float,
+        capability_type: Optional[CapabilityType] = None,
+        plot_coordinates: Optional[Tuple[float, float]] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Compute every component and the weighted total for all candidates
+
+        verification_score depends only on the property, so it is computed once
+        with MatchingService.calculate_verification_score and broadcast.
+        """
+        if capability_type is None:
+            capability_type = PROJECT_CAPABILITY_MAP.get(project_type, CapabilityType.CONSTRUCTION)
+
+        project_type_score = ScoringKernel.project_type_scores(arrays, project_type)
+        location_score = ScoringKernel.location_scores(
+            arrays, property_city, plot_coordinates, capability_type
+        )
+        project_size_score = ScoringKernel.project_size_scores(arrays, project_area_sqft, capability_type)
+        pricing_score = ScoringKernel.pricing_scores(arrays, project_area_sqft, capability_type)
+        capability_score = ScoringKernel.capability_scores(arrays, project_type)
+        verification = np.full(len(arrays), verification_score, dtype=np.float64)
+
+        # Same summation order as the scalar path so totals match bit for bit
+        total_score = (
+            project_type_score * MATCH_WEIGHTS["project_type"] +
+            location_score * MATCH_WEIGHTS["location"] +
+            project_size_score * MATCH_WEIGHTS["project_size"] +
+            pricing_score * MATCH_WEIGHTS["pricing"] +
+            capability_score * MATCH_WEIGHTS["capability"] +
+            verification * MATCH_WEIGHTS["verification"]
+        )
+
+        return {
+            "project_type_score": project_type_score,
+            "location_score": location_score,
+            "project_size_score": project_size_score,
+            "pricing_score": pricing_score,
+            "capability_score": capability_score,
+            "verification_score": verification,
+            "total_score": total_score
+        }
@@ -0,0 +1,236 @@
+"""
+Razorpay webhook inbox
+
+The webhook endpoint only appends the raw delivery to webhook_events, keyed
+by Razorpay's event id so redeliveries are dropped on insert, and
+acknowledges. A consumer claims unprocessed events in batches, groups them
+by order id, and applies the resulting Transaction status changes and
+feasibility unlocks with one commit per batch. An event can arrive before
+its order's transaction is committed; it stays unprocessed and is retried
+with exponential backoff until the transaction exists.
+"""
+import asyncio
+import hashlib
+import logging
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Set
+from uuid import uuid4
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import or_, select, update
+from app.config import settings
+from app.database import AsyncSessionLocal, insert_ignore_conflicts
+from app.models.landowner import Project
+from app.models.payment import Transaction, WebhookEvent
+from app.models.verification import FeasibilityReport
+from app.services.payment_service import PaymentService
+from app.utils.constants import TransactionType, TransactionStatus
+
+logger = logging.getLogger(__name__)
+
+
+def _payment_entity(payload: Dict[str, Any]) -> Dict[str, Any]:
+    return payload.get("payload", {}).get("payment", {}).get("entity", {}) or {}
+
+
+class WebhookInboxService:
+    """Service for recording and applying Razorpay webhook events"""
+
+    @staticmethod
+    async def record(
+        db: AsyncSession,
+        body: bytes,
+        payload: Dict[str, Any],
+        event_id: Optional[str] = None
+    ) -> None:
+        """
+        Append a delivery to the inbox; a repeated event id is ignored
+        Deliveries without an event id are keyed by a digest of the body.
+        get_db commits before the acknowledgement is sent.
+        """
+        await db.execute(
+            insert_ignore_conflicts(WebhookEvent.__table__, db.bind.dialect.name),
+            [{
+                "id": uuid4(),
+                "event_id": event_id or hashlib.sha256(body).hexdigest(),
+                "event": payload.get("event"),
+                "razorpay_order_id": _payment_entity(payload).get("order_id"),
+                "payload": payload,
+                "created_at": datetime.utcnow(),
+                "processed_at": None
+            }]
+        )
+
+    @staticmethod
+    async def run_batch(batch_size: Optional[int] = None) -> int:
+        """
+        Claim up to batch_size due events, apply them and mark the applied ones processed
+        Events whose order has no transaction yet are rescheduled instead.
+        Returns the number of events claimed
+        """
+        batch_size = batch_size or settings.webhook_batch_size
+
+        async with AsyncSessionLocal() as db:
+            now = datetime.utcnow()
+            result = await db.execute(
+                select(
+                    WebhookEvent.id, WebhookEvent.event, WebhookEvent.razorpay_order_id,
+                    WebhookEvent.payload, WebhookEvent.attempts
+                )
+                .where(
+                    WebhookEvent.processed_at.is_(None),
+                    or_(WebhookEvent.next_attempt_at.is_(None), WebhookEvent.next_attempt_at <= now)
+                )
+                .order_by(WebhookEvent.created_at)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            events = result.all()
+            if not events:
+                await db.rollback()
+                return 0
+
+            events_by_order: Dict[str, List] = defaultdict(list)
+            for event in events:
+                if event.razorpay_order_id:
+                    events_by_order[event.razorpay_order_id].append(event)
+
+            matched = await WebhookInboxService.apply(db, events_by_order)
+            pending = [event for event in events if event.razorpay_order_id and event.razorpay_order_id not in matched]
+            pending_ids = {event.id for event in pending}
+            processed = [event.id for event in events if event.id not in pending_ids]
+            if processed:
+                await db.execute(
+                    update(WebhookEvent).where(WebhookEvent.id.in_(processed)).values(processed_at=now)
+                )
+            await WebhookInboxService._reschedule(db, pending, now)
+            await db.commit()
+
+        return len(events)
+
+    @staticmethod
+    async def apply(db: AsyncSession, events_by_order: Dict[str, List]) -> Set[str]:
+        """
+        Apply each order's events, oldest first, to its transaction
+        A captured payment is final: later failed attempts do not undo it.
+        Returns the order ids that have a transaction; the events of the
+        others were not applied.
+        """
+        if not events_by_order:
+            return set()
+
+        result = await db.execute(
+            select(Transaction).where(Transaction.razorpay_order_id.in_(list(events_by_order)))
+        )
+        transactions = {transaction.razorpay_order_id: transaction for transaction in result.scalars().all()}
+
+        unlock_project_ids = set()
+        for order_id, events in events_by_order.items():
+            transaction = transactions.get(order_id)
+            if transaction is None:
+                continue
+
+            status = transaction.status
+            payment_id = transaction.razorpay_payment_id
+            for event in events:
+                if event.event == "payment.captured":
+                    status = TransactionStatus.SUCCESS
+                    payment_id = _payment_entity(event.payload).get("id") or payment_id
+                elif event.event == "payment.failed" and status != TransactionStatus.SUCCESS:
+                    status = TransactionStatus.FAILED
+
+            if status == transaction.status and payment_id == transaction.razorpay_payment_id:
+                continue
+            if (
+                status == TransactionStatus.SUCCESS and
+                transaction.status != TransactionStatus.SUCCESS and
+                transaction.transaction_type == TransactionType.FEASIBILITY_UNLOCK and
+                transaction.project_id
+            ):
+                unlock_project_ids.add(transaction.project_id)
+            transaction.status = status
+            transaction.razorpay_payment_id = payment_id
+
+        if unlock_project_ids:
+            await WebhookInboxService._unlock_feasibility(db, unlock_project_ids)
+        return set(transactions)
+
+    @staticmethod
+    async def _reschedule(db: AsyncSession, events: List, now: datetime) -> None:
+        """Retry events whose order has no transaction yet, one statement per attempt count"""
+        by_attempts: Dict[int, List] = defaultdict(list)
+        for event in events:
+            by_attempts[event.attempts].append(event.id)
+        for attempts, event_ids in by_attempts.items():
+            delay = min(
+                settings.webhook_retry_base_seconds * (2 ** min(attempts, 20)),
+                settings.webhook_retry_max_seconds
+            )
+            await db.execute(
+                update(WebhookEvent)
+                .where(WebhookEvent.id.in_(event_ids))
+                .values(attempts=attempts + 1, next_attempt_at=now + timedelta(seconds=delay))
+            )
+        if events:
+            logger.warning("%d webhook events wait for their order's transaction", len(events))
+
+    @staticmethod
+    async def _unlock_feasibility(db: AsyncSession, project_ids: set) -> None:
+        """Unlock the feasibility reports of the projects' properties in one statement"""
+        property_ids = select(Project.property_id).where(Project.id.in_(list(project_ids)))
+        await db.execute(
+            update(FeasibilityReport)
+            .where(FeasibilityReport.property_id.in_(property_ids))
+            .values(is_unlocked=True)
+        )
+
+    @staticmethod
+    async def reconcile_orders() -> int:
+        """Attach orders to PENDING transactions that never stored one, so their webhooks match"""
+        async with AsyncSessionLocal() as db:
+            settled = await PaymentService().reconcile_pending_orders(
+                db, settings.payment_reconcile_after_seconds
+            )
+            await db.commit()
+        return settled
+
+    @staticmethod
+    async def run_worker(
+        stop_event: asyncio.Event,
+        poll_seconds: Optional[float] = None
+    ) -> None:
+        """
+        Drain the inbox in batches until stop_event is set, reconciling
+        orders whose id was never stored every payment_reconcile_interval_seconds
+        """
+        poll_seconds = poll_seconds or settings.webhook_poll_seconds
+        batch_size = settings.webhook_batch_size
+        reconcile_interval = settings.payment_reconcile_interval_seconds
+        next_reconcile = time.monotonic()
+        logger.info("Webhook inbox worker started")
+
+        while not stop_event.is_set():
+            if reconcile_interval > 0 and time.monotonic() >= next_reconcile:
+                next_reconcile = time.monotonic() + reconcile_interval
+                try:
+                    await WebhookInboxService.reconcile_orders()
+                except Exception:
+                    logger.exception("Payment order reconcile failed")
+
+            try:
+                processed = await WebhookInboxService.run_batch(batch_size)
+            except Exception:
+                logger.exception("Webhook inbox batch failed")
+                processed = 0
+
+            # A full batch means more are probably waiting
+            if processed >= batch_size:
+                continue
+
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+        logger.info("Webhook inbox worker stopped")
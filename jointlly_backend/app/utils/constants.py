@@ -55,6 +55,22 @@ class MatchStatus(str, Enum):
     REJECTED = "REJECTED"
 
 
+class JobStatus(str, Enum):
+    """Background job status"""
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+
+
+class RescoreComponent(str, Enum):
+    """Match score component invalidated by a write"""
+    LOCATION = "LOCATION"  # location_score
+    PRICING = "PRICING"  # project_size_score, pricing_score
+    CAPABILITY = "CAPABILITY"  # project_type_score, capability_score
+    VERIFICATION = "VERIFICATION"  # verification_score
+
+
 class TransactionType(str, Enum):
     """Transaction types"""
     PID_VERIFICATION = "PID_VERIFICATION"
@@ -170,6 +186,14 @@ MATCH_WEIGHTS = {
     "verification": 0.10,
 }
 
+# Capability a professional needs to be matched to each project type
+PROJECT_CAPABILITY_MAP = {
+    ProjectType.CONTRACT_CONSTRUCTION: CapabilityType.CONSTRUCTION,
+    ProjectType.INTERIOR: CapabilityType.INTERIOR,
+    ProjectType.RECONSTRUCTION: CapabilityType.RECONSTRUCTION,
+    ProjectType.JV_JD: CapabilityType.JV_JD,
+}
+
 # FAR constants for Bengaluru
 BENGALURU_FAR_MIN = 1.5
 BENGALURU_FAR_MAX = 3.25
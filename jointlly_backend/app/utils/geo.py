@@ -0,0 +1,134 @@
+"""
+Geospatial helpers: map pin parsing, geohash grid cells and vectorized haversine
+"""
+import math
+import re
+from typing import List, Optional, Tuple
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE_LAT = 111.32
+
+# Precision 4 cells are roughly 39 km x 19.5 km at the equator
+GEOHASH_PRECISION = 4
+_GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+# "@12.97,77.59,15z" / "?q=12.97,77.59" / "12.97, 77.59"; decimals are
+# required so house numbers and road names ("No. 45, 100 Feet Road") never match
+_PAIR_PATTERN = re.compile(r"(?<![\d.])(-?\d{1,3}\.\d+)\s*,\s*(-?\d{1,3}\.\d+)(?![\d.])")
+# "!3d12.97!4d77.59" (place URLs)
+_PLACE_PATTERN = re.compile(r"!3d(-?\d{1,3}\.\d+)!4d(-?\d{1,3}\.\d+)")
+
+
+def parse_coordinates(pin: Optional[str]) -> Optional[Tuple[float, float]]:
+    """
+    Extract (latitude, longitude) from a Google Maps pin or URL
+    Returns None for short links and anything without explicit decimal
+    coordinates; out-of-range pairs are skipped in favour of a later one.
+    """
+    if not pin:
+        return None
+
+    for pattern in (_PLACE_PATTERN, _PAIR_PATTERN):
+        for match in pattern.finditer(pin):
+            latitude, longitude = float(match.group(1)), float(match.group(2))
+            if -90 <= latitude <= 90 and -180 <= longitude <= 180:
+                return latitude, longitude
+    return None
+
+
+def _cell_bits(precision: int) -> Tuple[int, int]:
+    """Number of (latitude, longitude) bits in a geohash of this length"""
+    total = precision * 5
+    return total // 2, total - total // 2
+
+
+def geohash_encode(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    """Standard base32 geohash of a point"""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    value = 0
+    bit = 0
+    even = True
+
+    while len(chars) < precision:
+        if even:
+            mid = (lon_range[0] + lon_range[1]) / 2
+            if longitude >= mid:
+                value = (value << 1) | 1
+                lon_range[0] = mid
+            else:
+                value <<= 1
+                lon_range[1] = mid
+        else:
+            mid = (lat_range[0] + lat_range[1]) / 2
+            if latitude >= mid:
+                value = (value << 1) | 1
+                lat_range[0] = mid
+            else:
+                value <<= 1
+                lat_range[1] = mid
+        even = not even
+        bit += 1
+        if bit == 5:
+            chars.append(_GEOHASH_ALPHABET[value])
+            value = 0
+            bit = 0
+
+    return "".join(chars)
+
+
+def geohash_cells_covering(
+    latitude: float,
+    longitude: float,
+    radius_km: float,
+    precision: int = GEOHASH_PRECISION
+) -> List[str]:
+    """Geohash cells overlapping the bounding box of a circle"""
+    lat_bits, lon_bits = _cell_bits(precision)
+    lat_step = 180.0 / (1 << lat_bits)
+    lon_step = 360.0 / (1 << lon_bits)
+
+    lat_delta = radius_km / KM_PER_DEGREE_LAT
+    south = max(-90.0, latitude - lat_delta)
+    north = min(90.0, latitude + lat_delta)
+
+    # Longitude degrees shrink towards the poles; widest at the edge nearest a pole
+    widest_lat = min(89.9, max(abs(south), abs(north)))
+    lon_delta = radius_km / (KM_PER_DEGREE_LAT * math.cos(math.radians(widest_lat)))
+    if lon_delta >= 180.0:
+        west, east = -180.0, 180.0 - lon_step / 2
+    else:
+        west, east = longitude - lon_delta, longitude + lon_delta
+
+    # Snap to cell centres so each cell is visited once
+    first_row = math.floor((south + 90.0) / lat_step)
+    last_row = min(math.floor((north + 90.0) / lat_step), (1 << lat_bits) - 1)
+    first_col = math.floor((west + 180.0) / lon_step)
+    last_col = math.floor((east + 180.0) / lon_step)
+
+    cells = set()
+    for row in range(first_row, last_row + 1):
+        cell_lat = -90.0 + (row + 0.5) * lat_step
+        for col in range(first_col, last_col + 1):
+            # Wrap across the antimeridian
+            cell_lon = -180.0 + ((col % (1 << lon_bits)) + 0.5) * lon_step
+            cells.add(geohash_encode(cell_lat, cell_lon, precision))
+    return sorted(cells)
+
+
+def haversine_km(
+    latitude: float,
+    longitude: float,
+    latitudes: np.ndarray,
+    longitudes: np.ndarray
+) -> np.ndarray:
+    """Great-circle distance from one point to many, in kilometers"""
+    lat1 = math.radians(latitude)
+    lat2 = np.radians(latitudes)
+    dlat = lat2 - lat1
+    dlon = np.radians(longitudes) - math.radians(longitude)
+
+    a = np.sin(dlat / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
@@ -1,12 +1,65 @@
 """
 JWT token encoding and decoding utilities
 """
+import hashlib
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from jose import JWTError, jwt
 from app.config import settings
 
 
+class VerifiedTokenCache:
+    """
+    Bounded LRU of verified token payloads keyed by the token's SHA-256
+    Entries expire at the token's own exp claim
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, key: bytes) -> Optional[Dict[str, Any]]:
+        """Cached payload, or None when missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.time():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: bytes, payload: Dict[str, Any]) -> None:
+        """Cache a verified payload; tokens without exp are not cached"""
+        expires_at = payload.get("exp")
+        if self.max_entries <= 0 or not isinstance(expires_at, (int, float)):
+            return
+        self._entries[key] = (expires_at, payload)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every entry"""
+        self._entries.clear()
+
+    def metrics(self) -> dict:
+        """Size and hit counters"""
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+token_cache = VerifiedTokenCache(settings.jwt_decode_cache_max_entries)
+
+
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """
     Create JWT access token
@@ -50,13 +103,22 @@ def create_refresh_token(data: Dict[str, Any]) -> str:
 def decode_token(token: str) -> Dict[str, Any]:
     """
     Decode and verify JWT token
+    Repeat verifications of a still-valid token are served from token_cache
     """
+    key = VerifiedTokenCache.key(token)
+    if token_cache.max_entries > 0:
+        cached = token_cache.get(key)
+        if cached is not None:
+            return dict(cached)
+    
     try:
         payload = jwt.decode(
             token,
             settings.jwt_secret_key,
             algorithms=[settings.jwt_algorithm]
         )
-        return payload
     except JWTError:
         raise ValueError("Invalid token")
+    
+    token_cache.put(key, dict(payload))
+    return payload
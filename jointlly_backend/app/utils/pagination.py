@@ -0,0 +1,24 @@
+"""
+Keyset pagination cursors
+"""
+import base64
+import json
+from typing import Tuple
+from uuid import UUID
+from app.exceptions import ValidationError
+
+
+def encode_score_cursor(score: float, row_id: UUID) -> str:
+    """Opaque cursor for the row after which the next page starts"""
+    payload = json.dumps({"s": score, "id": str(row_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_score_cursor(cursor: str) -> Tuple[float, UUID]:
+    """Decode a cursor produced by encode_score_cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return float(payload["s"]), UUID(payload["id"])
+    except (ValueError, KeyError, TypeError):
+        raise ValidationError("Invalid pagination cursor")
@@ -1,9 +1,24 @@
 """
 Password hashing utilities using PBKDF2 (more compatible than bcrypt)
+
+PBKDF2 takes tens of milliseconds per call, so request handlers use the
+async wrappers, which run it on a small dedicated thread pool (hashlib
+releases the GIL while hashing). When more calls are waiting than the
+queue limit allows, new ones fail fast with ServiceUnavailableError.
 """
+import asyncio
 import hashlib
 import secrets
 import base64
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Deque, Optional, TypeVar
+from app.config import settings
+from app.exceptions import ServiceUnavailableError
+
+T = TypeVar("T")
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -57,3 +72,106 @@ def get_password_hash(password: str) -> str:
     hash_b64 = base64.b64encode(password_hash).decode('ascii')
     
     return f"{algorithm}${iterations}${salt_b64}${hash_b64}"
+
+
+def _percentile(samples: Deque[float], fraction: float) -> Optional[float]:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 3)
+
+
+class PasswordHasherPool:
+    """Size-limited executor for password hashing with backpressure and metrics"""
+    
+    def __init__(self, max_workers: int, queue_limit: int, sample_size: int = 1024):
+        self.max_workers = max_workers
+        self.queue_limit = queue_limit
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+        # Updated from the hashing threads; guarded by _lock with the samples
+        self._lock = threading.Lock()
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        # Recent wait (queued) and run (hashing) times in milliseconds
+        self._wait_ms: Deque[float] = deque(maxlen=sample_size)
+        self._run_ms: Deque[float] = deque(maxlen=sample_size)
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="password-hash"
+            )
+        return self._executor
+    
+    async def run(self, func: Callable[..., T], *args) -> T:
+        """Run func(*args) on the pool; 503 when the queue is saturated"""
+        # Everything beyond the busy workers is waiting in the queue
+        if self._pending - self.max_workers >= self.queue_limit:
+            self._rejected += 1
+            raise ServiceUnavailableError("Authentication is busy, please retry shortly")
+        
+        self._pending += 1
+        submitted = time.perf_counter()
+        
+        def timed() -> T:
+            started = time.perf_counter()
+            with self._lock:
+                self._running += 1
+            try:
+                return func(*args)
+            finally:
+                finished = time.perf_counter()
+                with self._lock:
+                    self._running -= 1
+                    self._wait_ms.append((started - submitted) * 1000)
+                    self._run_ms.append((finished - started) * 1000)
+        
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._get_executor(), timed)
+        finally:
+            self._pending -= 1
+            self._completed += 1
+    
+    def metrics(self) -> dict:
+        """Queue depth, throughput counters and recent latency percentiles"""
+        with self._lock:
+            running = self._running
+            wait_ms = deque(self._wait_ms)
+            run_ms = deque(self._run_ms)
+        return {
+            "workers": self.max_workers,
+            "queue_limit": self.queue_limit,
+            "queue_depth": max(0, self._pending - running),
+            "in_flight": running,
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "wait_ms_p50": _percentile(wait_ms, 0.50),
+            "wait_ms_p95": _percentile(wait_ms, 0.95),
+            "run_ms_p50": _percentile(run_ms, 0.50),
+            "run_ms_p95": _percentile(run_ms, 0.95),
+        }
+    
+    def shutdown(self) -> None:
+        """Stop the worker threads"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+password_pool = PasswordHasherPool(
+    max_workers=settings.password_hash_workers,
+    queue_limit=settings.password_hash_queue_limit
+)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the password hashing pool"""
+    return await password_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash on the password hashing pool"""
+    return await password_pool.run(get_password_hash, password)
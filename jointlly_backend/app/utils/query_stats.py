@@ -0,0 +1,173 @@
+"""
+Per-request SQL statement statistics and N+1 detection
+
+Engine events count every statement, its time on the database and its
+shape (the SQL with IN-lists collapsed) for whatever is being tracked in
+the current context. QueryStatsMiddleware tracks each HTTP request, adds
+Server-Timing and X-DB-Queries response headers, and logs a warning when
+a route issues too many statements or repeats one shape, the usual sign
+of a query inside a loop. query_budget() asserts the same limits in tests.
+"""
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Placeholder styles of the drivers in use: ?, %s, %(name)s, $1, :name
+_PLACEHOLDER = r"(?:\?|%s|%\(\w+\)s|\$\d+|:\w+)"
+_IN_LIST = re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+# Everything being tracked in this context; nested trackers all see a statement
+_active: ContextVar[Tuple["QueryStats", ...]] = ContextVar("query_stats", default=())
+
+
+def statement_shape(statement: str) -> str:
+    """SQL with whitespace normalized and expanded IN-lists collapsed"""
+    return _IN_LIST.sub("(...)", _WHITESPACE.sub(" ", statement).strip())
+
+
+@dataclass
+class QueryStats:
+    """Statements issued while tracking"""
+    statements: int = 0
+    duration_ms: float = 0.0
+    shapes: Counter = field(default_factory=Counter)
+
+    def record(self, statement: str, duration_ms: float) -> None:
+        self.statements += 1
+        self.duration_ms += duration_ms
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Shapes issued at least threshold times, most frequent first"""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+
+class QueryBudgetExceeded(AssertionError):
+    """More statements, or more repeats of one statement, than allowed"""
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collect the statements issued in this context (and tasks it starts)"""
+    stats = QueryStats()
+    token = _active.set(_active.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _active.reset(token)
+
+
+@contextmanager
+def query_budget(max_statements: Optional[int] = None, max_repeats: Optional[int] = None) -> Iterator[QueryStats]:
+    """
+    Track statements and raise QueryBudgetExceeded on exit if the block
+    issued more than max_statements, or any one shape more than max_repeats times
+    """
+    with track_queries() as stats:
+        yield stats
+
+    if max_statements is not None and stats.statements > max_statements:
+        raise QueryBudgetExceeded(
+            f"{stats.statements} statements issued, budget is {max_statements}:\n"
+            + _format_shapes(stats.shapes.most_common())
+        )
+    if max_repeats is not None:
+        repeated = stats.repeated(max_repeats + 1)
+        if repeated:
+            raise QueryBudgetExceeded(
+                f"Statements repeated more than {max_repeats} times:\n" + _format_shapes(repeated)
+            )
+
+
+def _format_shapes(shapes: List[Tuple[str, int]]) -> str:
+    return "\n".join(f"  {count}x {shape[:200]}" for shape, count in shapes)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _active.get():
+        conn.info.setdefault("query_stats_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    trackers = _active.get()
+    started = conn.info.get("query_stats_started")
+    if not trackers or not started:
+        return
+    duration_ms = (time.perf_counter() - started.pop()) * 1000
+    for stats in trackers:
+        stats.record(statement, duration_ms)
+
+
+def _handle_error(exception_context) -> None:
+    # A failed statement never reaches after_cursor_execute
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_stats_started"):
+        conn.info["query_stats_started"].pop()
+
+
+def install_query_stats(sync_engine: Engine) -> None:
+    """Attach the statement listeners to an engine (once)"""
+    if not event.contains(sync_engine, "after_cursor_execute", _after_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(sync_engine, "handle_error", _handle_error)
+
+
+class QueryStatsMiddleware:
+    """Reports each request's statements in headers and logs N+1 suspects"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        warn_threshold: Optional[int] = None,
+        repeat_threshold: Optional[int] = None
+    ):
+        self.app = app
+        self.warn_threshold = settings.query_warn_threshold if warn_threshold is None else warn_threshold
+        self.repeat_threshold = settings.query_repeat_threshold if repeat_threshold is None else repeat_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+            async def send_with_stats(message: Message) -> None:
+                # get_db has committed by now, so the counts are complete
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers.append("X-DB-Queries", str(stats.statements))
+                    headers.append(
+                        "Server-Timing",
+                        f'db;dur={stats.duration_ms:.1f};desc="{stats.statements} queries"'
+                    )
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_stats)
+            finally:
+                self._check(scope, stats)
+
+    def _check(self, scope: Scope, stats: QueryStats) -> None:
+        route = scope.get("route")
+        endpoint = f"{scope['method']} {getattr(route, 'path', scope['path'])}"
+        if stats.statements > self.warn_threshold:
+            logger.warning(
+                "%s issued %d statements (%.1f ms), threshold is %d",
+                endpoint, stats.statements, stats.duration_ms, self.warn_threshold
+            )
+        for shape, count in stats.repeated(self.repeat_threshold):
+            logger.warning("%s repeated a statement %d times (possible N+1): %s", endpoint, count, shape[:200])
@@ -0,0 +1,36 @@
+"""
+One-off credibility score recompute across all professionals
+
+Usage (e.g. after changing CredibilityService.WEIGHTS):
+    python -m app.workers.credibility_recompute [--batch-size N]
+
+The standalone matching worker also runs this every
+CREDIBILITY_RECOMPUTE_INTERVAL_SECONDS.
+"""
+import argparse
+import asyncio
+import logging
+from typing import Optional
+from app.database import close_db
+from app.services.credibility_service import CredibilityService
+
+
+async def run(batch_size: Optional[int]) -> int:
+    try:
+        return await CredibilityService.recompute_all(batch_size)
+    finally:
+        await close_db()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Recompute every professional's credibility score")
+    parser.add_argument("--batch-size", type=int, default=None, help="Professionals per page")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    changed = asyncio.run(run(args.batch_size))
+    logging.getLogger(__name__).info("Credibility recompute finished: %d scores changed", changed)
+
+
+if __name__ == "__main__":
+    main()
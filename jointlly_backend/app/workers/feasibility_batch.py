@@ -0,0 +1,93 @@
+"""
+Offline batch FAR and feasibility evaluation
+
+Reads plots from a CSV (columns: reference, property_id, width_ft,
+length_ft, road_width_ft, zone_type; all but the dimensions optional, and
+dimensions may be left empty when property_id is set) and writes one
+result row per plot.
+
+Usage:
+    python -m app.workers.feasibility_batch land_bank.csv --out results.csv [--persist]
+
+--persist stores FAR calculations and feasibility reports for rows with a
+property_id in one transaction.
+"""
+import argparse
+import asyncio
+import csv
+import sys
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+from app.database import AsyncSessionLocal, close_db
+from app.services.feasibility_batch_service import FeasibilityBatchService
+
+RESULT_COLUMNS = [
+    "reference", "property_id", "width_ft", "length_ft", "road_width_ft", "zone_type",
+    "plot_area_sqft", "calculated_far", "max_far", "premium_far_available", "total_buildable_area_sqft",
+    "plot_category", "front_setback_m", "rear_setback_m", "side_setback_m", "net_buildable_area_sqft",
+    "allowed_floors", "number_of_units", "saleable_area_sqft",
+]
+
+
+def _number(value: Optional[str]) -> Optional[float]:
+    return float(value) if value not in (None, "") else None
+
+
+def read_plots(lines) -> List[Dict[str, Any]]:
+    """Parse CSV rows into plot dicts"""
+    plots = []
+    for row in csv.DictReader(lines):
+        plots.append({
+            "reference": row.get("reference") or None,
+            "property_id": UUID(row["property_id"]) if row.get("property_id") else None,
+            "width_ft": _number(row.get("width_ft")),
+            "length_ft": _number(row.get("length_ft")),
+            "road_width_ft": _number(row.get("road_width_ft")),
+            "zone_type": row.get("zone_type") or None,
+        })
+    return plots
+
+
+async def run(plots: List[Dict[str, Any]], persist: bool) -> List[Dict[str, Any]]:
+    """Evaluate the plots; only touches the database when it has to"""
+    if not persist and not any(plot["property_id"] for plot in plots):
+        return FeasibilityBatchService.compute(await FeasibilityBatchService.resolve_plots(None, plots))
+
+    try:
+        async with AsyncSessionLocal() as db:
+            results, persisted = await FeasibilityBatchService.evaluate(db, plots, persist=persist)
+            await db.commit()
+    finally:
+        await close_db()
+    if persist:
+        print(f"stored {persisted} FAR calculations and feasibility reports", file=sys.stderr)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Batch FAR and feasibility evaluation")
+    parser.add_argument("csv", nargs="?", help="Input CSV (default: stdin)")
+    parser.add_argument("--out", help="Output CSV (default: stdout)")
+    parser.add_argument("--persist", action="store_true", help="Store results for rows with a property_id")
+    args = parser.parse_args()
+
+    if args.csv:
+        with open(args.csv, newline="", encoding="utf-8") as f:
+            plots = read_plots(f)
+    else:
+        plots = read_plots(sys.stdin)
+
+    results = asyncio.run(run(plots, args.persist))
+
+    out = open(args.out, "w", newline="", encoding="utf-8") if args.out else sys.stdout
+    try:
+        writer = csv.DictWriter(out, fieldnames=RESULT_COLUMNS)
+        writer.writeheader()
+        writer.writerows(results)
+    finally:
+        if args.out:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
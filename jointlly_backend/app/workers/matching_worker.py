@@ -0,0 +1,62 @@
+"""
+Standalone matching job, match re-scoring, webhook inbox and scheduled
+credibility recompute worker
+
+Usage:
+    python -m app.workers.matching_worker [--concurrency N] [--poll-seconds S]
+
+Set MATCHING_WORKER_IN_PROCESS=false and WEBHOOK_WORKER_IN_PROCESS=false on
+the API servers when running this.
+"""
+import argparse
+import asyncio
+import logging
+import signal
+import socket
+import os
+from app.config import settings
+from app.database import close_db
+from app.services.credibility_service import CredibilityService
+from app.services.matching_job_service import MatchingJobService
+from app.services.match_rescore_service import MatchRescoreService
+from app.services.webhook_inbox_service import WebhookInboxService
+
+
+async def run(concurrency: int, poll_seconds: float) -> None:
+    """Run worker loops until SIGINT/SIGTERM"""
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop_event.set)
+        except NotImplementedError:
+            # Windows: fall back to KeyboardInterrupt
+            pass
+
+    base_id = f"{socket.gethostname()}:{os.getpid()}"
+    workers = [
+        MatchingJobService.run_worker(f"{base_id}:{index}", stop_event, poll_seconds)
+        for index in range(concurrency)
+    ]
+    workers.append(MatchRescoreService.run_worker(stop_event))
+    workers.append(WebhookInboxService.run_worker(stop_event))
+    if settings.credibility_recompute_interval_seconds > 0:
+        workers.append(CredibilityService.run_worker(stop_event))
+    try:
+        await asyncio.gather(*workers)
+    finally:
+        await close_db()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run matching job workers")
+    parser.add_argument("--concurrency", type=int, default=1, help="Parallel worker loops")
+    parser.add_argument("--poll-seconds", type=float, default=2.0, help="Idle delay between polls")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    asyncio.run(run(args.concurrency, args.poll_seconds))
+
+
+if __name__ == "__main__":
+    main()
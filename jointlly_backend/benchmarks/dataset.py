@@ -0,0 +1,167 @@
+"""
+Synthetic dataset for the load benchmarks
+
+Creates landowners with one property and one project each, and
+professionals with a capability, pricing tiers and a location preference
+around a handful of Bengaluru localities, so matching finds real
+candidates. Every user shares one password. The seed fixes plot sizes,
+locations and the project mix; ids and emails are fresh on every run.
+
+Usage (from jointlly_backend/, against a scratch database):
+    python -m benchmarks.dataset --landowners 200 --professionals 500 --create-schema
+"""
+import argparse
+import asyncio
+import random
+from dataclasses import dataclass, field
+from typing import List, Tuple
+from uuid import UUID, uuid4
+from app.database import AsyncSessionLocal, Base, engine
+from app.models.landowner import LandownerProfile, Project, Property
+from app.models.professional import Capability, LocationPreference, PricingTier, ProfessionalProfile
+from app.models.user import User
+from app.utils.constants import CapabilityType, ProjectStatus, ProjectType, Role
+from app.utils.password import get_password_hash
+
+PASSWORD = "Bench-passw0rd"
+
+# (name, latitude, longitude)
+LOCALITIES: List[Tuple[str, float, float]] = [
+    ("Indiranagar", 12.9784, 77.6408),
+    ("Jayanagar", 12.9299, 77.5826),
+    ("Whitefield", 12.9698, 77.7500),
+    ("Hebbal", 13.0358, 77.5970),
+    ("Electronic City", 12.8452, 77.6602),
+    ("Yelahanka", 13.1005, 77.5963),
+]
+
+PROJECT_TYPES = [
+    ProjectType.CONTRACT_CONSTRUCTION,
+    ProjectType.CONTRACT_CONSTRUCTION,
+    ProjectType.INTERIOR,
+    ProjectType.RECONSTRUCTION,
+]
+
+# Keep INSERT batches well under driver parameter limits
+CHUNK_SIZE = 500
+
+
+@dataclass
+class Account:
+    """A seeded user and the records the load driver needs"""
+    user_id: UUID
+    email: str
+    profile_id: UUID
+    project_ids: List[UUID] = field(default_factory=list)
+
+
+@dataclass
+class Dataset:
+    """Accounts created by generate()"""
+    landowners: List[Account]
+    professionals: List[Account]
+    password: str = PASSWORD
+
+
+def _jitter(rng: random.Random, value: float, spread: float = 0.03) -> float:
+    return value + rng.uniform(-spread, spread)
+
+
+async def generate(
+    landowners: int,
+    professionals: int,
+    published_ratio: float = 0.5,
+    seed: int = 42
+) -> Dataset:
+    """Insert the dataset and return its accounts"""
+    rng = random.Random(seed)
+    hashed_password = get_password_hash(PASSWORD)
+    run_id = uuid4().hex[:8]
+    rows: List = []
+    dataset = Dataset(landowners=[], professionals=[])
+
+    for i in range(landowners):
+        user = User(
+            id=uuid4(), email=f"landowner-{run_id}-{i}@bench.example", name=f"Landowner {i}",
+            hashed_password=hashed_password, role=Role.LANDOWNER, is_active="true"
+        )
+        profile = LandownerProfile(id=uuid4(), user_id=user.id, name=user.name, city="Bengaluru")
+        locality, latitude, longitude = rng.choice(LOCALITIES)
+        prop = Property(
+            id=uuid4(), landowner_id=profile.id, name=f"Plot {i}", city="Bengaluru", ward=locality,
+            latitude=_jitter(rng, latitude), longitude=_jitter(rng, longitude),
+            width_ft=rng.choice([30.0, 40.0, 50.0, 60.0]), length_ft=rng.choice([40.0, 60.0, 80.0]),
+            road_width_ft=rng.choice([20.0, 30.0, 40.0, 60.0]), pid_number=f"BENCH-{run_id}-{i}", tax_paid=True
+        )
+        project = Project(
+            id=uuid4(), property_id=prop.id, project_type=rng.choice(PROJECT_TYPES),
+            status=ProjectStatus.PUBLISHED if rng.random() < published_ratio else ProjectStatus.DRAFT
+        )
+        rows.extend([user, profile, prop, project])
+        dataset.landowners.append(Account(user.id, user.email, profile.id, [project.id]))
+
+    capability_types = [CapabilityType.CONSTRUCTION, CapabilityType.INTERIOR, CapabilityType.RECONSTRUCTION]
+    for i in range(professionals):
+        user = User(
+            id=uuid4(), email=f"professional-{run_id}-{i}@bench.example", name=f"Professional {i}",
+            hashed_password=hashed_password, role=Role.PROFESSIONAL, is_active="true"
+        )
+        locality, latitude, longitude = rng.choice(LOCALITIES)
+        profile = ProfessionalProfile(
+            id=uuid4(), user_id=user.id, company_name=f"Builder {i}", city="Bengaluru",
+            experience_years=rng.randint(1, 30), rera_experience=rng.random() < 0.4,
+            total_projects_completed=rng.randint(0, 80), location_preferences=[locality]
+        )
+        capability_type = capability_types[i % len(capability_types)]
+        rows.extend([
+            user,
+            profile,
+            Capability(id=uuid4(), professional_id=profile.id, capability_type=capability_type),
+            LocationPreference(
+                id=uuid4(), professional_id=profile.id, location_name=locality,
+                radius_km=rng.choice([10.0, 20.0, 40.0]), latitude=latitude, longitude=longitude
+            ),
+        ])
+        for min_area, max_area in ((0.0, 3000.0), (3000.0, 10000.0)):
+            rows.append(PricingTier(
+                id=uuid4(), professional_id=profile.id, capability_type=capability_type,
+                min_area_sqft=min_area, max_area_sqft=max_area,
+                price_per_sqft=round(rng.uniform(1500, 4000), 2)
+            ))
+        dataset.professionals.append(Account(user.id, user.email, profile.id))
+
+    async with AsyncSessionLocal() as db:
+        for start in range(0, len(rows), CHUNK_SIZE):
+            db.add_all(rows[start:start + CHUNK_SIZE])
+            await db.flush()
+        await db.commit()
+
+    return dataset
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    if args.create_schema:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    try:
+        dataset = await generate(args.landowners, args.professionals, args.published_ratio, args.seed)
+    finally:
+        await engine.dispose()
+    print(
+        f"created {len(dataset.landowners)} landowners and {len(dataset.professionals)} professionals "
+        f"(password {dataset.password!r})"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Seed a synthetic benchmark dataset")
+    parser.add_argument("--landowners", type=int, default=200)
+    parser.add_argument("--professionals", type=int, default=500)
+    parser.add_argument("--published-ratio", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--create-schema", action="store_true", help="Create tables first (scratch DB only)")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Latest-row benchmark: FAR calculation and feasibility report lookups
+
+Seeds properties that each carry a long history of FAR calculations and
+feasibility reports, then times the services' latest-row lookups (LIMIT 1
+on the (property_id, created_at DESC, id DESC) index) against loading the
+property's whole history ordered by created_at, as the lookups used to.
+
+Usage (from jointlly_backend/, against a scratch database):
+    python -m benchmarks.latest_report --create-schema --properties 50 --history 500
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Callable, List
+from uuid import UUID, uuid4
+from sqlalchemy import insert, select
+from app.database import AsyncSessionLocal, Base, engine
+from app.models.landowner import LandownerProfile, Property
+from app.models.user import User
+from app.models.verification import FARCalculation, FeasibilityReport
+from app.services.far_service import FARService
+from app.services.feasibility_service import FeasibilityService
+from app.utils.constants import Role
+
+
+async def seed(properties: int, history: int) -> List[UUID]:
+    """Create properties with history rows each; returns the property ids"""
+    user = User(
+        id=uuid4(), email=f"latest-{uuid4().hex[:8]}@bench.example", name="Bench",
+        hashed_password="-", role=Role.LANDOWNER, is_active="true"
+    )
+    profile = LandownerProfile(id=uuid4(), user_id=user.id, name="Bench")
+    property_ids = [uuid4() for _ in range(properties)]
+    started = datetime.utcnow() - timedelta(days=history)
+
+    async with AsyncSessionLocal() as db:
+        db.add_all([user, profile])
+        db.add_all([
+            Property(id=property_id, landowner_id=profile.id, city="Bengaluru", width_ft=40.0, length_ft=60.0)
+            for property_id in property_ids
+        ])
+        await db.flush()
+        for property_id in property_ids:
+            created = [started + timedelta(days=day) for day in range(history)]
+            await db.execute(insert(FARCalculation), [
+                {
+                    "id": uuid4(), "property_id": property_id, "road_width_ft": 30.0, "zone_type": "Residential",
+                    "calculated_far": 2.0, "total_buildable_area": 4800.0, "created_at": created_at
+                }
+                for created_at in created
+            ])
+            await db.execute(insert(FeasibilityReport), [
+                {
+                    "id": uuid4(), "property_id": property_id, "plot_category": "150-250 sq m",
+                    "allowed_floors": 2, "number_of_units": 4, "is_unlocked": False, "created_at": created_at
+                }
+                for created_at in created
+            ])
+        await db.commit()
+    return property_ids
+
+
+async def full_history(db, model, property_id: UUID):
+    """The previous access path: every row for the property, newest first"""
+    result = await db.execute(
+        select(model).where(model.property_id == property_id).order_by(model.created_at.desc())
+    )
+    return result.scalars().first()
+
+
+async def time_lookups(name: str, lookup: Callable, property_ids: List[UUID], lookups: int) -> None:
+    latencies = []
+    async with AsyncSessionLocal() as db:
+        for _ in range(lookups):
+            property_id = random.choice(property_ids)
+            started = time.perf_counter()
+            row = await lookup(db, property_id)
+            latencies.append((time.perf_counter() - started) * 1000)
+            assert row is not None
+            # Keep the identity map from serving later lookups
+            db.expunge_all()
+    latencies.sort()
+    print(
+        f"{name:<34} mean {sum(latencies) / len(latencies):8.3f} ms   "
+        f"p95 {latencies[int(len(latencies) * 0.95) - 1]:8.3f} ms"
+    )
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    if args.create_schema:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    try:
+        property_ids = await seed(args.properties, args.history)
+        print(f"{args.properties} properties x {args.history} rows of history, {args.lookups} lookups each")
+        await time_lookups("FAR latest (LIMIT 1)", FARService.get_far_calculation, property_ids, args.lookups)
+        await time_lookups(
+            "FAR full history",
+            lambda db, property_id: full_history(db, FARCalculation, property_id),
+            property_ids, args.lookups
+        )
+        await time_lookups(
+            "feasibility latest (LIMIT 1)", FeasibilityService.get_feasibility_report, property_ids, args.lookups
+        )
+        await time_lookups(
+            "feasibility full history",
+            lambda db, property_id: full_history(db, FeasibilityReport, property_id),
+            property_ids, args.lookups
+        )
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Latest FAR/feasibility row lookups")
+    parser.add_argument("--properties", type=int, default=50)
+    parser.add_argument("--history", type=int, default=500, help="Rows per property in each table")
+    parser.add_argument("--lookups", type=int, default=500)
+    parser.add_argument("--create-schema", action="store_true", help="Create tables first (scratch DB only)")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+"""
+Load benchmark: latency percentiles and throughput per endpoint
+
+Seeds a synthetic dataset (benchmarks.dataset), then drives each scenario
+through the FastAPI app in-process with a fixed number of concurrent
+clients and reports p50/p95/p99 latency and requests per second. Razorpay
+calls go to the in-process stub (benchmarks.razorpay_stub). Run it against
+a scratch Postgres database, or SQLite (sqlite+aiosqlite:///bench.db) as a
+stand-in; SQLite serialises writes, so compare only runs on the same engine.
+
+Usage (from jointlly_backend/):
+    DATABASE_URL=postgresql+asyncpg://localhost/jointly_bench \\
+        python -m benchmarks.load --create-schema --out baseline.json
+
+    # In CI: exit 1 when p95 or throughput regress past the tolerance
+    python -m benchmarks.load --create-schema --compare baseline.json --tolerance 0.25
+
+Compare runs only against a baseline from the same machine, database and
+dataset size.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List
+
+# The benchmark drains the matching queue itself
+os.environ.setdefault("MATCHING_WORKER_IN_PROCESS", "false")
+os.environ.setdefault("WEBHOOK_WORKER_IN_PROCESS", "false")
+
+import httpx
+from app.api.v1 import payments
+from app.config import settings
+from app.database import Base, engine
+from app.main import app
+from app.services.matching_job_service import MatchingJobService
+from app.services.razorpay_gateway import RazorpayGateway
+from app.utils.jwt import create_access_token
+from benchmarks.dataset import Account, Dataset, generate
+from benchmarks.razorpay_stub import sign_payment, stub_transport
+
+Request = Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]
+
+
+@dataclass
+class Result:
+    """Latencies and failures of one scenario"""
+    name: str
+    latencies_ms: List[float]
+    errors: int
+    elapsed_seconds: float
+
+    def summary(self) -> Dict[str, float]:
+        ordered = sorted(self.latencies_ms)
+        return {
+            "requests": len(ordered),
+            "errors": self.errors,
+            "rps": round(len(ordered) / self.elapsed_seconds, 1) if self.elapsed_seconds else 0.0,
+            "p50_ms": round(percentile(ordered, 50), 2),
+            "p95_ms": round(percentile(ordered, 95), 2),
+            "p99_ms": round(percentile(ordered, 99), 2),
+        }
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+def bearer(account: Account, role: str) -> Dict[str, str]:
+    token = create_access_token({"sub": str(account.user_id), "email": account.email, "role": role})
+    return {"Authorization": f"Bearer {token}"}
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    name: str,
+    request: Request,
+    requests: int,
+    concurrency: int
+) -> Result:
+    """Issue requests calls of request from concurrency clients"""
+    latencies: List[float] = []
+    errors = 0
+    next_index = iter(range(requests))
+
+    async def client_loop() -> None:
+        nonlocal errors
+        for i in next_index:
+            started = time.perf_counter()
+            try:
+                response = await request(client, i)
+                failed = response.status_code >= 400
+            except Exception:
+                failed = True
+            latencies.append((time.perf_counter() - started) * 1000)
+            errors += failed
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+    return Result(name, latencies, errors, time.perf_counter() - started)
+
+
+def build_scenarios(dataset: Dataset) -> List[tuple]:
+    """(name, request) pairs in the order they run; later ones use earlier state"""
+    landowners = dataset.landowners
+    landowner_headers = [bearer(account, "LANDOWNER") for account in landowners]
+    orders: List[Dict] = []
+
+    def landowner(i: int):
+        k = i % len(landowners)
+        return landowners[k], landowner_headers[k]
+
+    async def login(client, i):
+        account, _ = landowner(i)
+        return await client.post("/api/v1/auth/login", data={"username": account.email, "password": dataset.password})
+
+    async def me(client, i):
+        return await client.get("/api/v1/auth/me", headers=landowner(i)[1])
+
+    async def publish(client, i):
+        account, headers = landowner(i)
+        return await client.post(f"/api/v1/landowners/projects/{account.project_ids[0]}/publish", headers=headers)
+
+    async def list_matches(client, i):
+        account, headers = landowner(i)
+        return await client.get(f"/api/v1/matching/projects/{account.project_ids[0]}/matches", headers=headers)
+
+    async def calculate_far(client, i):
+        account, headers = landowner(i)
+        return await client.post(
+            f"/api/v1/projects/{account.project_ids[0]}/calculate-far", headers=headers, json={"road_width_ft": 30.0}
+        )
+
+    async def generate_feasibility(client, i):
+        account, headers = landowner(i)
+        return await client.post(f"/api/v1/projects/{account.project_ids[0]}/feasibility", headers=headers)
+
+    async def get_feasibility(client, i):
+        account, headers = landowner(i)
+        return await client.get(f"/api/v1/projects/{account.project_ids[0]}/feasibility", headers=headers)
+
+    async def create_order(client, i):
+        account, headers = landowner(i)
+        response = await client.post("/api/v1/payments/create-order", headers=headers, json={
+            "amount": 499.0, "transaction_type": "FEASIBILITY_UNLOCK", "project_id": str(account.project_ids[0])
+        })
+        if response.status_code < 400:
+            orders.append({**response.json(), "headers": headers})
+        return response
+
+    async def verify_payment(client, i):
+        order = orders[i % len(orders)]
+        payment_id = f"pay_bench{i:010d}"
+        return await client.post("/api/v1/payments/verify", headers=order["headers"], json={
+            "transaction_id": order["transaction_id"],
+            "razorpay_payment_id": payment_id,
+            "razorpay_signature": sign_payment(order["order_id"], payment_id)
+        })
+
+    return [
+        ("auth.login", login),
+        ("auth.me", me),
+        ("projects.publish", publish),
+        ("matching.list", list_matches),
+        ("projects.calculate_far", calculate_far),
+        ("projects.generate_feasibility", generate_feasibility),
+        ("projects.get_feasibility", get_feasibility),
+        ("payments.create_order", create_order),
+        ("payments.verify", verify_payment),
+    ]
+
+
+async def drain_matching_jobs() -> int:
+    """Run queued matching jobs to completion (not measured)"""
+    ran = 0
+    while await MatchingJobService.run_next("bench"):
+        ran += 1
+    return ran
+
+
+async def run(args: argparse.Namespace) -> Dict:
+    dataset = await generate(args.landowners, args.professionals, seed=args.seed)
+    payments.payment_service.gateway = RazorpayGateway(
+        settings.razorpay_key_id, settings.razorpay_key_secret, "http://razorpay-stub",
+        timeout_seconds=5, max_retries=0, backoff_seconds=0, max_connections=args.concurrency,
+        transport=stub_transport(latency_ms=args.razorpay_latency_ms)
+    )
+
+    results: Dict[str, Dict] = {}
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, request in build_scenarios(dataset):
+            if args.only and name not in args.only:
+                continue
+            if name == "matching.list":
+                await drain_matching_jobs()
+            result = await run_scenario(client, name, request, args.requests, args.concurrency)
+            results[name] = result.summary()
+            print(format_row(name, results[name]), flush=True)
+    await payments.payment_service.gateway.aclose()
+
+    return {
+        "environment": {
+            "database": engine.dialect.name,
+            "python": platform.python_version(),
+            "landowners": args.landowners,
+            "professionals": args.professionals,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "razorpay_latency_ms": args.razorpay_latency_ms,
+        },
+        "scenarios": results,
+    }
+
+
+def format_row(name: str, summary: Dict) -> str:
+    return (
+        f"{name:<32} {summary['requests']:>6} {summary['errors']:>6} {summary['rps']:>9.1f} "
+        f"{summary['p50_ms']:>9.2f} {summary['p95_ms']:>9.2f} {summary['p99_ms']:>9.2f}"
+    )
+
+
+def compare(report: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Regressions of the report against the baseline"""
+    regressions = []
+    for name, base in baseline["scenarios"].items():
+        current = report["scenarios"].get(name)
+        if current is None:
+            continue
+        if current["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {base['p95_ms']} -> {current['p95_ms']} ms")
+        if current["rps"] < base["rps"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {base['rps']} -> {current['rps']} req/s")
+        if current["errors"] > base["errors"]:
+            regressions.append(f"{name}: errors {base['errors']} -> {current['errors']}")
+    return regressions
+
+
+async def main_async(args: argparse.Namespace) -> Dict:
+    if args.create_schema:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    try:
+        return await run(args)
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Endpoint latency and throughput benchmark")
+    parser.add_argument("--landowners", type=int, default=200)
+    parser.add_argument("--professionals", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--razorpay-latency-ms", type=float, default=50.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--only", nargs="*", help="Run only these scenarios")
+    parser.add_argument("--create-schema", action="store_true", help="Create tables first (scratch DB only)")
+    parser.add_argument("--out", help="Write the report as a JSON baseline")
+    parser.add_argument("--compare", help="Baseline JSON to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed fractional regression")
+    args = parser.parse_args()
+
+    print(f"{'scenario':<32} {'reqs':>6} {'errors':>6} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    report = asyncio.run(main_async(args))
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""
+Onboarding write-volume benchmark
+
+Seeds professionals (one per capability type, round robin) and submits
+every onboarding step for each of them several times with the same
+payload, then once more with every list edited (first item dropped, one
+new item added). For each round it reports the write statements and
+rows inserted, updated and deleted per child table, and the child-table
+row counts afterwards. Re-submitting an unchanged step should write no
+child rows, and the tables should not grow between rounds.
+
+Usage (from jointlly_backend/, against a scratch database):
+    python -m benchmarks.onboarding_writes --create-schema --professionals 40 --rounds 3
+"""
+import argparse
+import asyncio
+import copy
+import re
+from collections import Counter
+from typing import Dict, List, Tuple
+from uuid import UUID, uuid4
+from sqlalchemy import event, func, select
+from app.database import AsyncSessionLocal, Base, engine
+from app.models.professional import (
+    ProfessionalProfile, License, Portfolio, LocationPreference, SubcontractorScope,
+    ProjectSizeCategory, ProfessionalPricing, JVJDPreferences, ReconstructionWorkType
+)
+from app.models.user import User
+from app.services.professional_service import ProfessionalService
+from app.utils.constants import CapabilityType, Role
+
+CHILD_MODELS = [
+    License, Portfolio, LocationPreference, SubcontractorScope, ProjectSizeCategory,
+    ProfessionalPricing, JVJDPreferences, ReconstructionWorkType
+]
+CHILD_TABLES = {model.__tablename__ for model in CHILD_MODELS}
+
+LOCATIONS = [
+    {"location_name": f"Locality {i}", "radius_km": 5.0, "latitude": 12.90 + i / 100, "longitude": 77.55}
+    for i in range(10)
+]
+PROJECTS = [
+    {"project_name": f"Tower {i}", "location": "Bengaluru", "area_sqft": 12000.0 + i, "images": ["a.jpg", "b.jpg"]}
+    for i in range(5)
+]
+PRICING = {"basic_regular": 1800, "standard": 2300, "luxury": 3100}
+
+STEPS: Dict[CapabilityType, Dict[int, dict]] = {
+    CapabilityType.CONSTRUCTION: {
+        1: {"company_name": "Bench Builders", "experience_years": 8, "office_address": "MG Road",
+            "builder_license": "KPWD-001", "rera_registration": True},
+        3: {"location_preferences": LOCATIONS},
+        4: {"total_projects_completed": 12, "portfolio_projects": PROJECTS},
+        5: {"subcontractor_scopes": ["CIVIL_WORKS", "FLOORING_FINISHING", "PAINTING_SURFACE"]},
+        6: {"typical_project_size": "UP_TO_5000"},
+        7: {"residential_pricing": PRICING, "commercial_pricing": PRICING, "industrial_pricing": PRICING},
+    },
+    CapabilityType.JV_JD: {
+        1: {"company_name": "Bench JV", "experience_years": 5, "business_entity_type": "LLP"},
+        2: {"builder_license": "JV-001", "rera_registration": True, "gst_number": "29ABCDE1234F1Z5"},
+        4: {"total_projects_completed": 6, "recent_projects": PROJECTS[:3]},
+        5: {"subcontractor_scopes": ["CIVIL_WORKS", "OTHER"], "typical_project_size": "UP_TO_5000"},
+        6: {"rera_registered_projects_count": 4, "wallet_size_range": "MEDIUM_5_20CR"},
+        7: {"location_preferences": LOCATIONS[:5], "team_size_category": "MEDIUM"},
+        8: {"preferred_jv_models": ["REVENUE_SHARE", "AREA_SHARE"]},
+    },
+    CapabilityType.INTERIOR: {
+        1: {"company_name": "Bench Interiors", "experience_years": 3},
+        3: {"recent_projects": PROJECTS[:3]},
+        4: {"tentative_pricing": {"flat_1200_sft": 900000, "duplex_1500_sft": 1400000}},
+        5: {"location_preferences": LOCATIONS[:5]},
+    },
+    CapabilityType.RECONSTRUCTION: {
+        1: {"company_name": "Bench Rebuild", "builder_license": "RC-001", "office_address": "Jayanagar"},
+        2: {"location_preferences": [location["location_name"] for location in LOCATIONS[:5]]},
+        3: {"total_projects_completed": 20},
+        4: {"subcontractor_scopes": ["CIVIL_WORKS"], "typical_project_size": "UP_TO_5000"},
+        5: {"work_type_preferences": ["MAJOR_RECONSTRUCTION", "PAINTING_FINISHING"]},
+        6: {"tentative_pricing": "1500-2500 per sq ft"},
+    },
+}
+
+_WRITE = re.compile(r"^\s*(INSERT INTO|UPDATE|DELETE FROM)\s+(\w+)", re.IGNORECASE)
+
+
+class WriteCounter:
+    """Write statements and affected rows per (verb, table) on the app's engine"""
+
+    def __init__(self):
+        self.statements: Counter = Counter()
+        self.rows: Counter = Counter()
+        event.listen(engine.sync_engine, "after_cursor_execute", self._on_statement)
+
+    def _on_statement(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        match = _WRITE.match(statement)
+        if match:
+            key = (match.group(1).split()[0].upper(), match.group(2))
+            self.statements[key] += 1
+            self.rows[key] += max(cursor.rowcount, 0)
+
+    def reset(self) -> None:
+        self.statements.clear()
+        self.rows.clear()
+
+
+def edited(steps: Dict[int, dict]) -> Dict[int, dict]:
+    """Same steps with every list edited: first item dropped, one new item appended"""
+    steps = copy.deepcopy(steps)
+    for data in steps.values():
+        for name, value in data.items():
+            if isinstance(value, list) and value and isinstance(value[0], dict):
+                key = "location_name" if "location_name" in value[0] else "project_name"
+                data[name] = value[1:] + [dict(value[0], **{key: f"Edited {uuid4().hex[:6]}"})]
+            elif isinstance(value, list) and value and name == "location_preferences":
+                data[name] = value[1:] + [f"Edited {uuid4().hex[:6]}"]
+    return steps
+
+
+async def seed(professionals: int) -> List[Tuple[UUID, CapabilityType]]:
+    capabilities = list(STEPS)
+    seeded = []
+    async with AsyncSessionLocal() as db:
+        for index in range(professionals):
+            user = User(
+                id=uuid4(), email=f"onboarding-{uuid4().hex[:8]}@bench.example", name="Bench",
+                hashed_password="-", role=Role.PROFESSIONAL, is_active="true"
+            )
+            profile = ProfessionalProfile(id=uuid4(), user_id=user.id, company_name="Bench")
+            db.add_all([user, profile])
+            seeded.append((profile.id, capabilities[index % len(capabilities)]))
+        await db.commit()
+    return seeded
+
+
+async def child_rows() -> int:
+    async with AsyncSessionLocal() as db:
+        total = 0
+        for model in CHILD_MODELS:
+            total += (await db.execute(select(func.count()).select_from(model))).scalar() or 0
+        return total
+
+
+async def submit_all(professionals: List[Tuple[UUID, CapabilityType]], edit: bool) -> None:
+    for profile_id, capability_type in professionals:
+        steps = edited(STEPS[capability_type]) if edit else STEPS[capability_type]
+        for step_number, step_data in steps.items():
+            async with AsyncSessionLocal() as db:
+                profile = await db.get(ProfessionalProfile, profile_id)
+                await ProfessionalService.complete_onboarding_step(
+                    db, profile, capability_type, step_number, copy.deepcopy(step_data)
+                )
+                await db.commit()
+
+
+def report(name: str, counter: WriteCounter, rows_after: int) -> None:
+    child = {key: rows for key, rows in counter.rows.items() if key[1] in CHILD_TABLES}
+    statements = sum(count for key, count in counter.statements.items() if key[1] in CHILD_TABLES)
+    by_verb = Counter()
+    for (verb, _), rows in child.items():
+        by_verb[verb] += rows
+    print(
+        f"{name:<10} {statements:>10} {by_verb['INSERT']:>9} {by_verb['UPDATE']:>9} "
+        f"{by_verb['DELETE']:>9} {rows_after:>11}"
+    )
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    if args.create_schema:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    try:
+        professionals = await seed(args.professionals)
+        counter = WriteCounter()
+        print(f"{args.professionals} professionals, every onboarding step per round; child tables only")
+        print(f"{'round':<10} {'statements':>10} {'inserted':>9} {'updated':>9} {'deleted':>9} {'child rows':>11}")
+        for round_number in range(1, args.rounds + 1):
+            counter.reset()
+            await submit_all(professionals, edit=False)
+            report(f"same #{round_number}", counter, await child_rows())
+        counter.reset()
+        await submit_all(professionals, edit=True)
+        report("edited", counter, await child_rows())
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Onboarding re-submission write volume")
+    parser.add_argument("--professionals", type=int, default=40)
+    parser.add_argument("--rounds", type=int, default=3, help="Identical submissions of every step")
+    parser.add_argument("--create-schema", action="store_true", help="Create tables first (scratch DB only)")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
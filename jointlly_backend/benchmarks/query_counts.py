@@ -0,0 +1,242 @@
+"""
+Query-count benchmark: SQL statements and commits per endpoint
+
+Drives a landowner -> professional -> payment flow through the FastAPI app
+in-process and counts the statements and COMMITs each request issues.
+Run it against a scratch PostgreSQL or SQLite database; --create-schema
+creates the tables.
+
+Usage (from jointlly_backend/):
+    DATABASE_URL=postgresql+asyncpg://localhost/jointly_bench \\
+        python -m benchmarks.query_counts --create-schema [--json counts.json]
+
+Payments are measured at the service layer so they go to the in-process
+Razorpay stub, and matching runs through the worker's MatchingJobService.
+Capabilities are also added at the service layer: CapabilityCreate is
+strict, so POST /professionals/capabilities rejects the enum sent as JSON.
+
+The landowner dashboard is also held to a fixed statement budget however
+many properties, projects and matches it covers; the run fails with
+QueryBudgetExceeded when it goes over.
+"""
+import argparse
+import asyncio
+import json
+import os
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+from uuid import UUID, uuid4
+
+# The benchmark drives matching itself
+os.environ.setdefault("MATCHING_WORKER_IN_PROCESS", "false")
+os.environ.setdefault("WEBHOOK_WORKER_IN_PROCESS", "false")
+
+import httpx
+from sqlalchemy import event
+from app.database import AsyncSessionLocal, Base, engine
+from app.main import app
+from app.services.matching_job_service import MatchingJobService
+from app.services.payment_service import PaymentService
+from app.services.professional_service import ProfessionalService
+from app.services.razorpay_gateway import RazorpayGateway
+from app.config import settings
+from app.utils.constants import CapabilityType, ProjectType, TransactionType
+from app.utils.query_stats import QueryBudgetExceeded
+from benchmarks.razorpay_stub import sign_payment, stub_transport
+
+PASSWORD = "Bench-passw0rd"
+# Principal, profile, properties, projects, latest FAR, latest feasibility, match counts
+DASHBOARD_STATEMENT_BUDGET = 7
+
+
+class QueryCounter:
+    """Counts statements and commits on the app's engine"""
+
+    def __init__(self):
+        self.statements = 0
+        self.commits = 0
+        event.listen(engine.sync_engine, "before_cursor_execute", self._on_statement)
+        event.listen(engine.sync_engine, "commit", self._on_commit)
+
+    def _on_statement(self, *args) -> None:
+        self.statements += 1
+
+    def _on_commit(self, *args) -> None:
+        self.commits += 1
+
+    def reset(self) -> None:
+        self.statements = 0
+        self.commits = 0
+
+
+class Recorder:
+    """Collects one row per measured step"""
+
+    def __init__(self, counter: QueryCounter):
+        self.counter = counter
+        self.rows: List[Dict] = []
+
+    @asynccontextmanager
+    async def step(self, name: str):
+        self.counter.reset()
+        row = {"endpoint": name, "status": None}
+        yield row
+        row["statements"] = self.counter.statements
+        row["commits"] = self.counter.commits
+        self.rows.append(row)
+
+    async def request(self, client: httpx.AsyncClient, method: str, path: str, **kwargs) -> httpx.Response:
+        async with self.step(f"{method} {path.split('?')[0]}") as row:
+            response = await client.request(method, path, **kwargs)
+            row["status"] = response.status_code
+        return response
+
+
+def _template(path: str, **ids: UUID) -> str:
+    for name, value in ids.items():
+        path = path.replace(str(value), "{" + name + "}")
+    return path
+
+
+async def register(recorder: Recorder, client: httpx.AsyncClient, role: str) -> Dict[str, str]:
+    email = f"bench-{uuid4().hex[:12]}@example.com"
+    response = await recorder.request(client, "POST", "/api/v1/auth/register", json={
+        "email": email, "password": PASSWORD, "name": "Bench", "role": role
+    })
+    response.raise_for_status()
+    await recorder.request(client, "POST", "/api/v1/auth/login", data={"username": email, "password": PASSWORD})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def run() -> List[Dict]:
+    recorder = Recorder(QueryCounter())
+    # Record failing endpoints as 500s instead of aborting the run
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Landowner
+        landowner = await register(recorder, client, "LANDOWNER")
+        await recorder.request(client, "GET", "/api/v1/auth/me", headers=landowner)
+        await recorder.request(client, "POST", "/api/v1/landowners/profile", headers=landowner, json={
+            "name": "Bench Landowner", "city": "Bengaluru"
+        })
+        response = await recorder.request(client, "POST", "/api/v1/landowners/properties", headers=landowner, json={
+            "city": "Bengaluru", "width_ft": 40.0, "length_ft": 60.0, "road_width_ft": 30.0,
+            "pid_number": "BENCH-PID", "tax_paid": True, "google_maps_pin": "12.9716,77.5946"
+        })
+        property_id = UUID(response.json()["id"])
+
+        response = await recorder.request(client, "POST", "/api/v1/landowners/projects", headers=landowner, json={
+            "property_id": str(property_id), "project_type": ProjectType.CONTRACT_CONSTRUCTION.value
+        })
+        project_id = UUID(response.json()["id"])
+
+        for method, path, body in (
+            ("POST", f"/api/v1/projects/{project_id}/calculate-far", {"road_width_ft": 30.0}),
+            ("POST", f"/api/v1/projects/{project_id}/feasibility", None),
+            ("POST", f"/api/v1/projects/{project_id}/verify-pid", {"pid_number": "BENCH-PID"}),
+            ("POST", f"/api/v1/landowners/projects/{project_id}/publish", None),
+        ):
+            async with recorder.step(f"{method} {_template(path, project_id=project_id)}") as row:
+                row["status"] = (await client.request(method, path, headers=landowner, json=body)).status_code
+
+        # Professional
+        professional = await register(recorder, client, "PROFESSIONAL")
+        response = await recorder.request(client, "POST", "/api/v1/professionals/profile", headers=professional, json={
+            "company_name": "Bench Builders", "city": "Bengaluru", "location_preferences": ["Bengaluru"]
+        })
+        professional_profile_id = UUID(response.json()["id"])
+        async with recorder.step("service ProfessionalService.add_capability"):
+            async with AsyncSessionLocal() as db:
+                await ProfessionalService.add_capability(db, professional_profile_id, CapabilityType.CONSTRUCTION)
+                await db.commit()
+        await recorder.request(client, "POST", "/api/v1/professionals/location-preferences", headers=professional, json=[
+            {"location_name": "Bengaluru", "radius_km": 30.0, "latitude": 12.97, "longitude": 77.59}
+        ])
+
+        # Matching (worker side), then listing and accepting
+        async with recorder.step("worker MatchingJobService.run_next"):
+            await MatchingJobService.run_next("bench")
+        path = f"/api/v1/matching/projects/{project_id}/matches"
+        async with recorder.step(f"GET {_template(path, project_id=project_id)}") as row:
+            response = await client.get(path, headers=landowner)
+            row["status"] = response.status_code
+        items = response.json().get("items", []) if response.status_code == 200 else []
+        if items:
+            match_id = UUID(items[0]["id"])
+            path = f"/api/v1/matching/matches/{match_id}/accept"
+            async with recorder.step(f"POST {_template(path, match_id=match_id)}") as row:
+                row["status"] = (await client.post(path, headers=professional)).status_code
+
+        # Payments against the in-process Razorpay stub
+        gateway = RazorpayGateway(
+            settings.razorpay_key_id, settings.razorpay_key_secret, "http://razorpay-stub",
+            timeout_seconds=5, max_retries=0, backoff_seconds=0, max_connections=10,
+            transport=stub_transport()
+        )
+        payment_service = PaymentService(gateway)
+        user_id = (await client.get("/api/v1/auth/me", headers=landowner)).json()["id"]
+        async with recorder.step("service PaymentService.create_order"):
+            async with AsyncSessionLocal() as db:
+                order = await payment_service.create_order(
+                    db, UUID(user_id), 499.0, TransactionType.FEASIBILITY_UNLOCK, project_id
+                )
+                await db.commit()
+        async with recorder.step("service PaymentService.verify_payment"):
+            async with AsyncSessionLocal() as db:
+                payment_id = f"pay_{uuid4().hex[:14]}"
+                await payment_service.verify_payment(
+                    db, order["transaction_id"], payment_id, sign_payment(order["order_id"], payment_id)
+                )
+                await db.commit()
+        await gateway.aclose()
+
+        # A second property with a project must not add statements to the dashboard
+        response = await client.post("/api/v1/landowners/properties", headers=landowner, json={
+            "city": "Bengaluru", "width_ft": 30.0, "length_ft": 40.0, "road_width_ft": 20.0
+        })
+        await client.post("/api/v1/landowners/projects", headers=landowner, json={
+            "property_id": response.json()["id"], "project_type": ProjectType.JV_JD.value
+        })
+        response = await recorder.request(client, "GET", "/api/v1/landowners/dashboard", headers=landowner)
+        statements = recorder.rows[-1]["statements"]
+        if response.status_code != 200 or statements > DASHBOARD_STATEMENT_BUDGET:
+            raise QueryBudgetExceeded(
+                f"GET /api/v1/landowners/dashboard returned {response.status_code} after "
+                f"{statements} statements, budget is {DASHBOARD_STATEMENT_BUDGET}"
+            )
+
+    return recorder.rows
+
+
+def report(rows: List[Dict], json_path: Optional[str]) -> None:
+    width = max(len(row["endpoint"]) for row in rows)
+    print(f"{'endpoint':<{width}}  status  statements  commits")
+    for row in rows:
+        print(f"{row['endpoint']:<{width}}  {str(row['status'] or '-'):>6}  {row['statements']:>10}  {row['commits']:>7}")
+    print(f"{'total':<{width}}  {'':>6}  {sum(r['statements'] for r in rows):>10}  {sum(r['commits'] for r in rows):>7}")
+    if json_path:
+        with open(json_path, "w") as f:
+            json.dump(rows, f, indent=2)
+
+
+async def main_async(create_schema: bool, json_path: Optional[str]) -> None:
+    if create_schema:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    try:
+        report(await run(), json_path)
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SQL statements and commits per endpoint")
+    parser.add_argument("--create-schema", action="store_true", help="Create tables first (scratch DB only)")
+    parser.add_argument("--json", dest="json_path", help="Also write the counts to this file")
+    args = parser.parse_args()
+    asyncio.run(main_async(args.create_schema, args.json_path))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Local stand-in for the Razorpay Orders API
+
+Run it as a server and point RAZORPAY_BASE_URL at it:
+    python -m benchmarks.razorpay_stub --port 9100 --latency-ms 80 --failure-rate 0.05
+
+or use it in-process without a socket:
+    gateway = RazorpayGateway(..., transport=stub_transport())
+
+sign_payment() produces the signature Checkout would return, so the verify
+flow can be exercised end to end.
+"""
+import argparse
+import asyncio
+import base64
+import hashlib
+import hmac
+import random
+import secrets
+import time
+from typing import Optional
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from app.config import settings
+
+
+def sign_payment(order_id: str, payment_id: str, key_secret: Optional[str] = None) -> str:
+    """Signature Razorpay Checkout returns for a successful payment"""
+    secret = key_secret or settings.razorpay_key_secret
+    return hmac.new(secret.encode(), f"{order_id}|{payment_id}".encode(), hashlib.sha256).hexdigest()
+
+
+def create_stub_app(latency_ms: float = 0.0, failure_rate: float = 0.0) -> FastAPI:
+    """Stub app; failure_rate of requests get a 503 to exercise retries"""
+    app = FastAPI(title="Razorpay stub")
+    app.state.orders = {}
+    expected_auth = "Basic " + base64.b64encode(
+        f"{settings.razorpay_key_id}:{settings.razorpay_key_secret}".encode()
+    ).decode()
+
+    def error(status_code: int, code: str, description: str) -> JSONResponse:
+        return JSONResponse(
+            status_code=status_code,
+            content={"error": {"code": code, "description": description}}
+        )
+
+    @app.post("/v1/orders")
+    async def create_order(request: Request):
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+        if request.headers.get("Authorization") != expected_auth:
+            return error(401, "BAD_REQUEST_ERROR", "Authentication failed")
+        if failure_rate and random.random() < failure_rate:
+            return error(503, "SERVER_ERROR", "Stub injected failure")
+
+        data = await request.json()
+        if not isinstance(data.get("amount"), int) or data["amount"] < 100:
+            return error(400, "BAD_REQUEST_ERROR", "The amount must be atleast INR 1.00")
+
+        order = {
+            "id": f"order_{secrets.token_hex(7)}",
+            "entity": "order",
+            "amount": data["amount"],
+            "amount_paid": 0,
+            "amount_due": data["amount"],
+            "currency": data.get("currency", "INR"),
+            "receipt": data.get("receipt"),
+            "status": "created",
+            "attempts": 0,
+            "notes": data.get("notes", {}),
+            "created_at": int(time.time())
+        }
+        app.state.orders[order["id"]] = order
+        return order
+
+    @app.get("/v1/orders/{order_id}")
+    async def fetch_order(order_id: str):
+        order = app.state.orders.get(order_id)
+        if order is None:
+            return error(400, "BAD_REQUEST_ERROR", "The id provided does not exist")
+        return order
+
+    return app
+
+
+def stub_transport(latency_ms: float = 0.0, failure_rate: float = 0.0) -> httpx.ASGITransport:
+    """In-process transport for RazorpayGateway(transport=...)"""
+    return httpx.ASGITransport(app=create_stub_app(latency_ms, failure_rate))
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Razorpay Orders API stub")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    uvicorn.run(create_stub_app(args.latency_ms, args.failure_rate), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Shared pytest fixtures
+"""
+import os
+import tempfile
+import pytest
+import pytest_asyncio
+
+# Tests never touch the database configured in .env: they use
+# TEST_DATABASE_URL, or a scratch SQLite file
+os.environ["DATABASE_URL"] = os.environ.get(
+    "TEST_DATABASE_URL",
+    f"sqlite+aiosqlite:///{os.path.join(tempfile.gettempdir(), 'jointly_test.db')}"
+)
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key-with-at-least-32-characters")
+os.environ.setdefault("RAZORPAY_KEY_ID", "rzp_test_key")
+os.environ.setdefault("RAZORPAY_KEY_SECRET", "rzp_test_secret")
+os.environ["MATCHING_WORKER_IN_PROCESS"] = "false"
+os.environ["WEBHOOK_WORKER_IN_PROCESS"] = "false"
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Assert a block's SQL statement budget:
+
+        with query_budget(max_statements=6, max_repeats=1):
+            await client.get("/api/v1/professionals/profile", headers=auth)
+    """
+    from app.database import engine
+    from app.utils.query_stats import install_query_stats, query_budget
+
+    install_query_stats(engine.sync_engine)
+    return query_budget
+
+
+@pytest_asyncio.fixture
+async def database():
+    """Fresh schema on the test database; the engine's pool is closed afterwards"""
+    from app.database import Base, engine
+
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
@@ -74,12 +74,15 @@ CREATE TABLE IF NOT EXISTS `professional_profiles` (
     `team_size_category` ENUM('SMALL', 'MEDIUM', 'LARGE', 'VERY_LARGE') NULL,
     `total_projects_completed` INT NULL,
     `credibility_score` DECIMAL(5, 4) NULL DEFAULT 0.0,
+    `license_count` INT NOT NULL DEFAULT 0,
+    `portfolio_count` INT NOT NULL DEFAULT 0,
     `onboarding_status` ENUM('IN_PROGRESS', 'COMPLETED', 'VERIFIED') NOT NULL DEFAULT 'IN_PROGRESS',
     `onboarding_step` INT NULL DEFAULT 1,
     `created_at` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
     `updated_at` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     INDEX `idx_professional_profiles_user_id` (`user_id`),
     INDEX `idx_professional_profiles_onboarding_status` (`onboarding_status`),
+    INDEX `ix_professional_profiles_updated_at` (`updated_at`),
     CONSTRAINT `fk_professional_profiles_user_id` 
         FOREIGN KEY (`user_id`) REFERENCES `users` (`id`) 
         ON DELETE CASCADE
@@ -96,6 +99,8 @@ CREATE TABLE IF NOT EXISTS `properties` (
     `ward` VARCHAR(100) NULL,
     `landmark` VARCHAR(255) NULL,
     `google_maps_pin` VARCHAR(500) NULL,
+    `latitude` DOUBLE NULL,
+    `longitude` DOUBLE NULL,
     `width_ft` DECIMAL(10, 2) NULL,
     `length_ft` DECIMAL(10, 2) NULL,
     `facing` VARCHAR(50) NULL,
@@ -236,6 +241,7 @@ CREATE TABLE IF NOT EXISTS `far_calculations` (
     `total_buildable_area` DECIMAL(12, 2) NOT NULL,
     `created_at` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
     INDEX `idx_far_calculations_property_id` (`property_id`),
+    INDEX `ix_far_calculations_property_latest` (`property_id`, `created_at` DESC, `id` DESC),
     CONSTRAINT `fk_far_calculations_property_id` 
         FOREIGN KEY (`property_id`) REFERENCES `properties` (`id`) 
         ON DELETE CASCADE
@@ -256,10 +262,12 @@ CREATE TABLE IF NOT EXISTS `feasibility_reports` (
     `total_built_up_area_sqft` DECIMAL(12, 2) NULL,
     `saleable_area_sqft` DECIMAL(12, 2) NULL,
     `number_of_units` INT NULL,
+    `input_digest` VARCHAR(64) NULL,
     `is_unlocked` BOOLEAN NOT NULL DEFAULT FALSE,
     `created_at` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
     INDEX `idx_feasibility_reports_property_id` (`property_id`),
     INDEX `idx_feasibility_reports_is_unlocked` (`is_unlocked`),
+    INDEX `ix_feasibility_reports_property_latest` (`property_id`, `created_at` DESC, `id` DESC),
     CONSTRAINT `fk_feasibility_reports_property_id` 
         FOREIGN KEY (`property_id`) REFERENCES `properties` (`id`) 
         ON DELETE CASCADE
@@ -345,10 +353,13 @@ CREATE TABLE IF NOT EXISTS `matches` (
     `status` ENUM('PENDING', 'ACCEPTED', 'REJECTED') NOT NULL DEFAULT 'PENDING',
     `created_at` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
     `updated_at` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    UNIQUE KEY `uq_matches_project_professional` (`project_id`, `professional_id`),
     INDEX `idx_matches_project_id` (`project_id`),
     INDEX `idx_matches_professional_id` (`professional_id`),
     INDEX `idx_matches_match_score` (`match_score`),
     INDEX `idx_matches_status` (`status`),
+    INDEX `ix_matches_project_score` (`project_id`, `match_score` DESC, `id` DESC),
+    INDEX `ix_matches_professional_score` (`professional_id`, `match_score` DESC, `id` DESC),
     CONSTRAINT `fk_matches_project_id` 
         FOREIGN KEY (`project_id`) REFERENCES `projects` (`id`) 
         ON DELETE CASCADE,
@@ -385,6 +396,8 @@ CREATE TABLE IF NOT EXISTS `location_preferences` (
     `professional_id` CHAR(36) NOT NULL,
     `location_name` VARCHAR(255) NOT NULL,
     `radius_km` DECIMAL(5, 2) NULL,
+    `latitude` DOUBLE NULL,
+    `longitude` DOUBLE NULL,
     `capability_type` ENUM('CONSTRUCTION', 'INTERIOR', 'JV_JD', 'RECONSTRUCTION') NULL,
     `created_at` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
     INDEX `idx_location_preferences_professional_id` (`professional_id`),
@@ -480,6 +493,68 @@ CREATE TABLE IF NOT EXISTS `reconstruction_work_types` (
         ON DELETE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
+-- ============================================
+-- TABLE: matching_jobs
+-- ============================================
+CREATE TABLE IF NOT EXISTS `matching_jobs` (
+    `id` CHAR(36) NOT NULL PRIMARY KEY,
+    `project_id` CHAR(36) NOT NULL,
+    `idempotency_key` VARCHAR(100) NOT NULL UNIQUE,
+    `status` ENUM('QUEUED', 'RUNNING', 'SUCCEEDED', 'FAILED') NOT NULL DEFAULT 'QUEUED',
+    `attempts` INT NOT NULL DEFAULT 0,
+    `max_attempts` INT NOT NULL DEFAULT 5,
+    `run_after` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    `locked_by` VARCHAR(100) NULL,
+    `locked_at` DATETIME NULL,
+    `last_error` TEXT NULL,
+    `matches_created` INT NULL,
+    `completed_at` DATETIME NULL,
+    `created_at` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    `updated_at` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    INDEX `idx_matching_jobs_project_id` (`project_id`),
+    INDEX `idx_matching_jobs_status_run_after` (`status`, `run_after`),
+    CONSTRAINT `fk_matching_jobs_project_id` 
+        FOREIGN KEY (`project_id`) REFERENCES `projects` (`id`) 
+        ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- ============================================
+-- TABLE: match_rescores
+-- ============================================
+CREATE TABLE IF NOT EXISTS `match_rescores` (
+    `id` CHAR(36) NOT NULL PRIMARY KEY,
+    `match_id` CHAR(36) NOT NULL,
+    `component` ENUM('LOCATION', 'PRICING', 'CAPABILITY', 'VERIFICATION') NOT NULL,
+    `version` INT NOT NULL DEFAULT 0,
+    `created_at` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE KEY `uq_match_rescores_match_component` (`match_id`, `component`),
+    INDEX `idx_match_rescores_match_id` (`match_id`),
+    INDEX `idx_match_rescores_created_at` (`created_at`),
+    CONSTRAINT `fk_match_rescores_match_id` 
+        FOREIGN KEY (`match_id`) REFERENCES `matches` (`id`) 
+        ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- ============================================
+-- TABLE: webhook_events
+-- ============================================
+CREATE TABLE IF NOT EXISTS `webhook_events` (
+    `id` CHAR(36) NOT NULL PRIMARY KEY,
+    `event_id` VARCHAR(100) NOT NULL,
+    `event` VARCHAR(100) NULL,
+    `razorpay_order_id` VARCHAR(255) NULL,
+    `payload` JSON NOT NULL,
+    `created_at` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    `processed_at` DATETIME NULL,
+    `attempts` INT NOT NULL DEFAULT 0,
+    `next_attempt_at` DATETIME NULL,
+    UNIQUE KEY `uq_webhook_events_event_id` (`event_id`),
+    INDEX `idx_webhook_events_razorpay_order_id` (`razorpay_order_id`),
+    INDEX `idx_webhook_events_created_at` (`created_at`),
+    INDEX `idx_webhook_events_processed_at` (`processed_at`),
+    INDEX `idx_webhook_events_next_attempt_at` (`next_attempt_at`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
 -- Re-enable foreign key checks
 SET FOREIGN_KEY_CHECKS = 1;
 
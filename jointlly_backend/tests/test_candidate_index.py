@@ -0,0 +1,72 @@
+"""
+CandidateIndex: lookups poll for other processes' writes at most every candidate_index_poll_seconds
+"""
+from datetime import datetime
+from uuid import uuid4
+import pytest
+from sqlalchemy import update
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.professional import Capability, ProfessionalProfile
+from app.models.user import User
+from app.services.candidate_index import CandidateIndex
+from app.utils.constants import CapabilityType, Role
+
+
+async def _add_professional(capability_type: CapabilityType) -> ProfessionalProfile:
+    async with AsyncSessionLocal() as db:
+        user = User(
+            id=uuid4(), email=f"{uuid4().hex}@example.com", name="Professional",
+            hashed_password="-", role=Role.PROFESSIONAL, is_active="true"
+        )
+        profile = ProfessionalProfile(id=uuid4(), user_id=user.id, company_name="Builder")
+        db.add_all([user, profile, Capability(professional_id=profile.id, capability_type=capability_type)])
+        await db.commit()
+        return profile
+
+
+async def _add_capability_elsewhere(profile: ProfessionalProfile, capability_type: CapabilityType) -> None:
+    """A write committed by another process: only updated_at tells this index about it"""
+    async with AsyncSessionLocal() as db:
+        db.add(Capability(professional_id=profile.id, capability_type=capability_type))
+        await db.execute(
+            update(ProfessionalProfile)
+            .where(ProfessionalProfile.id == profile.id)
+            .values(updated_at=datetime.utcnow())
+        )
+        await db.commit()
+
+
+async def _ids(index: CandidateIndex, capability_type: CapabilityType) -> set:
+    async with AsyncSessionLocal() as db:
+        return {record.professional_id for record in await index.candidates(db, capability_type)}
+
+
+@pytest.mark.asyncio
+async def test_lookups_between_polls_issue_no_statements(database, query_budget, monkeypatch):
+    monkeypatch.setattr(settings, "candidate_index_poll_seconds", 3600.0)
+    index = CandidateIndex(ttl_seconds=3600.0)
+    profile = await _add_professional(CapabilityType.CONSTRUCTION)
+    assert await _ids(index, CapabilityType.CONSTRUCTION) == {profile.id}
+
+    with query_budget(max_statements=0):
+        assert await _ids(index, CapabilityType.CONSTRUCTION) == {profile.id}
+
+    # Writes in this process mark the professional dirty and reload it at once
+    index.mark_dirty(profile.id)
+    await _add_capability_elsewhere(profile, CapabilityType.JV_JD)
+    assert await _ids(index, CapabilityType.JV_JD) == {profile.id}
+
+
+@pytest.mark.asyncio
+async def test_other_processes_writes_are_seen_at_the_next_poll(database, monkeypatch):
+    monkeypatch.setattr(settings, "candidate_index_poll_seconds", 3600.0)
+    index = CandidateIndex(ttl_seconds=3600.0)
+    profile = await _add_professional(CapabilityType.CONSTRUCTION)
+    assert await _ids(index, CapabilityType.JV_JD) == set()
+
+    await _add_capability_elsewhere(profile, CapabilityType.JV_JD)
+    assert await _ids(index, CapabilityType.JV_JD) == set()
+
+    monkeypatch.setattr(settings, "candidate_index_poll_seconds", 0.0)
+    assert await _ids(index, CapabilityType.JV_JD) == {profile.id}
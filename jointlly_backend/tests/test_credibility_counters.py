@@ -0,0 +1,60 @@
+"""
+Denormalized license/portfolio counters under concurrent writers
+"""
+from uuid import uuid4
+import pytest
+from app.database import AsyncSessionLocal
+from app.models.professional import ProfessionalProfile
+from app.models.user import User
+from app.services.credibility_service import CredibilityService
+from app.services.professional_service import ProfessionalService
+from app.utils.constants import Role
+
+
+async def _add_professional() -> ProfessionalProfile:
+    async with AsyncSessionLocal() as db:
+        user = User(
+            id=uuid4(), email="professional@example.com", name="Professional",
+            hashed_password="-", role=Role.PROFESSIONAL, is_active="true"
+        )
+        profile = ProfessionalProfile(id=uuid4(), user_id=user.id, company_name="Builder")
+        db.add_all([user, profile])
+        await db.commit()
+        return profile
+
+
+@pytest.mark.asyncio
+async def test_concurrent_adds_both_count(database):
+    professional = await _add_professional()
+
+    async with AsyncSessionLocal() as first, AsyncSessionLocal() as second:
+        # Both requests loaded the profile before either added anything
+        # (held here, as a request holds it, so the identity map keeps the stale copy)
+        loaded = [
+            await first.get(ProfessionalProfile, professional.id),
+            await second.get(ProfessionalProfile, professional.id)
+        ]
+
+        await ProfessionalService.add_license(first, professional.id, "LIC-1")
+        await ProfessionalService.add_portfolio_item(first, professional.id, "Tower A")
+        await first.commit()
+        await ProfessionalService.add_license(second, professional.id, "LIC-2")
+        await ProfessionalService.add_portfolio_item(second, professional.id, "Tower B")
+        await second.commit()
+        assert [profile.license_count for profile in loaded] == [1, 2]
+
+    async with AsyncSessionLocal() as db:
+        profile = await db.get(ProfessionalProfile, professional.id)
+        print("COUNTS", profile.license_count, profile.portfolio_count); assert (profile.license_count, profile.portfolio_count) == (2, 2)
+        assert profile.credibility_score == await CredibilityService.calculate_credibility_score(db, profile.id)
+        # The batch recompute finds nothing to correct
+        assert (await CredibilityService.recompute_page(db, None, 10))[2] == 0
+
+
+@pytest.mark.asyncio
+async def test_counters_never_go_negative(database):
+    professional = await _add_professional()
+    async with AsyncSessionLocal() as db:
+        profile = await db.get(ProfessionalProfile, professional.id)
+        await CredibilityService.apply_count_changes(db, profile, license_delta=-3, portfolio_delta=1)
+        assert (profile.license_count, profile.portfolio_count) == (0, 1)
@@ -0,0 +1,33 @@
+"""
+Map pin parsing
+"""
+import pytest
+from app.utils.geo import parse_coordinates
+
+
+@pytest.mark.parametrize("pin, expected", [
+    ("12.9716,77.5946", (12.9716, 77.5946)),
+    ("12.97, 77.59", (12.97, 77.59)),
+    ("https://www.google.com/maps/@12.9716,77.5946,15z", (12.9716, 77.5946)),
+    ("https://maps.google.com/?q=-33.8688,151.2093", (-33.8688, 151.2093)),
+    ("https://www.google.com/maps/place/X/@12.90,77.50,17z/data=!3d12.9716!4d77.5946", (12.9716, 77.5946)),
+    # First pair is out of range, the second is a real pin
+    ("95.12,10.5 then 12.97,77.59", (12.97, 77.59)),
+])
+def test_parses_decimal_coordinates(pin, expected):
+    assert parse_coordinates(pin) == expected
+
+
+@pytest.mark.parametrize("pin", [
+    None,
+    "",
+    "https://goo.gl/maps/abc123",
+    "12, 77",
+    "No. 45, 100 Feet Road, Indiranagar",
+    "Plot 12, 3rd Cross, 560038",
+    "Site 1.5, 2 acres",
+    "123.45,200.10",
+    "91.5, 77.59",
+])
+def test_rejects_text_without_a_valid_pair(pin):
+    assert parse_coordinates(pin) is None
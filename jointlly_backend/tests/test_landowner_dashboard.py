@@ -0,0 +1,107 @@
+"""
+GET /landowners/dashboard: aggregated counts within a fixed statement budget
+"""
+from uuid import UUID, uuid4
+import httpx
+import pytest
+import pytest_asyncio
+from benchmarks.query_counts import DASHBOARD_STATEMENT_BUDGET
+from app.database import AsyncSessionLocal
+from app.main import app
+from app.models.matching import Match
+from app.models.professional import ProfessionalProfile
+from app.models.user import User
+from app.utils.constants import MatchStatus, Role
+
+API = "/api/v1"
+STATUSES = [MatchStatus.PENDING, MatchStatus.ACCEPTED, MatchStatus.REJECTED]
+
+
+@pytest_asyncio.fixture
+async def client(database):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+async def _register(client: httpx.AsyncClient, email: str) -> dict:
+    response = await client.post(f"{API}/auth/register", json={
+        "email": email, "password": "Passw0rd!x", "name": "Landowner", "role": Role.LANDOWNER.value
+    })
+    assert response.status_code == 201, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def _post(client: httpx.AsyncClient, path: str, headers: dict, body: dict) -> dict:
+    response = await client.post(f"{API}{path}", headers=headers, json=body)
+    assert response.status_code in (200, 201), response.text
+    return response.json()
+
+
+async def _add_professionals(count: int) -> list:
+    async with AsyncSessionLocal() as db:
+        profiles = []
+        for index in range(count):
+            user = User(
+                id=uuid4(), email=f"professional{index}@example.com", name="Professional",
+                hashed_password="-", role=Role.PROFESSIONAL, is_active="true"
+            )
+            profiles.append(ProfessionalProfile(id=uuid4(), user_id=user.id, company_name=f"Builder {index}"))
+            db.add(user)
+        db.add_all(profiles)
+        await db.commit()
+        return [profile.id for profile in profiles]
+
+
+async def _add_matches(project_id: str, professional_ids: list) -> None:
+    async with AsyncSessionLocal() as db:
+        db.add_all([
+            Match(
+                project_id=UUID(project_id),
+                professional_id=professional_id,
+                match_score=60.0,
+                status=STATUSES[index % len(STATUSES)]
+            )
+            for index, professional_id in enumerate(professional_ids)
+        ])
+        await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_dashboard_stays_within_statement_budget(client, query_budget):
+    headers = await _register(client, "dashboard@example.com")
+    await _post(client, "/landowners/profile", headers, {"name": "Landowner", "city": "Bengaluru"})
+    professional_ids = await _add_professionals(4)
+
+    # Property i gets i + 1 projects; project j of a property gets j + 1 matches
+    expected = {}
+    for index in range(3):
+        property_id = (await _post(client, "/landowners/properties", headers, {
+            "city": "Bengaluru", "width_ft": 30.0 + 10 * index, "length_ft": 60.0, "road_width_ft": 30.0
+        }))["id"]
+        expected[property_id] = []
+        for position in range(index + 1):
+            project_id = (await _post(client, "/landowners/projects", headers, {
+                "property_id": property_id, "project_type": "JV_JD"
+            }))["id"]
+            await _add_matches(project_id, professional_ids[:position + 1])
+            expected[property_id].append(position + 1)
+        if index:
+            await _post(client, f"/projects/{project_id}/calculate-far", headers, {"road_width_ft": 40.0})
+            await _post(client, f"/projects/{project_id}/feasibility", headers, {})
+
+    with query_budget(max_statements=DASHBOARD_STATEMENT_BUDGET, max_repeats=1):
+        response = await client.get(f"{API}/landowners/dashboard", headers=headers)
+
+    assert response.status_code == 200, response.text
+    dashboard = response.json()
+    assert dashboard["project_count"] == 6
+    assert dashboard["match_counts"] == {"pending": 6, "accepted": 3, "rejected": 1, "total": 10}
+    assert len(dashboard["properties"]) == 3
+    for entry in dashboard["properties"]:
+        property_id = entry["property"]["id"]
+        assert sorted(project["match_counts"]["total"] for project in entry["projects"]) == expected[property_id]
+        has_reports = len(expected[property_id]) > 1
+        assert (entry["latest_far"] is not None) == has_reports
+        assert (entry["latest_feasibility"] is not None) == has_reports
+        if has_reports:
+            assert entry["latest_far"]["road_width_ft"] == 40.0
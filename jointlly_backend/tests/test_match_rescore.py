@@ -0,0 +1,74 @@
+"""
+Match re-scoring marks: a change made while a batch is scored is not lost
+"""
+from uuid import uuid4
+import pytest
+from sqlalchemy import select
+from app.database import AsyncSessionLocal
+from app.models.landowner import LandownerProfile, Property, Project
+from app.models.matching import Match, MatchRescore
+from app.models.professional import ProfessionalProfile
+from app.models.user import User
+from app.services.match_rescore_service import MatchRescoreService
+from app.utils.constants import ProjectType, RescoreComponent, Role
+
+
+async def _add_match() -> ProfessionalProfile:
+    async with AsyncSessionLocal() as db:
+        landowner = User(
+            id=uuid4(), email="landowner@example.com", name="Landowner",
+            hashed_password="-", role=Role.LANDOWNER, is_active="true"
+        )
+        professional_user = User(
+            id=uuid4(), email="professional@example.com", name="Professional",
+            hashed_password="-", role=Role.PROFESSIONAL, is_active="true"
+        )
+        profile = LandownerProfile(id=uuid4(), user_id=landowner.id, name="Landowner")
+        property_obj = Property(id=uuid4(), landowner_id=profile.id, city="Bengaluru", width_ft=30.0, length_ft=40.0)
+        project = Project(id=uuid4(), property_id=property_obj.id, project_type=ProjectType.CONTRACT_CONSTRUCTION)
+        professional = ProfessionalProfile(id=uuid4(), user_id=professional_user.id, company_name="Builder")
+        db.add_all([landowner, professional_user, profile, property_obj, project, professional])
+        await db.flush()
+        db.add(Match(project_id=project.id, professional_id=professional.id, match_score=10.0))
+        await db.commit()
+        return professional
+
+
+async def _mark(professional_id) -> None:
+    async with AsyncSessionLocal() as db:
+        await MatchRescoreService.mark_professional(db, professional_id, [RescoreComponent.LOCATION])
+        await db.commit()
+
+
+async def _marks() -> list:
+    async with AsyncSessionLocal() as db:
+        return (await db.execute(select(MatchRescore.component, MatchRescore.version))).all()
+
+
+@pytest.mark.asyncio
+async def test_remarking_bumps_the_version(database):
+    professional = await _add_match()
+    await _mark(professional.id)
+    await _mark(professional.id)
+    assert await _marks() == [(RescoreComponent.LOCATION, 1)]
+
+
+@pytest.mark.asyncio
+async def test_mark_written_during_a_batch_survives_it(database, monkeypatch):
+    professional = await _add_match()
+    await _mark(professional.id)
+
+    rescore = MatchRescoreService.rescore
+
+    async def rescore_while_profile_changes(db, components_by_match):
+        # The professional changes again after the batch claimed the mark
+        await _mark(professional.id)
+        return await rescore(db, components_by_match)
+
+    monkeypatch.setattr(MatchRescoreService, "rescore", rescore_while_profile_changes)
+    assert await MatchRescoreService.run_batch(10) == 1
+    assert await _marks() == [(RescoreComponent.LOCATION, 1)]
+
+    monkeypatch.setattr(MatchRescoreService, "rescore", rescore)
+    assert await MatchRescoreService.run_batch(10) == 1
+    assert await _marks() == []
@@ -0,0 +1,112 @@
+"""
+MatchingJobService: enqueue inside the caller's unit of work, bounded re-queues and reclaims
+"""
+from datetime import datetime, timedelta
+from uuid import uuid4
+import pytest
+from sqlalchemy import select
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.matching import MatchingJob
+from app.services import matching_job_service
+from app.services.matching_job_service import MatchingJobService
+from app.utils.constants import JobStatus
+
+
+async def _job(project_id) -> MatchingJob:
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(MatchingJob).where(MatchingJob.project_id == project_id)
+        )
+        return result.scalar_one_or_none()
+
+
+async def _finished_job(project_id, completed_at: datetime) -> MatchingJob:
+    async with AsyncSessionLocal() as db:
+        job = MatchingJob(
+            project_id=project_id, idempotency_key=MatchingJobService.idempotency_key(project_id),
+            status=JobStatus.SUCCEEDED, attempts=1, run_after=completed_at, completed_at=completed_at
+        )
+        db.add(job)
+        await db.commit()
+        return job
+
+
+@pytest.mark.asyncio
+async def test_enqueue_leaves_the_commit_to_the_caller(database):
+    project_id = uuid4()
+    cooled_down = datetime.utcnow() - timedelta(seconds=settings.matching_job_requeue_cooldown_seconds + 1)
+    await _finished_job(project_id, cooled_down)
+    matching_job_service._job_available.clear()
+
+    async with AsyncSessionLocal() as db:
+        job = await MatchingJobService.enqueue(db, project_id)
+        assert job.status == JobStatus.QUEUED
+        assert not matching_job_service._job_available.is_set()
+        await db.rollback()
+
+    assert (await _job(project_id)).status == JobStatus.SUCCEEDED
+    assert not matching_job_service._job_available.is_set()
+
+    async with AsyncSessionLocal() as db:
+        await MatchingJobService.enqueue(db, project_id)
+        await db.commit()
+
+    assert (await _job(project_id)).status == JobStatus.QUEUED
+    assert matching_job_service._job_available.is_set()
+
+
+@pytest.mark.asyncio
+async def test_republish_requeues_a_finished_job_only_after_the_cooldown(database):
+    project_id = uuid4()
+    job = await _finished_job(project_id, datetime.utcnow())
+
+    async with AsyncSessionLocal() as db:
+        job = await MatchingJobService.enqueue(db, project_id)
+        await db.commit()
+        assert job.status == JobStatus.SUCCEEDED
+
+    async with AsyncSessionLocal() as db:
+        job = await db.get(MatchingJob, job.id)
+        job.completed_at = datetime.utcnow() - timedelta(
+            seconds=settings.matching_job_requeue_cooldown_seconds + 1
+        )
+        await db.commit()
+
+    async with AsyncSessionLocal() as db:
+        job = await MatchingJobService.enqueue(db, project_id)
+        await db.commit()
+        assert job.status == JobStatus.QUEUED
+        assert job.attempts == 0
+
+
+@pytest.mark.asyncio
+async def test_stale_reclaim_counts_against_max_attempts(database):
+    expired = datetime.utcnow() - timedelta(seconds=settings.matching_job_lock_timeout_seconds + 1)
+    exhausted = MatchingJob(
+        project_id=uuid4(), idempotency_key="exhausted", status=JobStatus.RUNNING,
+        attempts=3, max_attempts=3, run_after=expired, locked_by="dead", locked_at=expired
+    )
+    retryable = MatchingJob(
+        project_id=uuid4(), idempotency_key="retryable", status=JobStatus.RUNNING,
+        attempts=1, max_attempts=3, run_after=expired + timedelta(seconds=1),
+        locked_by="dead", locked_at=expired
+    )
+    async with AsyncSessionLocal() as db:
+        db.add_all([exhausted, retryable])
+        await db.commit()
+
+    async with AsyncSessionLocal() as db:
+        claimed = await MatchingJobService.claim_next(db, "worker")
+        await db.commit()
+        assert claimed.id == retryable.id
+        assert claimed.attempts == 2
+
+    failed = await _job(exhausted.project_id)
+    assert failed.status == JobStatus.FAILED
+    assert failed.attempts == 3
+    assert failed.completed_at is not None
+    assert "dead" in failed.last_error
+
+    async with AsyncSessionLocal() as db:
+        assert await MatchingJobService.claim_next(db, "worker") is None
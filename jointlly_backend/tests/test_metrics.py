@@ -0,0 +1,34 @@
+"""
+GET /metrics: runtime metrics are only served to admins
+"""
+import httpx
+import pytest
+import pytest_asyncio
+from app.main import app
+from app.utils.constants import Role
+
+
+@pytest_asyncio.fixture
+async def client(database):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+async def _headers(client: httpx.AsyncClient, role: Role) -> dict:
+    response = await client.post("/api/v1/auth/register", json={
+        "email": f"{role.value.lower()}@example.com", "password": "Passw0rd!x", "name": "User", "role": role.value
+    })
+    assert response.status_code == 201, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.mark.asyncio
+async def test_metrics_require_an_admin(client):
+    assert (await client.get("/metrics")).status_code in (401, 403)
+
+    response = await client.get("/metrics", headers=await _headers(client, Role.LANDOWNER))
+    assert response.status_code == 403
+
+    response = await client.get("/metrics", headers=await _headers(client, Role.ADMIN))
+    assert response.status_code == 200, response.text
+    assert set(response.json()) == {"password_hashing", "principal_cache", "profile_cache", "token_cache"}
@@ -0,0 +1,124 @@
+"""
+PaymentService: local transactions outlive the request that created their order
+"""
+import json
+from datetime import datetime, timedelta
+from uuid import uuid4
+import httpx
+import pytest
+from sqlalchemy import select, update
+from app.database import AsyncSessionLocal
+from app.exceptions import ValidationError
+from app.models.payment import Transaction
+from app.models.user import User
+from app.services.payment_service import PaymentService
+from app.services.razorpay_gateway import RazorpayGateway
+from app.utils.constants import Role, TransactionStatus, TransactionType
+
+
+def _service(handler) -> PaymentService:
+    return PaymentService(RazorpayGateway(
+        key_id="rzp_test", key_secret="secret", base_url="https://api.razorpay.test",
+        timeout_seconds=1.0, max_retries=0, backoff_seconds=0.0, max_connections=1,
+        transport=httpx.MockTransport(handler)
+    ))
+
+
+def _razorpay(orders: dict, fail_with: int = None):
+    """Orders API double keeping created orders by receipt"""
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "GET":
+            receipt = request.url.params["receipt"]
+            items = [orders[receipt]] if receipt in orders else []
+            return httpx.Response(200, json={"entity": "collection", "count": len(items), "items": items})
+        if fail_with:
+            return httpx.Response(fail_with, json={"error": {"description": "Rejected"}})
+        data = json.loads(request.content)
+        orders[data["receipt"]] = {"id": f"order_{len(orders) + 1}", "receipt": data["receipt"]}
+        return httpx.Response(200, json=orders[data["receipt"]])
+    return handler
+
+
+async def _user_id():
+    async with AsyncSessionLocal() as db:
+        user = User(
+            id=uuid4(), email="payer@example.com", name="Payer",
+            hashed_password="-", role=Role.LANDOWNER, is_active="true"
+        )
+        db.add(user)
+        await db.commit()
+        return user.id
+
+
+async def _transactions() -> list:
+    async with AsyncSessionLocal() as db:
+        return list((await db.execute(select(Transaction))).scalars().all())
+
+
+async def _create_order(service: PaymentService, user_id) -> dict:
+    """create_order in a request whose commit never happens"""
+    async with AsyncSessionLocal() as db:
+        order = await service.create_order(db, user_id, 499.0, TransactionType.FEASIBILITY_UNLOCK)
+        await db.rollback()
+    return order
+
+
+@pytest.mark.asyncio
+async def test_transaction_outlives_a_failed_request_and_is_reconciled(database):
+    orders = {}
+    service = _service(_razorpay(orders))
+    order = await _create_order(service, await _user_id())
+
+    [transaction] = await _transactions()
+    assert transaction.id == order["transaction_id"]
+    assert transaction.status == TransactionStatus.PENDING
+    assert transaction.razorpay_order_id is None
+
+    async with AsyncSessionLocal() as db:
+        await db.execute(update(Transaction).values(created_at=datetime.utcnow() - timedelta(hours=1)))
+        assert await service.reconcile_pending_orders(db, older_than_seconds=600) == 1
+        await db.commit()
+    [transaction] = await _transactions()
+    assert transaction.razorpay_order_id == order["order_id"]
+    assert transaction.status == TransactionStatus.PENDING
+
+
+@pytest.mark.asyncio
+async def test_rejected_order_is_recorded_as_failed(database):
+    service = _service(_razorpay({}, fail_with=400))
+    with pytest.raises(ValidationError):
+        await _create_order(service, await _user_id())
+    [transaction] = await _transactions()
+    assert transaction.status == TransactionStatus.FAILED
+
+
+@pytest.mark.asyncio
+async def test_ambiguous_failure_stays_pending_for_reconcile(database):
+    service = _service(_razorpay({}, fail_with=503))
+    with pytest.raises(ValidationError):
+        await _create_order(service, await _user_id())
+    [transaction] = await _transactions()
+    assert transaction.status == TransactionStatus.PENDING
+
+    async with AsyncSessionLocal() as db:
+        assert await service.reconcile_pending_orders(db, older_than_seconds=0) == 1
+        await db.commit()
+    [transaction] = await _transactions()
+    assert transaction.status == TransactionStatus.FAILED
+
+
+@pytest.mark.asyncio
+async def test_bad_signature_failure_survives_the_rollback(database):
+    orders = {}
+    service = _service(_razorpay(orders))
+    user_id = await _user_id()
+    async with AsyncSessionLocal() as db:
+        order = await service.create_order(db, user_id, 499.0, TransactionType.FEASIBILITY_UNLOCK)
+        await db.commit()
+
+    async with AsyncSessionLocal() as db:
+        with pytest.raises(ValidationError):
+            await service.verify_payment(db, order["transaction_id"], "pay_1", "bad-signature")
+        await db.rollback()
+    [transaction] = await _transactions()
+    assert transaction.status == TransactionStatus.FAILED
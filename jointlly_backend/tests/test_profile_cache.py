@@ -0,0 +1,60 @@
+"""
+ProfileCache generations: a load that raced an invalidation is not cached
+"""
+from uuid import uuid4
+from app.services.profile_cache import ProfileCache
+
+
+def _cache() -> ProfileCache:
+    return ProfileCache(ttl_seconds=60.0, max_entries=10)
+
+
+def test_put_caches_a_load_without_invalidations():
+    cache, user_id, profile_id = _cache(), uuid4(), uuid4()
+    generation = cache.generation(profile_id)
+    cache.put(user_id, profile_id, "fresh", generation)
+    assert cache.get(user_id) == "fresh"
+
+
+def test_put_skips_a_load_that_raced_an_invalidation():
+    cache, user_id, profile_id = _cache(), uuid4(), uuid4()
+    generation = cache.generation(profile_id)
+    # The profile changes and commits while the request is still loading it
+    cache.invalidate(profile_id)
+    cache.put(user_id, profile_id, "stale", generation)
+    assert cache.get(user_id) is None
+
+    cache.put(user_id, profile_id, "fresh", cache.generation(profile_id))
+    assert cache.get(user_id) == "fresh"
+
+
+def test_invalidate_drops_the_entry_and_bumps_only_loading_profiles():
+    cache, user_id, profile_id, other_id = _cache(), uuid4(), uuid4(), uuid4()
+    cache.put(user_id, profile_id, "cached", cache.generation(profile_id))
+    other_generation = cache.generation(other_id)
+    cache.invalidate(profile_id)
+    assert cache.get(user_id) is None
+    cache.put(uuid4(), other_id, "other", other_generation)
+    assert cache._generations == {}
+
+
+def test_generations_are_kept_only_while_a_load_is_in_flight():
+    cache, profile_id = _cache(), uuid4()
+    for _ in range(100):
+        cache.invalidate(uuid4())
+    assert cache._generations == {}
+
+    generation = cache.generation(profile_id)
+    cache.invalidate(profile_id)
+    assert cache._generations == {profile_id: generation + 1}
+    cache.release(profile_id)
+    assert cache._generations == {} and cache._loads == {}
+
+
+def test_clear_keeps_in_flight_loads_from_caching():
+    cache, user_id, profile_id = _cache(), uuid4(), uuid4()
+    generation = cache.generation(profile_id)
+    cache.clear()
+    cache.put(user_id, profile_id, "stale", generation)
+    assert cache.get(user_id) is None
+    assert cache._generations == {} and cache._loads == {}
@@ -0,0 +1,98 @@
+"""
+RazorpayGateway retry behaviour for order creation
+"""
+from typing import Callable, List
+import httpx
+import pytest
+from app.services.razorpay_gateway import PaymentGatewayError, RazorpayGateway
+
+ORDER = {"amount": 50000, "currency": "INR", "receipt": "txn_1"}
+CREATED = {"id": "order_1", "entity": "order", **ORDER}
+
+
+def _gateway(handler: Callable[[httpx.Request], httpx.Response], max_retries: int = 3) -> RazorpayGateway:
+    return RazorpayGateway(
+        key_id="rzp_test",
+        key_secret="secret",
+        base_url="https://api.razorpay.test",
+        timeout_seconds=1.0,
+        max_retries=max_retries,
+        backoff_seconds=0.0,
+        max_connections=1,
+        transport=httpx.MockTransport(handler)
+    )
+
+
+def _collection(items: List[dict]) -> httpx.Response:
+    return httpx.Response(200, json={"entity": "collection", "count": len(items), "items": items})
+
+
+@pytest.mark.asyncio
+async def test_connect_errors_are_retried():
+    posts = []
+
+    def handler(request):
+        posts.append(request)
+        if len(posts) < 3:
+            raise httpx.ConnectError("refused", request=request)
+        return httpx.Response(200, json=CREATED)
+
+    assert await _gateway(handler).create_order(ORDER) == CREATED
+    assert len(posts) == 3
+
+
+@pytest.mark.asyncio
+async def test_read_timeout_returns_the_order_it_created():
+    requests = []
+
+    def handler(request):
+        requests.append((request.method, request.url.params.get("receipt")))
+        if request.method == "POST":
+            raise httpx.ReadTimeout("slow", request=request)
+        return _collection([CREATED])
+
+    assert await _gateway(handler).create_order(ORDER) == CREATED
+    assert requests == [("POST", None), ("GET", "txn_1")]
+
+
+@pytest.mark.asyncio
+async def test_server_error_resends_only_when_no_order_exists():
+    requests = []
+
+    def handler(request):
+        requests.append(request.method)
+        if request.method == "GET":
+            return _collection([])
+        if requests.count("POST") == 1:
+            return httpx.Response(502, json={"error": {"description": "Bad gateway"}})
+        return httpx.Response(200, json=CREATED)
+
+    assert await _gateway(handler).create_order(ORDER) == CREATED
+    assert requests == ["POST", "GET", "POST"]
+
+
+@pytest.mark.asyncio
+async def test_ambiguous_failure_without_receipt_is_not_retried():
+    requests = []
+
+    def handler(request):
+        requests.append(request.method)
+        return httpx.Response(500, json={"error": {"description": "Internal error"}})
+
+    with pytest.raises(PaymentGatewayError) as error:
+        await _gateway(handler).create_order({"amount": 50000, "currency": "INR"})
+    assert error.value.status_code == 500
+    assert requests == ["POST"]
+
+
+@pytest.mark.asyncio
+async def test_client_errors_are_raised_immediately():
+    requests = []
+
+    def handler(request):
+        requests.append(request.method)
+        return httpx.Response(400, json={"error": {"description": "amount is required"}})
+
+    with pytest.raises(PaymentGatewayError, match="amount is required"):
+        await _gateway(handler).create_order(ORDER)
+    assert requests == ["POST"]
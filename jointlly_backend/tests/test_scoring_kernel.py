@@ -0,0 +1,147 @@
+"""
+ScoringKernel parity with the scalar MatchingService scorers
+"""
+import random
+from typing import List, Optional, Tuple
+from uuid import uuid4
+import numpy as np
+import pytest
+import app.models  # noqa: F401  (configure every mapper)
+from app.models.professional import ProfessionalProfile, Capability, PricingTier, LocationPreference
+from app.services.candidate_index import CandidateRecord, ServiceArea, TierInterval
+from app.services.matching_service import MatchingService
+from app.services.scoring_kernel import ScoringKernel
+from app.utils.constants import MATCH_WEIGHTS, PROJECT_CAPABILITY_MAP, CapabilityType, ProjectType
+
+CITIES = ["Bengaluru", "bangalore", "Whitefield, Bengaluru", "Mysuru", "HUBLI", "Mangaluru"]
+PLOT = (12.9716, 77.5946)
+# Bounds the random tiers and project areas share, so areas land on tier edges
+AREAS = [0.0, 600.0, 1200.0, 2400.0, 5000.0, 12000.0]
+
+
+def _bound(rng: random.Random) -> Optional[float]:
+    return rng.choice([None, 0.0, *AREAS])
+
+
+def _professional(rng: random.Random):
+    professional = ProfessionalProfile(
+        id=uuid4(),
+        company_name="Parity",
+        location_preferences=rng.choice([None, [], rng.sample(CITIES, rng.randint(1, 3))])
+    )
+    capabilities = [
+        Capability(professional_id=professional.id, capability_type=capability_type)
+        for capability_type in rng.sample(list(CapabilityType), rng.randint(0, len(CapabilityType)))
+    ]
+    tiers = [
+        PricingTier(
+            professional_id=professional.id,
+            capability_type=rng.choice(list(CapabilityType)),
+            min_area_sqft=_bound(rng),
+            max_area_sqft=_bound(rng),
+            price_per_sqft=rng.choice([500.0, 1000.0, rng.uniform(800, 6000), 5000.0, 7000.0])
+        )
+        for _ in range(rng.randint(0, 4))
+    ]
+    areas = [
+        LocationPreference(
+            professional_id=professional.id,
+            location_name="Area",
+            radius_km=rng.choice([None, 0.0, 5.0, 40.0]),
+            latitude=rng.choice([None, PLOT[0] + rng.uniform(-0.6, 0.6)]),
+            longitude=PLOT[1] + rng.uniform(-0.6, 0.6),
+            capability_type=rng.choice([None, *CapabilityType])
+        )
+        for _ in range(rng.randint(0, 3))
+    ]
+    return professional, capabilities, tiers, areas
+
+
+def _pool(seed: int, size: int = 200) -> List[Tuple]:
+    rng = random.Random(seed)
+    return [_professional(rng) for _ in range(size)]
+
+
+def _scalar_scores(pool, project_type, city, area, verification, plot_coordinates):
+    capability_type = PROJECT_CAPABILITY_MAP.get(project_type, CapabilityType.CONSTRUCTION)
+    rows = []
+    for professional, capabilities, tiers, areas in pool:
+        components = {
+            "project_type_score": MatchingService.calculate_project_type_score(project_type, capabilities),
+            "location_score": MatchingService.calculate_location_score(
+                city, professional.location_preferences, plot_coordinates, areas, capability_type
+            ),
+            "project_size_score": MatchingService.calculate_project_size_score(area, tiers, capability_type),
+            "pricing_score": MatchingService.calculate_pricing_score(area, tiers, capability_type),
+            "capability_score": MatchingService.calculate_capability_score(capabilities, project_type),
+            "verification_score": verification
+        }
+        rows.append({**components, "total_score": MatchingService.weighted_total(components)})
+    return {name: np.array([row[name] for row in rows]) for name in rows[0]}
+
+
+def _arrays_from_orm(pool):
+    return ScoringKernel.build_arrays(
+        [professional for professional, _, _, _ in pool],
+        {professional.id: capabilities for professional, capabilities, _, _ in pool},
+        {professional.id: tiers for professional, _, tiers, _ in pool},
+        {professional.id: areas for professional, _, _, areas in pool}
+    )
+
+
+def _arrays_from_candidates(pool):
+    return ScoringKernel.build_arrays_from_candidates([
+        CandidateRecord(
+            professional_id=professional.id,
+            capability_types=frozenset(capability.capability_type for capability in capabilities),
+            location_preferences=tuple(professional.location_preferences or ()),
+            tiers=tuple(
+                TierInterval(tier.capability_type, tier.min_area_sqft, tier.max_area_sqft, tier.price_per_sqft)
+                for tier in tiers
+            ),
+            service_areas=tuple(
+                ServiceArea(area.latitude, area.longitude, area.radius_km, area.capability_type)
+                for area in areas if area.latitude is not None and area.longitude is not None
+            )
+        )
+        for professional, capabilities, tiers, areas in pool
+    ])
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("project_type", list(ProjectType))
+@pytest.mark.parametrize("plot_coordinates", [None, PLOT])
+@pytest.mark.parametrize("build", [_arrays_from_orm, _arrays_from_candidates])
+def test_kernel_matches_scalar_scorers(seed, project_type, plot_coordinates, build):
+    pool = _pool(seed)
+    rng = random.Random(seed)
+    city = rng.choice(CITIES)
+    verification = rng.choice([0.0, 0.2, 0.7, 1.0])
+
+    for area in AREAS + [rng.uniform(1, 15000)]:
+        expected = _scalar_scores(pool, project_type, city, area, verification, plot_coordinates)
+        scores = ScoringKernel.score(
+            build(pool), project_type, city, area, verification, plot_coordinates=plot_coordinates
+        )
+        for name, values in expected.items():
+            np.testing.assert_array_equal(scores[name], values, err_msg=f"{name} at {area} sqft")
+
+
+def test_kernel_handles_empty_pool():
+    scores = ScoringKernel.score(
+        _arrays_from_orm([]), ProjectType.CONTRACT_CONSTRUCTION, "Bengaluru", 1200.0, 0.5, plot_coordinates=PLOT
+    )
+    assert all(values.shape == (0,) for values in scores.values())
+
+
+def test_edge_cases_are_covered():
+    """The random pools include the edge cases the kernel has to reproduce"""
+    pool = [entry for seed in range(5) for entry in _pool(seed)]
+    tiers = [tier for _, _, entry_tiers, _ in pool for tier in entry_tiers]
+    assert any(tier.max_area_sqft == 0 for tier in tiers)
+    assert any(tier.min_area_sqft is None for tier in tiers)
+    assert any(not entry_tiers for _, _, entry_tiers, _ in pool)
+    assert any(professional.location_preferences == [] for professional, _, _, _ in pool)
+    assert any(professional.location_preferences is None for professional, _, _, _ in pool)
+    assert any(len(capabilities) > 1 for _, capabilities, _, _ in pool)
+    assert sum(MATCH_WEIGHTS.values()) == pytest.approx(1.0)
@@ -0,0 +1,93 @@
+"""
+Webhook inbox: events are only marked processed once they were applied
+"""
+from datetime import datetime, timedelta
+from uuid import uuid4
+import pytest
+from sqlalchemy import select, update
+from app.database import AsyncSessionLocal
+from app.models.payment import Transaction, WebhookEvent
+from app.models.user import User
+from app.services.webhook_inbox_service import WebhookInboxService
+from app.utils.constants import Role, TransactionStatus, TransactionType
+
+
+def _captured(order_id: str) -> dict:
+    return {
+        "event": "payment.captured",
+        "payload": {"payment": {"entity": {"id": f"pay_{order_id}", "order_id": order_id}}}
+    }
+
+
+async def _deliver(event_id: str, payload: dict) -> None:
+    async with AsyncSessionLocal() as db:
+        await WebhookInboxService.record(db, event_id.encode(), payload, event_id=event_id)
+        await db.commit()
+
+
+async def _event(event_id: str) -> WebhookEvent:
+    async with AsyncSessionLocal() as db:
+        return (await db.execute(select(WebhookEvent).where(WebhookEvent.event_id == event_id))).scalar_one()
+
+
+async def _make_due() -> None:
+    async with AsyncSessionLocal() as db:
+        await db.execute(update(WebhookEvent).values(next_attempt_at=datetime.utcnow() - timedelta(seconds=1)))
+        await db.commit()
+
+
+async def _add_transaction(order_id: str) -> None:
+    async with AsyncSessionLocal() as db:
+        user = User(
+            id=uuid4(), email=f"{order_id}@example.com", name="Landowner",
+            hashed_password="-", role=Role.LANDOWNER, is_active="true"
+        )
+        db.add(user)
+        db.add(Transaction(
+            user_id=user.id,
+            transaction_type=TransactionType.FEASIBILITY_UNLOCK,
+            amount=499.0,
+            razorpay_order_id=order_id,
+            status=TransactionStatus.PENDING
+        ))
+        await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_event_before_its_transaction_is_retried_not_dropped(database):
+    await _deliver("evt_early", _captured("order_early"))
+
+    assert await WebhookInboxService.run_batch(10) == 1
+    event = await _event("evt_early")
+    assert event.processed_at is None
+    assert event.attempts == 1
+    assert event.next_attempt_at > datetime.utcnow()
+    # Not due yet: the next batch leaves it alone
+    assert await WebhookInboxService.run_batch(10) == 0
+
+    await _make_due()
+    assert await WebhookInboxService.run_batch(10) == 1
+    assert (await _event("evt_early")).attempts == 2
+
+    await _add_transaction("order_early")
+    await _make_due()
+    assert await WebhookInboxService.run_batch(10) == 1
+    assert (await _event("evt_early")).processed_at is not None
+    async with AsyncSessionLocal() as db:
+        transaction = (await db.execute(select(Transaction))).scalar_one()
+    assert transaction.status == TransactionStatus.SUCCESS
+    assert transaction.razorpay_payment_id == "pay_order_early"
+
+
+@pytest.mark.asyncio
+async def test_matched_and_unmatched_events_in_one_batch(database):
+    await _add_transaction("order_known")
+    await _deliver("evt_known", _captured("order_known"))
+    await _deliver("evt_unknown", _captured("order_unknown"))
+    await _deliver("evt_other", {"event": "refund.created", "payload": {}})
+
+    assert await WebhookInboxService.run_batch(10) == 3
+    assert (await _event("evt_known")).processed_at is not None
+    assert (await _event("evt_other")).processed_at is not None
+    unknown = await _event("evt_unknown")
+    assert unknown.processed_at is None and unknown.attempts == 1